@@ -0,0 +1,54 @@
+"""add order query indexes
+
+Revision ID: 3b47f43dbfc8
+Revises: 29a31d541385
+Create Date: 2026-10-18 09:12:40.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b47f43dbfc8'
+down_revision = '29a31d541385'
+branch_labels = None
+depends_on = None
+
+# 未完了（オープン）とみなす注文ステータス
+OPEN_STATUSES = "('pending', 'confirmed', 'processing')"
+
+# (インデックス名, テーブル名, 列定義, WHERE句)
+INDEXES = [
+    # routers/orders.read_orders: customer_id + order_date範囲
+    ('ix_orders_customer_id_order_date', 'orders', 'customer_id, order_date', None),
+    # order_date範囲のみの絞り込み
+    ('ix_orders_order_date', 'orders', 'order_date', None),
+    # ステータス別の新着順一覧
+    ('ix_orders_status_created_at', 'orders', 'status, created_at', None),
+    # crud.order.get_multiの新着順・キーセットページネーション
+    ('ix_orders_created_at_id', 'orders', 'created_at, id', None),
+    # 未完了注文のみの部分インデックス
+    ('ix_orders_open_created_at', 'orders', 'created_at', f'status IN {OPEN_STATUSES}'),
+    ('ix_order_items_order_id', 'order_items', 'order_id', None),
+    ('ix_order_items_item_id', 'order_items', 'item_id', None),
+    ('ix_inbound_items_inbound_id', 'inbound_items', 'inbound_id', None),
+    ('ix_inbound_items_item_id', 'inbound_items', 'item_id', None),
+]
+
+
+def upgrade():
+    # 稼働中のテーブルへの書き込みを止めないようCONCURRENTLYで作成する
+    # （CONCURRENTLYはトランザクション外でのみ実行可能）
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            sql = f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})'
+            if where:
+                sql += f' WHERE {where}'
+            op.execute(sql)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _table, _columns, _where in reversed(INDEXES):
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
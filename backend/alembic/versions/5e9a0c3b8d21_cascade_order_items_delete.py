@@ -0,0 +1,39 @@
+"""cascade order_items delete
+
+Revision ID: 5e9a0c3b8d21
+Revises: d4f2b9c61e87
+Create Date: 2026-10-18 12:20:47.931604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9a0c3b8d21'
+down_revision = 'd4f2b9c61e87'
+branch_labels = None
+depends_on = None
+
+FK_NAME = 'order_items_order_id_fkey'
+
+
+def _replace_fk(ondelete):
+    op.execute(f'ALTER TABLE order_items DROP CONSTRAINT IF EXISTS {FK_NAME}')
+    # NOT VALIDで追加してから別のトランザクションで検証することで、既存行の検証中に書き込みを止めない
+    # （DROP/ADDのACCESS EXCLUSIVEロックはここでコミットして解放し、
+    #   VALIDATEはSHARE UPDATE EXCLUSIVEロックのみで実行される）
+    op.execute(
+        f'ALTER TABLE order_items ADD CONSTRAINT {FK_NAME} '
+        f'FOREIGN KEY (order_id) REFERENCES orders(id){ondelete} NOT VALID'
+    )
+    with op.get_context().autocommit_block():
+        op.execute(f'ALTER TABLE order_items VALIDATE CONSTRAINT {FK_NAME}')
+
+
+def upgrade():
+    _replace_fk(' ON DELETE CASCADE')
+
+
+def downgrade():
+    _replace_fk('')
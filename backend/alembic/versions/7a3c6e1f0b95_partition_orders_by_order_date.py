@@ -0,0 +1,225 @@
+"""partition orders by order_date
+
+Revision ID: 7a3c6e1f0b95
+Revises: 5e9a0c3b8d21
+Create Date: 2026-10-18 13:02:51.442087
+
+orders / order_items を注文日（order_date）で月単位にレンジパーティション分割する。
+既存のテーブルを *_legacy にリネームし、パーティションテーブルを作成してデータを
+コピーしてから旧テーブルを削除する。データ量に応じた時間がかかるため、
+書き込みを止めた状態で実行すること。
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3c6e1f0b95'
+down_revision = '5e9a0c3b8d21'
+branch_labels = None
+depends_on = None
+
+# 移行時に作成する将来のパーティションの月数
+MONTHS_AHEAD = 3
+
+ORDER_COLUMNS = 'id, customer_id, order_date, status, total_amount, line_count, created_at, updated_at'
+ORDER_ITEM_COLUMNS = 'id, order_id, order_date, item_id, quantity, unit_price, notes'
+
+# (インデックス名, テーブル名, 列定義, WHERE句)
+INDEXES = [
+    ('ix_orders_id', 'orders', 'id', None),
+    ('ix_orders_order_date', 'orders', 'order_date', None),
+    ('ix_orders_customer_id_order_date', 'orders', 'customer_id, order_date', None),
+    ('ix_orders_status_created_at', 'orders', 'status, created_at', None),
+    ('ix_orders_created_at_id', 'orders', 'created_at, id', None),
+    ('ix_orders_updated_at', 'orders', 'updated_at', None),
+    ('ix_orders_open_created_at', 'orders', 'created_at', "status IN ('pending', 'confirmed', 'processing')"),
+    ('ix_order_items_id', 'order_items', 'id', None),
+    ('ix_order_items_order_id', 'order_items', 'order_id', None),
+    ('ix_order_items_item_id', 'order_items', 'item_id', None),
+]
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _sequence(conn, table, name):
+    """列に紐づくシーケンスを返す（存在しない場合は作成する）"""
+    seq = conn.execute(sa.text(f"SELECT pg_get_serial_sequence('{table}', 'id')")).scalar()
+    if seq:
+        return seq
+    op.execute(f'CREATE SEQUENCE IF NOT EXISTS {name}')
+    op.execute(f"SELECT setval('{name}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)")
+    return name
+
+
+def _rename_legacy():
+    for table in ('order_items', 'orders'):
+        op.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+        op.execute(f'ALTER TABLE {table}_legacy RENAME CONSTRAINT {table}_pkey TO {table}_legacy_pkey')
+    # インデックス名は新しいテーブルで使うため、旧テーブルのものは削除する
+    for name, _table, _columns, _where in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def _create_triggers():
+    op.execute(
+        'CREATE OR REPLACE FUNCTION update_updated_at_column() RETURNS TRIGGER AS $$ '
+        'BEGIN NEW.updated_at = CURRENT_TIMESTAMP; RETURN NEW; END; '
+        "$$ language 'plpgsql'"
+    )
+    op.execute(
+        'CREATE TRIGGER update_orders_updated_at BEFORE UPDATE ON orders '
+        'FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()'
+    )
+    # パーティションキーの変更はパーティション間の移動になり、明細の外部キーと両立しないため禁止する
+    op.execute(
+        'CREATE OR REPLACE FUNCTION prevent_order_date_change() RETURNS TRIGGER AS $$ '
+        'BEGIN '
+        'IF NEW.order_date <> OLD.order_date THEN '
+        "RAISE EXCEPTION 'orders.order_date cannot be changed'; "
+        'END IF; '
+        'RETURN NEW; '
+        'END; '
+        "$$ language 'plpgsql'"
+    )
+    op.execute(
+        'CREATE TRIGGER prevent_orders_order_date_change BEFORE UPDATE OF order_date ON orders '
+        'FOR EACH ROW EXECUTE FUNCTION prevent_order_date_change()'
+    )
+
+
+def upgrade():
+    conn = op.get_bind()
+    order_seq = _sequence(conn, 'orders', 'orders_id_seq')
+    item_seq = _sequence(conn, 'order_items', 'order_items_id_seq')
+    first = conn.execute(sa.text('SELECT MIN(order_date) FROM orders')).scalar()
+
+    _rename_legacy()
+
+    op.execute(
+        'CREATE TABLE orders ('
+        f"  id INTEGER NOT NULL DEFAULT nextval('{order_seq}'),"
+        '  customer_id INTEGER NOT NULL REFERENCES customers(id),'
+        '  order_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+        "  status VARCHAR NOT NULL DEFAULT 'pending',"
+        '  total_amount FLOAT NOT NULL DEFAULT 0,'
+        '  line_count INTEGER NOT NULL DEFAULT 0,'
+        '  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+        '  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+        '  PRIMARY KEY (id, order_date)'
+        ') PARTITION BY RANGE (order_date)'
+    )
+    op.execute(
+        'CREATE TABLE order_items ('
+        f"  id INTEGER NOT NULL DEFAULT nextval('{item_seq}'),"
+        '  order_id INTEGER NOT NULL,'
+        '  order_date TIMESTAMP NOT NULL,'
+        '  item_id INTEGER NOT NULL REFERENCES items(id),'
+        '  quantity INTEGER NOT NULL,'
+        '  unit_price FLOAT NOT NULL,'
+        '  notes VARCHAR,'
+        '  PRIMARY KEY (id, order_date)'
+        ') PARTITION BY RANGE (order_date)'
+    )
+
+    # 既存データの最初の月から、当月のMONTHS_AHEADか月先までのパーティションを作成する
+    today = date.today().replace(day=1)
+    month = first.date().replace(day=1) if first else today
+    while month <= _add_months(today, MONTHS_AHEAD):
+        upper = _add_months(month, 1)
+        for table in ('orders', 'order_items'):
+            op.execute(
+                f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+            )
+        month = upper
+    for table in ('orders', 'order_items'):
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_legacy')
+    op.execute(
+        f'INSERT INTO order_items ({ORDER_ITEM_COLUMNS}) '
+        'SELECT i.id, i.order_id, o.order_date, i.item_id, i.quantity, i.unit_price, i.notes '
+        'FROM order_items_legacy i JOIN orders_legacy o ON o.id = i.order_id'
+    )
+
+    # シーケンスの所有者を新しいテーブルに移してから旧テーブルを削除する
+    op.execute(f'ALTER SEQUENCE {order_seq} OWNED BY orders.id')
+    op.execute(f'ALTER SEQUENCE {item_seq} OWNED BY order_items.id')
+    op.execute('DROP TABLE order_items_legacy')
+    op.execute('DROP TABLE orders_legacy')
+
+    # 外部キーとインデックスはデータのコピー後に作成する
+    op.execute(
+        'ALTER TABLE order_items ADD CONSTRAINT fk_order_items_order '
+        'FOREIGN KEY (order_id, order_date) REFERENCES orders (id, order_date) ON DELETE CASCADE'
+    )
+    for name, table, columns, where in INDEXES:
+        sql = f'CREATE INDEX {name} ON {table} ({columns})'
+        if where:
+            sql += f' WHERE {where}'
+        op.execute(sql)
+    _create_triggers()
+
+
+def downgrade():
+    conn = op.get_bind()
+    order_seq = conn.execute(sa.text("SELECT pg_get_serial_sequence('orders', 'id')")).scalar()
+    item_seq = conn.execute(sa.text("SELECT pg_get_serial_sequence('order_items', 'id')")).scalar()
+
+    _rename_legacy()
+    op.execute('DROP TRIGGER IF EXISTS prevent_orders_order_date_change ON orders_legacy')
+    op.execute('DROP FUNCTION IF EXISTS prevent_order_date_change()')
+    op.execute('DROP TRIGGER IF EXISTS update_orders_updated_at ON orders_legacy')
+
+    op.execute(
+        'CREATE TABLE orders ('
+        f"  id INTEGER NOT NULL DEFAULT nextval('{order_seq}') PRIMARY KEY,"
+        '  customer_id INTEGER NOT NULL REFERENCES customers(id),'
+        '  order_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+        "  status VARCHAR NOT NULL DEFAULT 'pending',"
+        '  total_amount FLOAT NOT NULL DEFAULT 0,'
+        '  line_count INTEGER NOT NULL DEFAULT 0,'
+        '  created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,'
+        '  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP'
+        ')'
+    )
+    op.execute(
+        'CREATE TABLE order_items ('
+        f"  id INTEGER NOT NULL DEFAULT nextval('{item_seq}') PRIMARY KEY,"
+        '  order_id INTEGER NOT NULL,'
+        '  item_id INTEGER NOT NULL REFERENCES items(id),'
+        '  quantity INTEGER NOT NULL,'
+        '  unit_price FLOAT NOT NULL,'
+        '  notes VARCHAR'
+        ')'
+    )
+    op.execute(f'INSERT INTO orders ({ORDER_COLUMNS}) SELECT {ORDER_COLUMNS} FROM orders_legacy')
+    op.execute(
+        'INSERT INTO order_items (id, order_id, item_id, quantity, unit_price, notes) '
+        'SELECT id, order_id, item_id, quantity, unit_price, notes FROM order_items_legacy'
+    )
+    op.execute(f'ALTER SEQUENCE {order_seq} OWNED BY orders.id')
+    op.execute(f'ALTER SEQUENCE {item_seq} OWNED BY order_items.id')
+    op.execute('DROP TABLE order_items_legacy CASCADE')
+    op.execute('DROP TABLE orders_legacy CASCADE')
+
+    op.execute(
+        'ALTER TABLE order_items ADD CONSTRAINT order_items_order_id_fkey '
+        'FOREIGN KEY (order_id) REFERENCES orders (id) ON DELETE CASCADE'
+    )
+    for name, table, columns, where in INDEXES:
+        sql = f'CREATE INDEX {name} ON {table} ({columns})'
+        if where:
+            sql += f' WHERE {where}'
+        op.execute(sql)
+    op.execute(
+        'CREATE TRIGGER update_orders_updated_at BEFORE UPDATE ON orders '
+        'FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()'
+    )
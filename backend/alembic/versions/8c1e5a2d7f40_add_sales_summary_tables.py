@@ -0,0 +1,61 @@
+"""add sales summary tables
+
+Revision ID: 8c1e5a2d7f40
+Revises: 3b47f43dbfc8
+Create Date: 2026-10-18 11:05:12.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1e5a2d7f40'
+down_revision = '3b47f43dbfc8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sales_monthly_customer',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('customer_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('total_quantity', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+    sa.PrimaryKeyConstraint('month', 'customer_id')
+    )
+    op.create_index(op.f('ix_sales_monthly_customer_customer_id'), 'sales_monthly_customer', ['customer_id'], unique=False)
+    op.create_table('sales_monthly_item',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('total_quantity', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['item_id'], ['items.id'], ),
+    sa.PrimaryKeyConstraint('month', 'item_id')
+    )
+    op.create_index(op.f('ix_sales_monthly_item_item_id'), 'sales_monthly_item', ['item_id'], unique=False)
+    op.create_table('summary_refresh_state',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('watermark', sa.DateTime(), nullable=True),
+    sa.Column('last_refreshed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_mode', sa.String(length=20), nullable=True),
+    sa.Column('last_months', sa.Integer(), nullable=True),
+    sa.Column('last_duration_ms', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # 増分更新で変更された注文を探すためのインデックス
+    op.create_index('ix_orders_updated_at', 'orders', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_orders_updated_at', table_name='orders')
+    op.drop_table('summary_refresh_state')
+    op.drop_index(op.f('ix_sales_monthly_item_item_id'), table_name='sales_monthly_item')
+    op.drop_table('sales_monthly_item')
+    op.drop_index(op.f('ix_sales_monthly_customer_customer_id'), table_name='sales_monthly_customer')
+    op.drop_table('sales_monthly_customer')
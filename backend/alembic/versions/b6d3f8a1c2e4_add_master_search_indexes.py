@@ -0,0 +1,49 @@
+"""add master search indexes
+
+Revision ID: b6d3f8a1c2e4
+Revises: 7a3c6e1f0b95
+Create Date: 2026-10-18 14:20:37.915204
+
+items / customers の検索用に、正規化関数 search_normalize() と
+pg_trgm のGINインデックス（部分一致・類似度検索用）、
+コードの前方一致用のインデックス（短い検索語用）を作成する。
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d3f8a1c2e4'
+down_revision = '7a3c6e1f0b95'
+branch_labels = None
+depends_on = None
+
+# (テーブル名, 検索対象の列)
+SEARCH_COLUMNS = [
+    ('items', ('code', 'name', 'description')),
+    ('customers', ('code', 'name', 'contact_person')),
+]
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # 全角・半角と大文字・小文字の違いを吸収する（app.core.text.normalize_search_textと同じ変換）
+    op.execute(
+        'CREATE OR REPLACE FUNCTION search_normalize(value text) RETURNS text AS $$ '
+        'SELECT lower(normalize(value, NFKC)) '
+        "$$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE"
+    )
+    for table, columns in SEARCH_COLUMNS:
+        expressions = ', '.join(f'search_normalize({column}) gin_trgm_ops' for column in columns)
+        op.execute(f'CREATE INDEX ix_{table}_search_trgm ON {table} USING gin ({expressions})')
+        op.execute(
+            f'CREATE INDEX ix_{table}_search_code_prefix ON {table} '
+            '(search_normalize(code) text_pattern_ops)'
+        )
+
+
+def downgrade():
+    for table, _columns in SEARCH_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_code_prefix')
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_trgm')
+    op.execute('DROP FUNCTION IF EXISTS search_normalize(text)')
@@ -0,0 +1,47 @@
+"""add order totals
+
+Revision ID: d4f2b9c61e87
+Revises: 8c1e5a2d7f40
+Create Date: 2026-10-18 11:42:03.187552
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f2b9c61e87'
+down_revision = '8c1e5a2d7f40'
+branch_labels = None
+depends_on = None
+
+# バックフィルを1回のUPDATEで行う注文数（長時間の行ロックを避ける）
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade():
+    op.add_column('orders', sa.Column('total_amount', sa.Float(), server_default='0', nullable=False))
+    op.add_column('orders', sa.Column('line_count', sa.Integer(), server_default='0', nullable=False))
+
+    # 既存の注文の合計金額・明細数を明細から計算する
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text('SELECT COALESCE(MAX(id), 0) FROM orders')).scalar()
+    for start in range(0, max_id + 1, BACKFILL_BATCH_SIZE):
+        conn.execute(
+            sa.text(
+                'UPDATE orders o SET total_amount = t.total_amount, line_count = t.line_count '
+                'FROM ('
+                '  SELECT order_id, SUM(quantity * unit_price) AS total_amount, COUNT(*) AS line_count'
+                '  FROM order_items'
+                '  WHERE order_id >= :start AND order_id < :end'
+                '  GROUP BY order_id'
+                ') t '
+                'WHERE o.id = t.order_id'
+            ),
+            {'start': start, 'end': start + BACKFILL_BATCH_SIZE}
+        )
+
+
+def downgrade():
+    op.drop_column('orders', 'line_count')
+    op.drop_column('orders', 'total_amount')
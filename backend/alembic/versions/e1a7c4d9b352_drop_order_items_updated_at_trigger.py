@@ -0,0 +1,27 @@
+"""drop order_items updated_at trigger
+
+Revision ID: e1a7c4d9b352
+Revises: b6d3f8a1c2e4
+Create Date: 2026-10-18 16:05:12.381902
+
+order_items には updated_at 列がないため、create_tables.sql が作成していた
+update_order_items_updated_at トリガーは明細の更新を全て失敗させていた。
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a7c4d9b352'
+down_revision = 'b6d3f8a1c2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('DROP TRIGGER IF EXISTS update_order_items_updated_at ON order_items')
+
+
+def downgrade():
+    # 列がないため、トリガーは再作成しない
+    pass
@@ -0,0 +1,78 @@
+"""track sales summary changes
+
+Revision ID: f3b8d2a6c917
+Revises: e1a7c4d9b352
+Create Date: 2026-10-18 16:40:09.127455
+
+売上サマリーの増分更新を orders.updated_at のウォーターマークから、
+トリガーで記録する変更ログ（sales_summary_changes）に切り替える。
+ログの行は書き込んだトランザクションのコミット時に見えるようになるため、
+長いトランザクションの変更も取りこぼさない。
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2a6c917'
+down_revision = 'e1a7c4d9b352'
+branch_labels = None
+depends_on = None
+
+# (トリガー名, テーブル名, イベント, 遷移テーブルの指定)
+# 遷移テーブルを使うトリガーはイベントを1つしか指定できないため、イベントごとに作成する
+TRIGGERS = [
+    (f'record_{table}_sales_summary_{event.lower()}', table, event, referencing)
+    for table in ('orders', 'order_items')
+    for event, referencing in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    )
+]
+
+
+def upgrade():
+    op.create_table('sales_summary_changes',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('txid', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'txid')
+    )
+    # 文単位のトリガーで、1つの文で変更された行の月をまとめて記録する
+    # 注文日は変更できないため、UPDATEは変更後の行だけを見ればよい
+    op.execute(
+        'CREATE OR REPLACE FUNCTION record_sales_summary_change() RETURNS TRIGGER AS $$ '
+        'BEGIN '
+        "IF TG_OP = 'DELETE' THEN "
+        'INSERT INTO sales_summary_changes (month, txid) '
+        "SELECT DISTINCT date_trunc('month', order_date)::date, txid_current() FROM old_rows "
+        'ON CONFLICT DO NOTHING; '
+        'ELSE '
+        'INSERT INTO sales_summary_changes (month, txid) '
+        "SELECT DISTINCT date_trunc('month', order_date)::date, txid_current() FROM new_rows "
+        'ON CONFLICT DO NOTHING; '
+        'END IF; '
+        'RETURN NULL; '
+        'END; '
+        "$$ language 'plpgsql'"
+    )
+    for name, table, event, referencing in TRIGGERS:
+        op.execute(
+            f'CREATE TRIGGER {name} AFTER {event} ON {table} REFERENCING {referencing} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION record_sales_summary_change()'
+        )
+    op.drop_column('summary_refresh_state', 'watermark')
+    # 増分更新にupdated_atを使わなくなったため不要
+    op.drop_index('ix_orders_updated_at', table_name='orders')
+
+
+def downgrade():
+    op.create_index('ix_orders_updated_at', 'orders', ['updated_at'], unique=False)
+    op.add_column('summary_refresh_state', sa.Column('watermark', sa.DateTime(), nullable=True))
+    # ウォーターマークがないため、次回の更新は全件の作り直しになる
+    op.execute('UPDATE summary_refresh_state SET last_mode = NULL')
+    for name, table, _, _ in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS record_sales_summary_change()')
+    op.drop_table('sales_summary_changes')
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 from pydantic import BaseModel
 from app.core.security import get_password_hash, verify_password
+from app.core.user_cache import invalidate_user
 from app.api import deps
 from app.models.user import User
 from app.models.settings import UserSettings
@@ -79,6 +80,7 @@ def update_system_settings(
 
     db.commit()
     db.refresh(db_settings)
+    invalidate_user(current_user)
 
     return SystemSettingsResponse(
         language=db_settings.language,
@@ -105,6 +107,7 @@ def update_password(
 
     current_user.hashed_password = get_password_hash(password_data.newPassword)
     db.commit()
+    invalidate_user(current_user)
 
     return {"message": "パスワードを更新しました"}
 
@@ -134,6 +137,7 @@ def update_security_settings(
 
     db.commit()
     db.refresh(db_settings)
+    invalidate_user(current_user)
 
     return SecuritySettings(
         twoFactorEnabled=db_settings.two_factor_enabled,
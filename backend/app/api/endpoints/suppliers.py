@@ -1,8 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_user
 from app.crud import supplier as crud_supplier
+from app.schemas.pagination import CursorPage
 from app.schemas.supplier import Supplier, SupplierCreate, SupplierUpdate
 from app.database import get_db
 from app.models.user import User
@@ -20,6 +21,20 @@ def read_suppliers(
     suppliers = crud_supplier.get_suppliers(db, skip=skip, limit=limit)
     return suppliers
 
+@router.get("/cursor", response_model=CursorPage[Supplier])
+def read_suppliers_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, gt=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """取引先一覧をカーソル方式で取得"""
+    try:
+        suppliers, next_cursor = crud_supplier.get_suppliers_page(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": suppliers, "next_cursor": next_cursor}
+
 @router.post("", response_model=Supplier, status_code=status.HTTP_201_CREATED)
 def create_supplier(
     supplier: SupplierCreate,
@@ -1,27 +1,63 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.core import security
+from app.core.user_cache import get_user_by_subject, invalidate_user
 from app.database import get_db
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return security.verify_password(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return security.get_password_hash(password)
+
+def _upgrade_password_hash(db: Session, user: User, new_hash: Optional[str]) -> None:
+    """
+    ハッシュのコストが現在の設定と異なる場合、ログイン成功時に新しいハッシュで置き換える
+    """
+    if not new_hash:
+        return
+    user.hashed_password = new_hash
+    db.commit()
+    # コミットで期限切れになった属性をここで読み直し、呼び出し元で再度SQLが発行されないようにする
+    db.refresh(user)
+    invalidate_user(user)
+
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = _get_user_by_email(db, email)
+    if not user:
+        return None
+    verified, new_hash = security.verify_and_update_password(password, user.hashed_password)
+    if not verified:
+        return None
+    _upgrade_password_hash(db, user, new_hash)
+    return user
+
+async def authenticate_user_async(db: Session, email: str, password: str) -> Optional[User]:
+    """
+    authenticate_userの非同期版
+    bcryptの検証は専用のワーカープールで、ユーザーの検索とハッシュの置き換え（コミット）は
+    スレッドプールで行い、同期セッションのI/Oでイベントループをブロックしない
+    """
+    user = await run_in_threadpool(_get_user_by_email, db, email)
+    if not user:
+        return None
+    verified, new_hash = await security.verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        await run_in_threadpool(_upgrade_password_hash, db, user, new_hash)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -59,7 +95,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_subject(db, "email", email)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,213 @@
+"""
+プロセス内キャッシュ
+"""
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+# 無効化直後のキーに置く目印（getではミスとして扱い、addによる書き戻しを拒否する）
+_INVALIDATED = "__invalidated__"
+
+
+class TTLCache:
+    """
+    有効期限付きのLRUキャッシュ（スレッドセーフ）
+    
+    Attributes:
+        maxsize (int): 保持する最大件数。超えた場合は最も古く参照された要素から削除する
+        ttl (float): 有効期限（秒）。0以下の場合はキャッシュしない
+        invalidation_hold (float): invalidate後にaddを拒否する時間（秒）。0以下の場合はdeleteと同じ
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, invalidation_hold: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.invalidation_hold = invalidation_hold
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        キーに対応する値を返します。存在しないか期限切れの場合はNone
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            if entry[1] is _INVALIDATED:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key: Hashable, expires_at: float, value: Any) -> None:
+        # ロックを取得した状態で呼び出すこと
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """キーに値を設定します"""
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._put(key, time.monotonic() + self.ttl, value)
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """
+        キーが存在しない場合のみ値を設定します
+        invalidateの目印が残っている間も設定しないため、DBから読み込んだ値の書き戻しに使用します
+
+        Returns:
+            bool: 設定した場合はTrue
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._put(key, now + self.ttl, value)
+            return True
+
+    def delete(self, *keys: Hashable) -> None:
+        """指定したキーを削除します（存在しないキーは無視）"""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        指定したキーを削除し、invalidation_hold秒の間はaddによる再設定を拒否します
+        無効化の前に読み込まれた古い値が、無効化の後に書き戻されるのを防ぎます
+        """
+        if self.invalidation_hold <= 0 or self.maxsize <= 0:
+            self.delete(*keys)
+            return
+        with self._lock:
+            for key in keys:
+                self._put(key, time.monotonic() + self.invalidation_hold, _INVALIDATED)
+
+    def clear(self) -> None:
+        """全ての要素を削除します"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット数・ミス数・現在の件数を返します"""
+        with self._lock:
+            return {
+                "backend": "memory",
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+class RedisCache:
+    """
+    Redis互換のサーバーを使う共有キャッシュ（複数ワーカー間で無効化を共有できる）
+    
+    値はJSONで保存するため、JSONに変換できる値のみ扱えます。
+    clientにはget/set(ex=, nx=)/deleteを持つ任意のオブジェクトを渡せるため、
+    テストではインプロセスのフェイク（tests/fake_redis.py）に差し替えられます。
+    """
+
+    def __init__(self, client: Any, namespace: str, ttl: float = 60.0, invalidation_hold: float = 0.0):
+        self.client = client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.invalidation_hold = invalidation_hold
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raw = self.client.get(self._key(key))
+        with self._lock:
+            if raw is None or raw == _INVALIDATED.encode():
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self.client.set(self._key(key), json.dumps(value), ex=int(self.ttl))
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        # SET NXで、値または無効化の目印があるキーには書き込まない（確認と設定を1コマンドで行う）
+        if self.ttl <= 0:
+            return False
+        return bool(self.client.set(self._key(key), json.dumps(value), ex=int(self.ttl), nx=True))
+
+    def delete(self, *keys: Hashable) -> None:
+        if keys:
+            self.client.delete(*[self._key(key) for key in keys])
+
+    def invalidate(self, *keys: Hashable) -> None:
+        if self.invalidation_hold <= 0:
+            self.delete(*keys)
+            return
+        for key in keys:
+            self.client.set(self._key(key), _INVALIDATED, ex=math.ceil(self.invalidation_hold))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "redis",
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_redis_client = None
+
+def _get_redis_client() -> Any:
+    """REDIS_URLのクライアントを生成します（redisパッケージはオプション依存）"""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis を使用するには redis パッケージが必要です") from e
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+def create_cache(namespace: str, maxsize: int, ttl: float, invalidation_hold: float = 0.0):
+    """
+    設定値CACHE_BACKENDに応じたキャッシュを生成します
+    
+    Args:
+        namespace: キーの名前空間（Redisのキーの接頭辞）
+        maxsize: プロセス内キャッシュの最大件数
+        ttl: 有効期限（秒）
+        invalidation_hold: invalidate後にaddを拒否する時間（秒）
+        
+    Returns:
+        TTLCache または RedisCache
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(_get_redis_client(), namespace, ttl=ttl, invalidation_hold=invalidation_hold)
+    return TTLCache(maxsize=maxsize, ttl=ttl, invalidation_hold=invalidation_hold)
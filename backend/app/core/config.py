@@ -17,11 +17,31 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
     DB_NAME: str = os.getenv("DB_NAME", "myorder")
     DOMAIN: str = os.getenv("DOMAIN", "localhost")
+    # 非同期ドライバ(asyncpg)用のURL。未設定の場合はDATABASE_URLから生成する
+    ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+
+    # コネクションプール設定（同期・非同期エンジン共通、いずれもプロセス単位）
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # 秒。-1で無効
+    DB_POOL_PRE_PING: bool = True
+
+    # /api/db/query/stream のストリーミング設定
+    DB_QUERY_STREAM_MAX_ROWS: int = 1000000
+    DB_QUERY_STREAM_CHUNK_SIZE: int = 1000
     
     # JWT認証設定
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # 認証済みユーザーのキャッシュ（0で無効）
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAX_SIZE: int = 1024
+    # パスワードハッシュ計算用のワーカースレッド数（プロセス単位）
+    PASSWORD_HASH_WORKERS: int = 2
+    # bcryptのコスト（2の累乗回）。変更すると既存のハッシュは次回ログイン時に再計算される
+    PASSWORD_BCRYPT_ROUNDS: int = 12
     
     # 初期管理者ユーザー設定
     FIRST_ADMIN_USERNAME: str = os.getenv("FIRST_ADMIN_USERNAME", "admin")
@@ -31,6 +51,41 @@ class Settings(BaseSettings):
     # Access DB設定（レガシー）
     ACCESS_DB_PATH: str = os.getenv("ACCESS_DB_PATH", "")
 
+    # マスタデータ（商品・顧客）のキャッシュ設定
+    # CACHE_BACKEND: "memory"（プロセス内）または "redis"（複数ワーカーで共有、redisパッケージが必要）
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    MASTER_CACHE_TTL_SECONDS: int = 300
+    MASTER_CACHE_MAX_SIZE: int = 10000
+    # 無効化したキーへ読み込み結果を書き戻さない時間（秒）
+    # 無効化の前にDBから読んだ古い行が、無効化の後にキャッシュされるのを防ぐ
+    MASTER_CACHE_INVALIDATION_HOLD_SECONDS: int = 5
+    # 商品の入力補完インデックスを作り直す間隔（0の場合は起動時のみ）
+    # crud.itemを経由しない変更（Excel取込など）や、他のワーカープロセスでの変更を反映するため
+    TYPEAHEAD_REBUILD_INTERVAL_SECONDS: int = 600
+
+    # レスポンス設定
+    # Trueの場合、既定のレスポンスクラスをorjsonベースのORJSONResponseにする（orjsonパッケージが必要）
+    FAST_JSON_RESPONSE: bool = False
+
+    # Excel取込設定
+    EXCEL_IMPORT_CHUNK_SIZE: int = 1000
+
+    # 注文一括登録設定
+    ORDER_BULK_BATCH_SIZE: int = 1000
+
+    # 注文テーブルのパーティション設定
+    # ORDER_PARTITION_MONTHS_AHEAD: 当月から何か月先までの月次パーティションを事前に作成するか
+    # ORDER_PARTITION_MAINTENANCE_INTERVAL_SECONDS: パーティション作成・アーカイブを定期実行する間隔（0の場合は起動時のみ）
+    # ORDER_ARCHIVE_AFTER_MONTHS: 何か月より前のパーティションをアーカイブするか（0の場合はアーカイブしない）
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
+    ORDER_PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 86400
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 0
+
+    # 売上サマリー（レポート）設定
+    # REPORT_REFRESH_INTERVAL_SECONDS: 増分更新を定期実行する間隔（0の場合は定期実行しない）
+    REPORT_REFRESH_INTERVAL_SECONDS: int = 0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -2,32 +2,32 @@
 Dependencies module for FastAPI application.
 This module contains all the dependency functions used across the application.
 """
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.user_cache import get_user_by_subject
+from app.db.async_session import AsyncSessionLocal
+from app.db.session import SessionLocal, get_db  # noqa: F401
 from app.models.user import User
 
 # OAuth2のトークンURL設定
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_db() -> Generator[Session, None, None]:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    データベースセッションの依存関係を提供する関数
+    非同期データベースセッションの依存関係を提供する関数
     
     Yields:
-        Session: SQLAlchemyのデータベースセッション
+        AsyncSession: SQLAlchemyの非同期データベースセッション
     """
-    try:
-        db = SessionLocal()
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 async def get_current_user(
     db: Session = Depends(get_db),
@@ -61,7 +61,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    user = get_user_by_subject(db, "username", username)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,84 @@
+"""
+HTTP条件付きリクエスト（ETag / If-None-Match）のためのヘルパー
+"""
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+# 行のバージョン情報（ID、更新日時）
+RowVersion = Tuple[Any, Optional[datetime]]
+
+
+def compute_etag(versions: Iterable[RowVersion]) -> str:
+    """
+    行のバージョン情報から弱いETagを生成します
+
+    レスポンス本文ではなく(ID, 更新日時)の並びから計算するため、
+    一覧全体を取得・シリアライズせずに変更の有無を判定できます。
+
+    Args:
+        versions: (ID, 更新日時)のタプルの並び
+
+    Returns:
+        str: ETagヘッダーの値
+    """
+    digest = hashlib.sha1()
+    for row_id, version in versions:
+        stamp = version.isoformat() if version is not None else ""
+        digest.update(f"{row_id}:{stamp};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Matchヘッダーが指定されたETagに一致するかを判定します（弱い比較）
+
+    Args:
+        request: リクエスト
+        etag: 現在のETag
+
+    Returns:
+        bool: 一致する場合はTrue
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    レスポンスにETagを設定します。クライアントには毎回再検証させます
+
+    Args:
+        response: レスポンス
+        etag: ETag
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """
+    304 Not Modifiedのレスポンスを返します
+
+    Args:
+        etag: ETag
+
+    Returns:
+        Response: 本文なしのレスポンス
+    """
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
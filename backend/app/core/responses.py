@@ -0,0 +1,48 @@
+"""
+レスポンス生成のヘルパー
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+def default_response_class() -> type:
+    """
+    アプリケーション既定のレスポンスクラスを返します
+
+    Returns:
+        type: FAST_JSON_RESPONSEが有効な場合はORJSONResponse、それ以外はJSONResponse
+    """
+    return ORJSONResponse if settings.FAST_JSON_RESPONSE else JSONResponse
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    # TypeAdapterの構築はコストが高いため、型ごとに1つだけ作成する
+    return TypeAdapter(schema)
+
+
+def model_response(schema: Any, data: Any, status_code: int = 200) -> Response:
+    """
+    ORMオブジェクトをスキーマで一度だけ検証し、JSONに直接変換したレスポンスを返します
+
+    FastAPIのresponse_model処理（検証→jsonable_encoder→json.dumps）を経由せず、
+    pydantic-coreでfrom_attributes検証とJSON変換を行います。
+    返したResponseはそのまま送信されるため、ヘッダーは戻り値に設定してください。
+
+    Args:
+        schema: レスポンスのスキーマ（例: List[OrderResponse]）
+        data: ORMオブジェクトまたはそのリスト
+        status_code: ステータスコード
+
+    Returns:
+        Response: application/jsonのレスポンス
+    """
+    adapter = _adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content=body, status_code=status_code, media_type="application/json")
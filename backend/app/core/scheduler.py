@@ -0,0 +1,100 @@
+"""
+アプリケーション内で定期的にジョブを実行するための簡易スケジューラー
+"""
+import logging
+import threading
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    一定間隔で関数を実行するバックグラウンドスレッド
+
+    前回の実行が終わってから次の待機を始めるため、同じジョブが重なって実行されることはありません。
+    ジョブ内の例外はログに記録し、次の実行は継続します。
+    """
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], None]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.runs = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.func()
+                self.runs += 1
+            except Exception:
+                self.failures += 1
+                logger.exception("定期ジョブ %s の実行に失敗しました", self.name)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop,
+            name=f"job-{self.name}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "running": self._thread is not None,
+            "runs": self.runs,
+            "failures": self.failures,
+        }
+
+
+class Scheduler:
+    """
+    定期ジョブの登録と起動・停止をまとめて管理します
+
+    main.pyのstartup/shutdownイベントからstart/stopを呼び出します。
+    間隔が0以下のジョブは登録しません（設定で無効化できるようにするため）。
+    """
+
+    def __init__(self):
+        self._jobs: List[PeriodicJob] = []
+
+    def register(self, name: str, interval_seconds: float, func: Callable[[], None]) -> None:
+        """
+        定期ジョブを登録します
+
+        Args:
+            name: ジョブ名
+            interval_seconds: 実行間隔（秒）。0以下の場合は登録しない
+            func: 実行する関数
+        """
+        if interval_seconds <= 0:
+            return
+        self._jobs.append(PeriodicJob(name, interval_seconds, func))
+
+    def start(self) -> None:
+        for job in self._jobs:
+            job.start()
+
+    def stop(self) -> None:
+        for job in self._jobs:
+            job.stop()
+
+    def stats(self) -> List[Dict[str, object]]:
+        return [job.stats() for job in self._jobs]
+
+
+scheduler = Scheduler()
@@ -1,33 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 from passlib.context import CryptContext
 from jose import jwt
 
+from app.core.config import settings
+
+T = TypeVar("T")
+
 # パスワードハッシュのためのコンテキストを設定
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# アプリケーション内のハッシュ計算は全てこのコンテキストを使用する。
+# min/maxを設定値に揃えることで、コストの異なる既存ハッシュはneeds_update対象になる
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+
+class PasswordHashPool:
+    """
+    bcryptの計算を専用のワーカースレッドで実行するプール
+
+    ワーカー数を制限することで、ログインが集中してもCPUを使い切らず、
+    イベントループや他のリクエストの処理を妨げないようにします。
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._running = 0
+        self.completed = 0
+
+    def _track(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._submitted -= 1
+                self.completed += 1
+
+    def _submit(self, fn: Callable[..., T], *args: Any):
+        with self._lock:
+            self._submitted += 1
+        return self._executor.submit(self._track, fn, *args)
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """プールで関数を実行し、結果を待って返します"""
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., T], *args: Any) -> T:
+        """プールで関数を実行し、イベントループをブロックせずに結果を待ちます"""
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        プールの状態を返します
+
+        Returns:
+            Dict[str, int]: ワーカー数、実行中の件数、キューで待機中の件数、完了件数
+        """
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queue_depth": self._submitted - self._running,
+                "completed": self.completed,
+            }
+
+
+password_hash_pool = PasswordHashPool(settings.PASSWORD_HASH_WORKERS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     プレーンテキストのパスワードとハッシュ化されたパスワードを比較検証します
-    
+
     Args:
         plain_password: プレーンテキストのパスワード
         hashed_password: ハッシュ化されたパスワード
-        
+
     Returns:
         bool: パスワードが一致する場合はTrue、それ以外はFalse
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     パスワードをハッシュ化します
-    
+
     Args:
         password: ハッシュ化するパスワード
-        
+
     Returns:
         str: ハッシュ化されたパスワード
     """
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return password_hash_pool.run(pwd_context.hash, password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    パスワードを検証し、ハッシュが現在のコスト設定と異なる場合は再計算したハッシュを返します
+
+    Args:
+        plain_password: プレーンテキストのパスワード
+        hashed_password: ハッシュ化されたパスワード
+
+    Returns:
+        Tuple[bool, Optional[str]]: 検証結果と、更新が必要な場合の新しいハッシュ（不要な場合はNone）
+    """
+    return password_hash_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    verify_passwordの非同期版。async defのエンドポイントから使用します
+    """
+    return await password_hash_pool.run_async(pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    verify_and_update_passwordの非同期版。async defのエンドポイントから使用します
+    """
+    return await password_hash_pool.run_async(pwd_context.verify_and_update, plain_password, hashed_password)
@@ -0,0 +1,26 @@
+"""
+検索用の文字列正規化
+"""
+import re
+import unicodedata
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_search_text(value: str) -> str:
+    """
+    検索語を正規化します
+
+    NFKC正規化で全角英数字・記号を半角に、半角カタカナを全角に揃え、小文字に変換します。
+    DB側の search_normalize() 関数（lower(normalize(value, NFKC))）と同じ変換のため、
+    正規化した検索語は search_normalize() を適用した列と比較できます。
+    連続する空白は1つにまとめ、前後の空白を取り除きます。
+
+    Args:
+        value: 検索語
+
+    Returns:
+        str: 正規化した検索語
+    """
+    normalized = unicodedata.normalize("NFKC", value).lower()
+    return _SPACES.sub(" ", normalized).strip()
@@ -0,0 +1,175 @@
+"""
+入力補完用のプロセス内前方一致インデックス
+"""
+import threading
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.text import normalize_search_text
+
+
+class PrefixIndex:
+    """
+    コードと名前の前方一致で候補を返すインデックス（スレッドセーフ）
+
+    正規化したコード・名前と行IDの組をそれぞれソート済みのリストに保持し、
+    bisectで検索語の開始位置を求めて前方一致する範囲だけを走査します。
+    DBには問い合わせないため、件数が多くても1回の検索はマイクロ秒単位で終わります。
+    追加・削除はリストへの挿入・削除（O(n)のメモリ移動）のため、一括の変更はbuildで作り直します。
+    作り直し用の読み込み中に行われた追加・削除はrecordingで記録し、buildで読み込み結果に再適用します。
+
+    Attributes:
+        name (str): インデックス名（統計情報用）
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._codes: List[Tuple[str, int]] = []
+        self._names: List[Tuple[str, int]] = []
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # upsert/removeごとに進める版数と、recording中の変更の記録（版数, 行ID, 追加後の値 or None）
+        self._version = 0
+        self._recorders = 0
+        self._journal: List[Tuple[int, int, Optional[Dict[str, Any]]]] = []
+        self.lookups = 0
+        self.builds = 0
+
+    @staticmethod
+    def _keys(entry: Dict[str, Any]) -> Tuple[str, str]:
+        return normalize_search_text(entry["code"]), normalize_search_text(entry["name"])
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        code, name = self._keys(entry)
+        self._entries[entry["id"]] = entry
+        insort(self._codes, (code, entry["id"]))
+        insort(self._names, (name, entry["id"]))
+
+    def _discard(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        code, name = self._keys(entry)
+        for keys, key in ((self._codes, code), (self._names, name)):
+            index = bisect_left(keys, (key, entry_id))
+            if index < len(keys) and keys[index] == (key, entry_id):
+                del keys[index]
+
+    def _record(self, entry_id: int, entry: Optional[Dict[str, Any]]) -> None:
+        self._version += 1
+        if self._recorders:
+            self._journal.append((self._version, entry_id, entry))
+
+    @contextmanager
+    def recording(self) -> Iterator[int]:
+        """
+        作り直し用のデータを読み込む間、upsert/removeを記録します
+
+        ブロックに入った時点の版数を返します。ブロック内で読み込んだデータをbuildに
+        その版数とともに渡すと、読み込み中に行われた変更が失われません。
+
+        Yields:
+            int: ブロックに入った時点の版数
+        """
+        with self._lock:
+            self._recorders += 1
+            version = self._version
+        try:
+            yield version
+        finally:
+            with self._lock:
+                self._recorders -= 1
+                if not self._recorders:
+                    self._journal.clear()
+
+    def build(self, entries: Iterable[Dict[str, Any]], since: Optional[int] = None) -> None:
+        """
+        インデックスを作り直します
+
+        Args:
+            entries: id, code, name を含む辞書の並び
+            since: recordingで得た版数。指定した場合、それより後のupsert/removeを再適用する
+        """
+        entries = {entry["id"]: entry for entry in entries}
+        codes = sorted((normalize_search_text(e["code"]), i) for i, e in entries.items())
+        names = sorted((normalize_search_text(e["name"]), i) for i, e in entries.items())
+        with self._lock:
+            self._entries, self._codes, self._names = entries, codes, names
+            if since is not None:
+                for version, entry_id, entry in self._journal:
+                    if version <= since:
+                        continue
+                    self._discard(entry_id)
+                    if entry is not None:
+                        self._add(entry)
+            self.builds += 1
+
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """
+        1件を追加または置き換えます
+
+        Args:
+            entry: id, code, name を含む辞書
+        """
+        with self._lock:
+            self._discard(entry["id"])
+            self._add(entry)
+            self._record(entry["id"], entry)
+
+    def remove(self, entry_id: int) -> None:
+        """
+        1件を削除します（存在しない場合は何もしない）
+
+        Args:
+            entry_id: 行ID
+        """
+        with self._lock:
+            self._discard(entry_id)
+            self._record(entry_id, None)
+
+    @staticmethod
+    def _scan(keys: List[Tuple[str, int]], prefix: str):
+        index = bisect_left(keys, (prefix,))
+        while index < len(keys) and keys[index][0].startswith(prefix):
+            yield keys[index][1]
+            index += 1
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        前方一致する候補を返します
+
+        コードが前方一致するものをコード順に、次に名前が前方一致するものを名前順に返します。
+
+        Args:
+            prefix: 検索語（正規化して比較する）
+            limit: 返す最大件数
+
+        Returns:
+            List[Dict[str, Any]]: 候補のリスト
+        """
+        prefix = normalize_search_text(prefix)
+        if not prefix or limit <= 0:
+            return []
+        found: List[Dict[str, Any]] = []
+        seen = set()
+        with self._lock:
+            self.lookups += 1
+            for keys in (self._codes, self._names):
+                for entry_id in self._scan(keys, prefix):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    found.append(self._entries[entry_id])
+                    if len(found) >= limit:
+                        return found
+        return found
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "lookups": self.lookups,
+            "builds": self.builds,
+            "version": self._version,
+        }
@@ -0,0 +1,69 @@
+"""
+認証済みユーザーのキャッシュ
+
+JWTのsubject（ユーザー名またはメールアドレス）をキーに、セッションから切り離した
+Userをキャッシュします。リクエストにはmerge(load=False)で現在のセッションに
+結び付けたコピーを返すため、SQLを発行せずに通常のORMオブジェクトとして扱えます。
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# キーの種類（トークンのsubjectとして使われる列）
+LOOKUP_FIELDS = ("username", "email")
+
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+def get_user_by_subject(db: Session, field: str, value: str) -> Optional[User]:
+    """
+    トークンのsubjectからユーザーを取得します（キャッシュ優先）
+    
+    Args:
+        db: データベースセッション
+        field: subjectに対応する列（"username" または "email"）
+        value: subjectの値
+        
+    Returns:
+        Optional[User]: 現在のセッションに結び付いたユーザー。存在しない場合はNone
+    """
+    if field not in LOOKUP_FIELDS:
+        raise ValueError(f"不明な検索キーです: {field}")
+
+    cached = user_cache.get((field, value))
+    if cached is None:
+        user = db.query(User).filter(getattr(User, field) == value).first()
+        if user is None:
+            return None
+        # セッションから切り離した状態でキャッシュし、以降のリクエストで共有する
+        # expungeは関連オブジェクトに連鎖しないため、同時に読み込んだ設定も切り離す
+        # （残すと最初のセッションのコミットで期限切れになり、キャッシュヒットのたびにSELECTが発行される）
+        if user.settings is not None:
+            db.expunge(user.settings)
+        db.expunge(user)
+        user_cache.set((field, value), user)
+        cached = user
+
+    return db.merge(cached, load=False)
+
+def invalidate_user(user: Optional[User]) -> None:
+    """
+    ユーザーのキャッシュを削除します
+    ユーザー情報・パスワード・設定を変更した場合は必ず呼び出してください
+    
+    Args:
+        user: 対象のユーザー（ユーザー名・メールアドレスの変更前の値で呼び出すこと）
+    """
+    if user is None:
+        return
+    user_cache.delete(*[
+        (field, getattr(user, field))
+        for field in LOOKUP_FIELDS
+        if getattr(user, field, None) is not None
+    ])
@@ -0,0 +1,126 @@
+"""
+顧客のCRUD操作（非同期版）
+"""
+from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.customer import Customer
+from .customer import invalidate_cache
+from ..schemas.customer import CustomerCreate, CustomerUpdate
+
+async def get(db: AsyncSession, customer_id: int) -> Optional[Customer]:
+    """
+    指定されたIDの顧客を取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        customer_id: 顧客ID
+        
+    Returns:
+        Optional[Customer]: 顧客が存在する場合はその顧客、存在しない場合はNone
+    """
+    return await db.get(Customer, customer_id)
+
+async def get_by_code(db: AsyncSession, code: str) -> Optional[Customer]:
+    """
+    指定されたコードの顧客を取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        code: 顧客コード
+        
+    Returns:
+        Optional[Customer]: 顧客が存在する場合はその顧客、存在しない場合はNone
+    """
+    result = await db.execute(select(Customer).where(Customer.code == code))
+    return result.scalars().first()
+
+async def get_multi(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    is_active: Optional[bool] = None
+) -> List[Customer]:
+    """
+    顧客のリストを取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        is_active: アクティブな顧客のみを取得する場合はTrue
+        
+    Returns:
+        List[Customer]: 顧客のリスト
+    """
+    stmt = select(Customer)
+    if is_active is not None:
+        stmt = stmt.where(Customer.is_active == is_active)
+    result = await db.execute(stmt.order_by(Customer.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+async def create(db: AsyncSession, obj_in: CustomerCreate) -> Customer:
+    """
+    新しい顧客を作成します
+    
+    Args:
+        db: 非同期データベースセッション
+        obj_in: 作成する顧客のデータ
+        
+    Returns:
+        Customer: 作成された顧客
+    """
+    db_obj = Customer(**obj_in.model_dump())
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+async def update(db: AsyncSession, db_obj: Customer, obj_in: CustomerUpdate) -> Customer:
+    """
+    顧客を更新します
+    
+    Args:
+        db: 非同期データベースセッション
+        db_obj: 更新する顧客
+        obj_in: 更新データ
+        
+    Returns:
+        Customer: 更新された顧客
+    """
+    # コード変更時に旧コードのキーが残らないよう、更新前の値で無効化する（crud.customer.updateと同じ）
+    # キャッシュの操作はRedisへの同期I/Oになり得るため、イベントループではなくスレッドプールで行う
+    await run_in_threadpool(invalidate_cache, db_obj)
+    update_data = obj_in.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await run_in_threadpool(invalidate_cache, db_obj)
+    return db_obj
+
+async def delete(db: AsyncSession, customer_id: int) -> bool:
+    """
+    顧客を削除します
+    
+    Args:
+        db: 非同期データベースセッション
+        customer_id: 削除する顧客のID
+        
+    Returns:
+        bool: 削除に成功した場合はTrue、顧客が存在しない場合はFalse
+    """
+    row = (await db.execute(
+        delete(Customer)
+        .where(Customer.id == customer_id)
+        .returning(Customer.id, Customer.code)
+        .execution_options(synchronize_session=False)
+    )).first()
+    await db.commit()
+    if row is None:
+        return False
+    await run_in_threadpool(invalidate_cache, row)
+    return True
@@ -0,0 +1,129 @@
+"""
+商品のCRUD操作（非同期版）
+"""
+from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.item import Item
+from .item import _sync_typeahead, invalidate_cache, item_typeahead
+from ..schemas.item import ItemCreate, ItemUpdate
+
+async def get(db: AsyncSession, item_id: int) -> Optional[Item]:
+    """
+    指定されたIDの商品を取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        item_id: 商品ID
+        
+    Returns:
+        Optional[Item]: 商品が存在する場合はその商品、存在しない場合はNone
+    """
+    return await db.get(Item, item_id)
+
+async def get_by_code(db: AsyncSession, code: str) -> Optional[Item]:
+    """
+    指定されたコードの商品を取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        code: 商品コード
+        
+    Returns:
+        Optional[Item]: 商品が存在する場合はその商品、存在しない場合はNone
+    """
+    result = await db.execute(select(Item).where(Item.code == code))
+    return result.scalars().first()
+
+async def get_multi(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    is_active: Optional[bool] = None
+) -> List[Item]:
+    """
+    商品のリストを取得します
+    
+    Args:
+        db: 非同期データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        is_active: アクティブな商品のみを取得する場合はTrue
+        
+    Returns:
+        List[Item]: 商品のリスト
+    """
+    stmt = select(Item)
+    if is_active is not None:
+        stmt = stmt.where(Item.is_active == is_active)
+    result = await db.execute(stmt.order_by(Item.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+async def create(db: AsyncSession, obj_in: ItemCreate) -> Item:
+    """
+    新しい商品を作成します
+    
+    Args:
+        db: 非同期データベースセッション
+        obj_in: 作成する商品のデータ
+        
+    Returns:
+        Item: 作成された商品
+    """
+    db_obj = Item(**obj_in.model_dump())
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    _sync_typeahead(db_obj)
+    return db_obj
+
+async def update(db: AsyncSession, db_obj: Item, obj_in: ItemUpdate) -> Item:
+    """
+    商品を更新します
+    
+    Args:
+        db: 非同期データベースセッション
+        db_obj: 更新する商品
+        obj_in: 更新データ
+        
+    Returns:
+        Item: 更新された商品
+    """
+    # コード変更時に旧コードのキーが残らないよう、更新前の値で無効化する（crud.item.updateと同じ）
+    # キャッシュの操作はRedisへの同期I/Oになり得るため、イベントループではなくスレッドプールで行う
+    await run_in_threadpool(invalidate_cache, db_obj)
+    update_data = obj_in.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_obj, field, value)
+
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    await run_in_threadpool(invalidate_cache, db_obj)
+    _sync_typeahead(db_obj)
+    return db_obj
+
+async def delete(db: AsyncSession, item_id: int) -> bool:
+    """
+    商品を削除します
+    
+    Args:
+        db: 非同期データベースセッション
+        item_id: 削除する商品のID
+        
+    Returns:
+        bool: 削除に成功した場合はTrue、商品が存在しない場合はFalse
+    """
+    row = (await db.execute(
+        delete(Item)
+        .where(Item.id == item_id)
+        .returning(Item.id, Item.code)
+        .execution_options(synchronize_session=False)
+    )).first()
+    await db.commit()
+    if row is None:
+        return False
+    await run_in_threadpool(invalidate_cache, row)
+    item_typeahead.remove(row.id)
+    return True
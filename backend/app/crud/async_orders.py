@@ -0,0 +1,130 @@
+"""
+CRUD operations for orders (async).
+"""
+from typing import List, Optional, Any
+from sqlalchemy import and_, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.orders import LOAD_PROFILES, UNDELETABLE_STATUSES, status_transition
+from app.crud.stock import OrderStateError
+from app.models.order import Order
+from app.schemas.order import OrderUpdate
+
+# 非同期セッションでは遅延読み込みができないため、
+# リレーションを参照する場合は必ずcustomer/detailの読み込み戦略を指定する
+
+def _order_select(load: str = "plain"):
+    """
+    読み込み戦略を適用した注文のSELECT文を返す
+    
+    Args:
+        load: crud.orders.LOAD_PROFILESのキー
+    """
+    if load not in LOAD_PROFILES:
+        raise ValueError(f"不明な読み込み戦略です: {load}")
+    return select(Order).options(*LOAD_PROFILES[load])
+
+async def get_order(db: AsyncSession, order_id: int, load: str = "plain") -> Optional[Order]:
+    """
+    指定されたIDの注文を取得する
+    
+    Args:
+        db: 非同期データベースセッション
+        order_id: 注文ID
+        load: リレーションの読み込み戦略
+    
+    Returns:
+        Optional[Order]: 注文オブジェクト（存在しない場合はNone）
+    """
+    result = await db.execute(_order_select(load).where(Order.id == order_id))
+    return result.unique().scalars().first()
+
+async def get_orders(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    filters: List[Any] = None,
+    load: str = "plain"
+) -> List[Order]:
+    """
+    注文一覧を取得する（作成日時の新しい順）
+    
+    Args:
+        db: 非同期データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        filters: フィルター条件のリスト
+        load: リレーションの読み込み戦略
+    
+    Returns:
+        List[Order]: 注文オブジェクトのリスト
+    """
+    stmt = _order_select(load)
+    if filters:
+        stmt = stmt.where(and_(*filters))
+    stmt = stmt.order_by(Order.created_at.desc(), Order.id.desc()).offset(skip).limit(limit)
+    result = await db.execute(stmt)
+    return list(result.unique().scalars().all())
+
+async def update_order(db: AsyncSession, order: Order, order_update: OrderUpdate) -> Order:
+    """
+    注文を更新する
+    
+    Args:
+        db: 非同期データベースセッション
+        order: 更新する注文オブジェクト
+        order_update: 更新データ
+    
+    Returns:
+        Order: 更新された注文オブジェクト
+    
+    Raises:
+        OrderStateError: 許可されていないステータスの変更の場合（crud.orders.update_orderと同じ）
+    """
+    update_data = order_update.model_dump(exclude_unset=True)
+    status = update_data.pop("status", None)
+    if status is not None and status != order.status:
+        if (await db.execute(status_transition(order, status))).scalar() is None:
+            await db.rollback()
+            raise OrderStateError("注文のステータスが他の処理で変更されました")
+    for field, value in update_data.items():
+        setattr(order, field, value)
+
+    db.add(order)
+    await db.commit()
+    await db.refresh(order)
+    return order
+
+async def delete_order(db: AsyncSession, order_id: int) -> bool:
+    """
+    注文を削除する
+    
+    Args:
+        db: 非同期データベースセッション
+        order_id: 削除する注文のID
+    
+    Returns:
+        bool: 削除に成功した場合はTrue、注文が存在しない場合はFalse
+    
+    Raises:
+        OrderStateError: 在庫を引き当てている注文の場合
+    """
+    deleted_id = (await db.execute(
+        delete(Order)
+        .where(
+            Order.id == order_id,
+            Order.status.notin_([status.value for status in UNDELETABLE_STATUSES])
+        )
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )).scalar()
+    if deleted_id is None:
+        status = (await db.execute(select(Order.status).where(Order.id == order_id))).scalar()
+        await db.rollback()
+        if status is not None:
+            raise OrderStateError(
+                f"ステータスが {status} の注文は在庫を引き当てているため削除できません。先にキャンセルしてください"
+            )
+        return False
+    await db.commit()
+    return True
@@ -1,7 +1,23 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete as sql_delete, func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from ..models.customer import Customer
+from .search import contains, search_master
+from .pagination import paginate_keyset
+from ..core.cache import create_cache
+from ..core.config import settings
 from ..schemas.customer import CustomerCreate, CustomerUpdate
+from ..schemas.customer import Customer as CustomerSchema
+
+# 顧客マスタのキャッシュ（IDとコードの両方をキーに同じ値を保持する）
+customer_cache = create_cache(
+    "customer",
+    maxsize=settings.MASTER_CACHE_MAX_SIZE,
+    ttl=settings.MASTER_CACHE_TTL_SECONDS,
+    invalidation_hold=settings.MASTER_CACHE_INVALIDATION_HOLD_SECONDS
+)
 
 def get(db: Session, customer_id: int) -> Optional[Customer]:
     """
@@ -29,11 +45,71 @@ def get_by_code(db: Session, code: str) -> Optional[Customer]:
     """
     return db.query(Customer).filter(Customer.code == code).first()
 
+def _cache_customer(db_obj: Customer) -> dict:
+    """
+    顧客をキャッシュに格納し、格納した値を返します
+    既にあるキーや無効化された直後のキーには格納しません
+    （読み込み中に他のリクエストが更新・無効化した場合に、古い行を書き戻さないため）
+    """
+    data = CustomerSchema.model_validate(db_obj).model_dump(mode="json")
+    customer_cache.add(f"id:{db_obj.id}", data)
+    customer_cache.add(f"code:{db_obj.code}", data)
+    return data
+
+def invalidate_cache(db_obj: Customer) -> None:
+    """
+    顧客のキャッシュを削除します
+    MASTER_CACHE_INVALIDATION_HOLD_SECONDS秒の間は、DBから読み込んだ値を書き戻しません
+    
+    Args:
+        db_obj: 対象の顧客
+    """
+    customer_cache.invalidate(f"id:{db_obj.id}", f"code:{db_obj.code}")
+
+def get_cached(db: Session, customer_id: int) -> Optional[CustomerSchema]:
+    """
+    指定されたIDの顧客をキャッシュ経由で取得します（読み取り専用）
+    
+    Args:
+        db: データベースセッション
+        customer_id: 顧客ID
+        
+    Returns:
+        Optional[CustomerSchema]: 顧客が存在する場合はその顧客、存在しない場合はNone
+    """
+    data = customer_cache.get(f"id:{customer_id}")
+    if data is None:
+        db_obj = get(db, customer_id)
+        if db_obj is None:
+            return None
+        data = _cache_customer(db_obj)
+    return CustomerSchema.model_validate(data)
+
+def get_by_code_cached(db: Session, code: str) -> Optional[CustomerSchema]:
+    """
+    指定されたコードの顧客をキャッシュ経由で取得します（読み取り専用）
+    
+    Args:
+        db: データベースセッション
+        code: 顧客コード
+        
+    Returns:
+        Optional[CustomerSchema]: 顧客が存在する場合はその顧客、存在しない場合はNone
+    """
+    data = customer_cache.get(f"code:{code}")
+    if data is None:
+        db_obj = get_by_code(db, code)
+        if db_obj is None:
+            return None
+        data = _cache_customer(db_obj)
+    return CustomerSchema.model_validate(data)
+
 def get_multi(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    name: Optional[str] = None
 ) -> List[Customer]:
     """
     顧客のリストを取得します
@@ -43,6 +119,7 @@ def get_multi(
         skip: スキップする件数
         limit: 取得する最大件数
         is_active: アクティブな顧客のみを取得する場合はTrue
+        name: 顧客名の部分一致（全角・半角、大文字・小文字を区別しない）
         
     Returns:
         List[Customer]: 顧客のリスト
@@ -50,7 +127,93 @@ def get_multi(
     query = db.query(Customer)
     if is_active is not None:
         query = query.filter(Customer.is_active == is_active)
-    return query.offset(skip).limit(limit).all()
+    if name:
+        query = query.filter(contains(Customer.name, name))
+    # ETag用のget_multi_versionsと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Customer.id).offset(skip).limit(limit).all()
+
+def get_multi_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    is_active: Optional[bool] = None,
+    name: Optional[str] = None
+) -> List[Tuple[int, Optional[datetime]]]:
+    """
+    get_multiと同じ条件で、顧客のIDと更新日時のみを取得します（ETag計算用）
+    
+    Args:
+        db: データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        is_active: アクティブな顧客のみを取得する場合はTrue
+        name: 顧客名の部分一致（全角・半角、大文字・小文字を区別しない）
+        
+    Returns:
+        List[Tuple[int, Optional[datetime]]]: (ID, 更新日時)のリスト
+    """
+    query = db.query(Customer.id, func.coalesce(Customer.updated_at, Customer.created_at))
+    if is_active is not None:
+        query = query.filter(Customer.is_active == is_active)
+    if name:
+        query = query.filter(contains(Customer.name, name))
+    # get_multiと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Customer.id).offset(skip).limit(limit).all()
+
+def search(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    is_active: Optional[bool] = None
+) -> List[Customer]:
+    """
+    顧客をコード・名前などで検索し、関連度の高い順に取得します
+    
+    検索対象: code・name・contact_person（全角・半角、大文字・小文字を区別しない）
+    
+    Args:
+        db: データベースセッション
+        q: 検索語
+        limit: 取得する最大件数
+        is_active: アクティブな顧客のみを取得する場合はTrue
+        
+    Returns:
+        List[Customer]: 顧客のリスト
+    """
+    return search_master(
+        db,
+        Customer,
+        [Customer.code, Customer.name, Customer.contact_person],
+        q,
+        limit=limit,
+        is_active=is_active
+    )
+
+def get_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    is_active: Optional[bool] = None
+) -> Tuple[List[Customer], Optional[str]]:
+    """
+    顧客のリストをキーセット方式で取得します
+    
+    Args:
+        db: データベースセッション
+        cursor: 前ページのカーソル（先頭ページの場合はNone）
+        limit: 取得する最大件数
+        is_active: アクティブな顧客のみを取得する場合はTrue
+        
+    Returns:
+        Tuple[List[Customer], Optional[str]]: 顧客のリストと次ページのカーソル
+        
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    query = db.query(Customer)
+    if is_active is not None:
+        query = query.filter(Customer.is_active == is_active)
+    return paginate_keyset(query, [Customer.id], limit, cursor=cursor)
 
 def create(db: Session, obj_in: CustomerCreate) -> Customer:
     """
@@ -89,6 +252,8 @@ def update(db: Session, db_obj: Customer, obj_in: CustomerUpdate) -> Customer:
     Returns:
         Customer: 更新された顧客
     """
+    # コード変更時に旧コードのキーが残らないよう、更新前の値で無効化する
+    invalidate_cache(db_obj)
     update_data = obj_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
@@ -96,8 +261,33 @@ def update(db: Session, db_obj: Customer, obj_in: CustomerUpdate) -> Customer:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_cache(db_obj)
     return db_obj
 
+def remove(db: Session, customer_id: int) -> Optional[Row]:
+    """
+    顧客をDELETE ... RETURNINGで削除し、削除した行を返します
+    
+    削除前に顧客を読み込まないため、1回のクエリで完了します
+    
+    Args:
+        db: データベースセッション
+        customer_id: 削除する顧客のID
+        
+    Returns:
+        Optional[Row]: 削除した顧客の行、存在しない場合はNone
+    """
+    row = db.execute(
+        sql_delete(Customer)
+        .where(Customer.id == customer_id)
+        .returning(*Customer.__table__.columns)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    if row is not None:
+        invalidate_cache(row)
+    return row
+
 def delete(db: Session, customer_id: int) -> bool:
     """
     顧客を削除します
@@ -109,9 +299,4 @@ def delete(db: Session, customer_id: int) -> bool:
     Returns:
         bool: 削除に成功した場合はTrue、顧客が存在しない場合はFalse
     """
-    obj = db.query(Customer).get(customer_id)
-    if not obj:
-        return False
-    db.delete(obj)
-    db.commit()
-    return True 
\ No newline at end of file
+    return remove(db, customer_id) is not None
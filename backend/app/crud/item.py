@@ -1,7 +1,27 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import delete as sql_delete, func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from ..models.item import Item
+from .search import contains, search_master
+from .pagination import paginate_keyset
+from ..core.cache import create_cache
+from ..core.config import settings
+from ..core.typeahead import PrefixIndex
 from ..schemas.item import ItemCreate, ItemUpdate
+from ..schemas.item import Item as ItemSchema
+
+# 商品マスタのキャッシュ（IDとコードの両方をキーに同じ値を保持する）
+item_cache = create_cache(
+    "item",
+    maxsize=settings.MASTER_CACHE_MAX_SIZE,
+    ttl=settings.MASTER_CACHE_TTL_SECONDS,
+    invalidation_hold=settings.MASTER_CACHE_INVALIDATION_HOLD_SECONDS
+)
+
+# 入力補完用の前方一致インデックス（アクティブな商品のみ）
+item_typeahead = PrefixIndex("item")
 
 def get(db: Session, item_id: int) -> Optional[Item]:
     """
@@ -29,11 +49,71 @@ def get_by_code(db: Session, code: str) -> Optional[Item]:
     """
     return db.query(Item).filter(Item.code == code).first()
 
+def _cache_item(db_obj: Item) -> dict:
+    """
+    商品をキャッシュに格納し、格納した値を返します
+    既にあるキーや無効化された直後のキーには格納しません
+    （読み込み中に他のリクエストが更新・無効化した場合に、古い行を書き戻さないため）
+    """
+    data = ItemSchema.model_validate(db_obj).model_dump(mode="json")
+    item_cache.add(f"id:{db_obj.id}", data)
+    item_cache.add(f"code:{db_obj.code}", data)
+    return data
+
+def invalidate_cache(db_obj: Item) -> None:
+    """
+    商品のキャッシュを削除します
+    MASTER_CACHE_INVALIDATION_HOLD_SECONDS秒の間は、DBから読み込んだ値を書き戻しません
+    
+    Args:
+        db_obj: 対象の商品
+    """
+    item_cache.invalidate(f"id:{db_obj.id}", f"code:{db_obj.code}")
+
+def get_cached(db: Session, item_id: int) -> Optional[ItemSchema]:
+    """
+    指定されたIDの商品をキャッシュ経由で取得します（読み取り専用）
+    
+    Args:
+        db: データベースセッション
+        item_id: 商品ID
+        
+    Returns:
+        Optional[ItemSchema]: 商品が存在する場合はその商品、存在しない場合はNone
+    """
+    data = item_cache.get(f"id:{item_id}")
+    if data is None:
+        db_obj = get(db, item_id)
+        if db_obj is None:
+            return None
+        data = _cache_item(db_obj)
+    return ItemSchema.model_validate(data)
+
+def get_by_code_cached(db: Session, code: str) -> Optional[ItemSchema]:
+    """
+    指定されたコードの商品をキャッシュ経由で取得します（読み取り専用）
+    
+    Args:
+        db: データベースセッション
+        code: 商品コード
+        
+    Returns:
+        Optional[ItemSchema]: 商品が存在する場合はその商品、存在しない場合はNone
+    """
+    data = item_cache.get(f"code:{code}")
+    if data is None:
+        db_obj = get_by_code(db, code)
+        if db_obj is None:
+            return None
+        data = _cache_item(db_obj)
+    return ItemSchema.model_validate(data)
+
 def get_multi(
     db: Session, 
     skip: int = 0, 
     limit: int = 100,
-    is_active: Optional[bool] = None
+    is_active: Optional[bool] = None,
+    name: Optional[str] = None
 ) -> List[Item]:
     """
     商品のリストを取得します
@@ -43,14 +123,152 @@ def get_multi(
         skip: スキップする件数
         limit: 取得する最大件数
         is_active: アクティブな商品のみを取得する場合はTrue
+        name: 商品名の部分一致（全角・半角、大文字・小文字を区別しない）
+        
+    Returns:
+        List[Item]: 商品のリスト
+    """
+    query = db.query(Item)
+    if is_active is not None:
+        query = query.filter(Item.is_active == is_active)
+    if name:
+        query = query.filter(contains(Item.name, name))
+    # ETag用のget_multi_versionsと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Item.id).offset(skip).limit(limit).all()
+
+def get_multi_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    is_active: Optional[bool] = None,
+    name: Optional[str] = None
+) -> List[Tuple[int, Optional[datetime]]]:
+    """
+    get_multiと同じ条件で、商品のIDと更新日時のみを取得します（ETag計算用）
+    
+    Args:
+        db: データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        is_active: アクティブな商品のみを取得する場合はTrue
+        name: 商品名の部分一致（全角・半角、大文字・小文字を区別しない）
+        
+    Returns:
+        List[Tuple[int, Optional[datetime]]]: (ID, 更新日時)のリスト
+    """
+    query = db.query(Item.id, func.coalesce(Item.updated_at, Item.created_at))
+    if is_active is not None:
+        query = query.filter(Item.is_active == is_active)
+    if name:
+        query = query.filter(contains(Item.name, name))
+    # get_multiと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Item.id).offset(skip).limit(limit).all()
+
+def search(
+    db: Session,
+    q: str,
+    limit: int = 20,
+    is_active: Optional[bool] = None
+) -> List[Item]:
+    """
+    商品をコード・名前などで検索し、関連度の高い順に取得します
+    
+    検索対象: code・name・description（全角・半角、大文字・小文字を区別しない）
+    
+    Args:
+        db: データベースセッション
+        q: 検索語
+        limit: 取得する最大件数
+        is_active: アクティブな商品のみを取得する場合はTrue
         
     Returns:
         List[Item]: 商品のリスト
     """
+    return search_master(
+        db,
+        Item,
+        [Item.code, Item.name, Item.description],
+        q,
+        limit=limit,
+        is_active=is_active
+    )
+
+def _typeahead_entry(db_obj) -> dict:
+    return {
+        "id": db_obj.id,
+        "code": db_obj.code,
+        "name": db_obj.name,
+        "unit": db_obj.unit,
+        "unit_price": db_obj.unit_price,
+    }
+
+def _sync_typeahead(db_obj) -> None:
+    """
+    変更後の商品を入力補完インデックスに反映します
+    """
+    if db_obj.is_active:
+        item_typeahead.upsert(_typeahead_entry(db_obj))
+    else:
+        item_typeahead.remove(db_obj.id)
+
+def load_typeahead(db: Session) -> int:
+    """
+    アクティブな商品から入力補完インデックスを作り直します
+    
+    Args:
+        db: データベースセッション
+        
+    Returns:
+        int: インデックスに登録した商品数
+    """
+    # 読み込み中に別のリクエストで登録・更新・削除された商品を失わないよう、変更を記録しながら読み込む
+    with item_typeahead.recording() as version:
+        rows = (
+            db.query(Item.id, Item.code, Item.name, Item.unit, Item.unit_price)
+            .filter(Item.is_active.is_(True))
+            .all()
+        )
+        item_typeahead.build((_typeahead_entry(row) for row in rows), since=version)
+    return len(rows)
+
+def suggest(q: str, limit: int = 10) -> List[dict]:
+    """
+    コードまたは名前が前方一致する商品の候補を入力補完インデックスから取得します（DBに問い合わせない）
+    
+    Args:
+        q: 検索語（全角・半角、大文字・小文字を区別しない）
+        limit: 取得する最大件数
+        
+    Returns:
+        List[dict]: id, code, name, unit, unit_price の辞書のリスト
+    """
+    return item_typeahead.suggest(q, limit=limit)
+
+def get_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    is_active: Optional[bool] = None
+) -> Tuple[List[Item], Optional[str]]:
+    """
+    商品のリストをキーセット方式で取得します
+    
+    Args:
+        db: データベースセッション
+        cursor: 前ページのカーソル（先頭ページの場合はNone）
+        limit: 取得する最大件数
+        is_active: アクティブな商品のみを取得する場合はTrue
+        
+    Returns:
+        Tuple[List[Item], Optional[str]]: 商品のリストと次ページのカーソル
+        
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
     query = db.query(Item)
     if is_active is not None:
         query = query.filter(Item.is_active == is_active)
-    return query.offset(skip).limit(limit).all()
+    return paginate_keyset(query, [Item.id], limit, cursor=cursor)
 
 def create(db: Session, obj_in: ItemCreate) -> Item:
     """
@@ -77,6 +295,7 @@ def create(db: Session, obj_in: ItemCreate) -> Item:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    _sync_typeahead(db_obj)
     return db_obj
 
 def update(db: Session, db_obj: Item, obj_in: ItemUpdate) -> Item:
@@ -91,6 +310,8 @@ def update(db: Session, db_obj: Item, obj_in: ItemUpdate) -> Item:
     Returns:
         Item: 更新された商品
     """
+    # コード変更時に旧コードのキーが残らないよう、更新前の値で無効化する
+    invalidate_cache(db_obj)
     update_data = obj_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
@@ -98,8 +319,35 @@ def update(db: Session, db_obj: Item, obj_in: ItemUpdate) -> Item:
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_cache(db_obj)
+    _sync_typeahead(db_obj)
     return db_obj
 
+def remove(db: Session, item_id: int) -> Optional[Row]:
+    """
+    商品をDELETE ... RETURNINGで削除し、削除した行を返します
+    
+    削除前に商品を読み込まないため、1回のクエリで完了します
+    
+    Args:
+        db: データベースセッション
+        item_id: 削除する商品のID
+        
+    Returns:
+        Optional[Row]: 削除した商品の行、存在しない場合はNone
+    """
+    row = db.execute(
+        sql_delete(Item)
+        .where(Item.id == item_id)
+        .returning(*Item.__table__.columns)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db.commit()
+    if row is not None:
+        invalidate_cache(row)
+        item_typeahead.remove(row.id)
+    return row
+
 def delete(db: Session, item_id: int) -> bool:
     """
     商品を削除します
@@ -111,9 +359,4 @@ def delete(db: Session, item_id: int) -> bool:
     Returns:
         bool: 削除に成功した場合はTrue、商品が存在しない場合はFalse
     """
-    obj = db.query(Item).get(item_id)
-    if not obj:
-        return False
-    db.delete(obj)
-    db.commit()
-    return True 
\ No newline at end of file
+    return remove(db, item_id) is not None
@@ -2,7 +2,9 @@ from typing import List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
 from ..models.order import Order, OrderItem
-from ..schemas.order import OrderCreate, OrderUpdate, OrderItemCreate
+from ..schemas.order import OrderCreate, OrderUpdate, OrderItemCreate, OrderItemUpdate
+from .orders import apply_order_total_delta, delete_order, update_order
+from .stock import lock_editable_order
 
 def get(db: Session, order_id: int) -> Optional[Order]:
     """
@@ -71,7 +73,9 @@ def create(db: Session, obj_in: OrderCreate) -> Order:
         order_date=obj_in.order_date or datetime.utcnow(),
         delivery_date=obj_in.delivery_date,
         status=obj_in.status,
-        notes=obj_in.notes
+        notes=obj_in.notes,
+        total_amount=sum(item.quantity * item.unit_price for item in obj_in.items),
+        line_count=len(obj_in.items)
     )
     db.add(db_obj)
     db.flush()  # IDを生成するためにflush
@@ -80,6 +84,7 @@ def create(db: Session, obj_in: OrderCreate) -> Order:
     for item in obj_in.items:
         order_item = OrderItem(
             order_id=db_obj.id,
+            order_date=db_obj.order_date,
             item_id=item.item_id,
             quantity=item.quantity,
             unit_price=item.unit_price,
@@ -93,7 +98,7 @@ def create(db: Session, obj_in: OrderCreate) -> Order:
 
 def update(db: Session, db_obj: Order, obj_in: OrderUpdate) -> Order:
     """
-    注文を更新します
+    注文を更新します（crud.orders.update_orderと同じ）
     
     Args:
         db: データベースセッション
@@ -102,15 +107,11 @@ def update(db: Session, db_obj: Order, obj_in: OrderUpdate) -> Order:
         
     Returns:
         Order: 更新された注文
+        
+    Raises:
+        OrderStateError: 許可されていないステータスの変更の場合
     """
-    update_data = obj_in.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-    return db_obj
+    return update_order(db, db_obj, obj_in)
 
 def delete(db: Session, order_id: int) -> bool:
     """
@@ -123,12 +124,7 @@ def delete(db: Session, order_id: int) -> bool:
     Returns:
         bool: 削除に成功した場合はTrue、注文が存在しない場合はFalse
     """
-    obj = db.query(Order).get(order_id)
-    if not obj:
-        return False
-    db.delete(obj)
-    db.commit()
-    return True
+    return delete_order(db, order_id)
 
 def add_items(db: Session, order: Order, items: List[OrderItemCreate]) -> Order:
     """
@@ -141,21 +137,68 @@ def add_items(db: Session, order: Order, items: List[OrderItemCreate]) -> Order:
         
     Returns:
         Order: 更新された注文
+        
+    Raises:
+        OrderStateError: 注文が在庫を引き当てたステータスの場合
     """
+    lock_editable_order(db, order.id)
     for item in items:
         order_item = OrderItem(
             order_id=order.id,
+            order_date=order.order_date,
             item_id=item.item_id,
             quantity=item.quantity,
             unit_price=item.unit_price,
             notes=item.notes
         )
         db.add(order_item)
+    apply_order_total_delta(
+        db,
+        order.id,
+        order.order_date,
+        amount=sum(item.quantity * item.unit_price for item in items),
+        lines=len(items)
+    )
     
     db.commit()
     db.refresh(order)
     return order
 
+def update_item(db: Session, order_item: OrderItem, obj_in: OrderItemUpdate) -> OrderItem:
+    """
+    注文明細を更新し、注文の合計金額を同じトランザクションで更新します
+    
+    Args:
+        db: データベースセッション
+        order_item: 更新する注文明細
+        obj_in: 更新データ
+        
+    Returns:
+        OrderItem: 更新された注文明細
+        
+    Raises:
+        OrderStateError: 注文が在庫を引き当てたステータスの場合
+    """
+    lock_editable_order(db, order_item.order_id)
+    # 明細の変更は注文の行ロックで直列化されるため、ロック後の値から差分を計算する
+    db.refresh(order_item)
+    before = order_item.quantity * order_item.unit_price
+    update_data = obj_in.dict(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(order_item, field, value)
+    db.add(order_item)
+    apply_order_total_delta(
+        db,
+        order_item.order_id,
+        order_item.order_date,
+        amount=order_item.quantity * order_item.unit_price - before,
+        lines=0
+    )
+    
+    db.commit()
+    db.refresh(order_item)
+    return order_item
+
 def remove_item(db: Session, order_item_id: int) -> bool:
     """
     注文から商品を削除します
@@ -166,10 +209,26 @@ def remove_item(db: Session, order_item_id: int) -> bool:
         
     Returns:
         bool: 削除に成功した場合はTrue、注文明細が存在しない場合はFalse
+        
+    Raises:
+        OrderStateError: 注文が在庫を引き当てたステータスの場合
     """
     obj = db.query(OrderItem).get(order_item_id)
     if not obj:
         return False
+    lock_editable_order(db, obj.order_id)
+    # ロック待ちの間に削除・変更されていないか、ロック後の値で確認する
+    obj = db.query(OrderItem).filter(OrderItem.id == order_item_id).populate_existing().first()
+    if not obj:
+        db.rollback()
+        return False
+    apply_order_total_delta(
+        db,
+        obj.order_id,
+        obj.order_date,
+        amount=-(obj.quantity * obj.unit_price),
+        lines=-1
+    )
     db.delete(obj)
     db.commit()
     return True 
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Aggregate queries over orders and order items.
+
+集計は全てPostgreSQL側のSUM/COUNT/GROUP BYで行い、
+注文や明細のオブジェクトをアプリケーションに読み込まない。
+"""
+from typing import Any, List, Optional
+
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderItem, OrderStatus
+
+# date_truncに渡す集計単位
+PERIODS = ("day", "month")
+
+# 注文と明細の結合条件。パーティションキーの注文日も一致させ、対応する月のパーティション同士だけを結合する
+_order_lines = and_(OrderItem.order_id == Order.id, OrderItem.order_date == Order.order_date)
+
+# 明細金額（数量×単価）の合計。明細がない注文は0とする
+_line_amount = func.coalesce(func.sum(OrderItem.quantity * OrderItem.unit_price), 0.0)
+_line_quantity = func.coalesce(func.sum(OrderItem.quantity), 0)
+
+
+def _apply_filters(query, filters: Optional[List[Any]], include_cancelled: bool):
+    """
+    フィルター条件とキャンセル除外を適用する
+    """
+    conditions = list(filters or [])
+    if not include_cancelled:
+        conditions.append(Order.status != OrderStatus.CANCELLED)
+    if conditions:
+        query = query.filter(and_(*conditions))
+    return query
+
+
+def get_order_totals(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: List[Any] = None,
+    include_cancelled: bool = False
+) -> List[Row]:
+    """
+    注文ごとの明細数・数量・金額の合計を取得する
+
+    Args:
+        db: データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        filters: 注文に対するフィルター条件のリスト
+        include_cancelled: キャンセルされた注文を含める場合はTrue
+
+    Returns:
+        List[Row]: order_id, customer_id, order_date, status, line_count, total_quantity, total_amount
+    """
+    query = (
+        db.query(
+            Order.id.label("order_id"),
+            Order.customer_id,
+            Order.order_date,
+            Order.status,
+            func.count(OrderItem.id).label("line_count"),
+            _line_quantity.label("total_quantity"),
+            _line_amount.label("total_amount"),
+        )
+        .outerjoin(OrderItem, _order_lines)
+    )
+    query = _apply_filters(query, filters, include_cancelled)
+    return (
+        query.group_by(Order.id, Order.order_date, Order.customer_id, Order.status)
+        .order_by(Order.order_date.desc(), Order.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_customer_totals(
+    db: Session,
+    filters: List[Any] = None,
+    include_cancelled: bool = False
+) -> List[Row]:
+    """
+    顧客ごとの注文数・数量・金額の合計を取得する（金額の大きい順）
+
+    Args:
+        db: データベースセッション
+        filters: 注文に対するフィルター条件のリスト
+        include_cancelled: キャンセルされた注文を含める場合はTrue
+
+    Returns:
+        List[Row]: customer_id, order_count, total_quantity, total_amount
+    """
+    query = (
+        db.query(
+            Order.customer_id,
+            func.count(func.distinct(Order.id)).label("order_count"),
+            _line_quantity.label("total_quantity"),
+            _line_amount.label("total_amount"),
+        )
+        .outerjoin(OrderItem, _order_lines)
+    )
+    query = _apply_filters(query, filters, include_cancelled)
+    return query.group_by(Order.customer_id).order_by(_line_amount.desc()).all()
+
+
+def get_period_totals(
+    db: Session,
+    period: str = "day",
+    filters: List[Any] = None,
+    include_cancelled: bool = False
+) -> List[Row]:
+    """
+    注文日の日別または月別に注文数・数量・金額の合計を取得する（期間の古い順）
+
+    Args:
+        db: データベースセッション
+        period: 集計単位（"day" または "month"）
+        filters: 注文に対するフィルター条件のリスト
+        include_cancelled: キャンセルされた注文を含める場合はTrue
+
+    Returns:
+        List[Row]: period, order_count, total_quantity, total_amount
+
+    Raises:
+        ValueError: 不明な集計単位が指定された場合
+    """
+    if period not in PERIODS:
+        raise ValueError(f"不明な集計単位です: {period}")
+    # GROUP BYとSELECTで同じ式と判定されるよう、集計単位はバインド変数ではなくリテラルで埋め込む
+    bucket = func.date_trunc(literal_column(f"'{period}'"), Order.order_date)
+    query = (
+        db.query(
+            bucket.label("period"),
+            func.count(func.distinct(Order.id)).label("order_count"),
+            _line_quantity.label("total_quantity"),
+            _line_amount.label("total_amount"),
+        )
+        .outerjoin(OrderItem, _order_lines)
+    )
+    query = _apply_filters(query, filters, include_cancelled)
+    return query.group_by(bucket).order_by(bucket).all()
+
+
+def get_item_totals(
+    db: Session,
+    filters: List[Any] = None,
+    include_cancelled: bool = False
+) -> List[Row]:
+    """
+    商品ごとの注文数・数量・金額の合計を取得する（金額の大きい順）
+
+    Args:
+        db: データベースセッション
+        filters: 注文に対するフィルター条件のリスト
+        include_cancelled: キャンセルされた注文を含める場合はTrue
+
+    Returns:
+        List[Row]: item_id, order_count, total_quantity, total_amount
+    """
+    amount = func.sum(OrderItem.quantity * OrderItem.unit_price)
+    query = (
+        db.query(
+            OrderItem.item_id,
+            func.count(func.distinct(OrderItem.order_id)).label("order_count"),
+            func.sum(OrderItem.quantity).label("total_quantity"),
+            amount.label("total_amount"),
+        )
+        .join(Order, _order_lines)
+    )
+    query = _apply_filters(query, filters, include_cancelled)
+    return query.group_by(OrderItem.item_id).order_by(amount.desc()).all()
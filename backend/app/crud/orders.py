@@ -1,31 +1,77 @@
 """
 CRUD operations for orders.
 """
-from typing import List, Optional, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from datetime import datetime
+from typing import List, Optional, Any, Dict, Sequence, Tuple
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+from sqlalchemy import Integer, and_, any_, bindparam, delete, func, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
 
-from app.models.order import Order
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.core.config import settings
+from app.crud.pagination import paginate_keyset
+from app.crud.stock import OrderStateError, RELEASABLE_STATUSES
+from app.models.customer import Customer
+from app.models.item import Item
+from app.models.order import Order, OrderItem, OrderStatus, ORDER_STATUS_TRANSITIONS
+from app.schemas.order import OrderCreate, OrderUpdate, OrderBulkCreate
 
-def get_order(db: Session, order_id: int) -> Optional[Order]:
+# 一括削除の対象とする既定のステータス（完了した注文のみ。引当済みの在庫がある注文は含めない）
+PURGEABLE_STATUSES = (OrderStatus.DELIVERED, OrderStatus.CANCELLED)
+# 在庫を引き当てたままのため削除できないステータス（先に/cancelで在庫を戻す）
+UNDELETABLE_STATUSES = RELEASABLE_STATUSES
+
+# 合計金額の整合性チェックで許容する誤差（浮動小数点の丸め誤差）
+TOTAL_AMOUNT_TOLERANCE = 0.005
+
+# リレーションの読み込み戦略（エンドポイントごとに選択する）
+# - plain: リレーションを読み込まない
+# - customer: 顧客を同じクエリでJOINして読み込む
+# - detail: 顧客をJOINし、明細と明細の商品をIN句の追加クエリ1回で読み込む
+LOAD_PROFILES = {
+    "plain": (),
+    "customer": (joinedload(Order.customer),),
+    "detail": (
+        joinedload(Order.customer),
+        selectinload(Order.items).joinedload(OrderItem.item),
+    ),
+}
+
+def _order_query(db: Session, load: str = "plain") -> Query:
+    """
+    読み込み戦略を適用した注文クエリを返す
+    
+    Args:
+        db: データベースセッション
+        load: LOAD_PROFILESのキー
+    
+    Returns:
+        Query: 注文クエリ
+    """
+    if load not in LOAD_PROFILES:
+        raise ValueError(f"不明な読み込み戦略です: {load}")
+    return db.query(Order).options(*LOAD_PROFILES[load])
+
+def get_order(db: Session, order_id: int, load: str = "plain") -> Optional[Order]:
     """
     指定されたIDの注文を取得する
     
     Args:
         db: データベースセッション
         order_id: 注文ID
+        load: リレーションの読み込み戦略（LOAD_PROFILESのキー）
     
     Returns:
         Optional[Order]: 注文オブジェクト（存在しない場合はNone）
     """
-    return db.query(Order).filter(Order.id == order_id).first()
+    return _order_query(db, load).filter(Order.id == order_id).first()
 
 def get_orders(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    filters: List[Any] = None
+    filters: List[Any] = None,
+    load: str = "plain"
 ) -> List[Order]:
     """
     注文一覧を取得する
@@ -35,14 +81,74 @@ def get_orders(
         skip: スキップする件数
         limit: 取得する最大件数
         filters: フィルター条件のリスト
+        load: リレーションの読み込み戦略（LOAD_PROFILESのキー）
     
     Returns:
         List[Order]: 注文オブジェクトのリスト
     """
-    query = db.query(Order)
+    query = _order_query(db, load)
+    if filters:
+        query = query.filter(and_(*filters))
+    # ETag用のget_order_versionsと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Order.order_date, Order.id).offset(skip).limit(limit).all()
+
+def get_order_versions(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    filters: List[Any] = None
+) -> List[Tuple[int, datetime]]:
+    """
+    get_ordersと同じ条件で、注文のIDと更新日時のみを取得する（ETag計算用）
+    
+    Args:
+        db: データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数
+        filters: フィルター条件のリスト
+    
+    Returns:
+        List[Tuple[int, datetime]]: (ID, 更新日時)のリスト
+    """
+    query = db.query(Order.id, Order.updated_at)
+    if filters:
+        query = query.filter(and_(*filters))
+    # get_ordersと同じ行を返すよう、ページの並び順を固定する
+    return query.order_by(Order.order_date, Order.id).offset(skip).limit(limit).all()
+
+def get_orders_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    filters: List[Any] = None,
+    load: str = "plain"
+) -> Tuple[List[Order], Optional[str]]:
+    """
+    注文一覧をキーセット方式で取得する（作成日時の新しい順）
+    
+    Args:
+        db: データベースセッション
+        cursor: 前ページのカーソル（先頭ページの場合はNone）
+        limit: 取得する最大件数
+        filters: フィルター条件のリスト
+        load: リレーションの読み込み戦略（LOAD_PROFILESのキー）
+    
+    Returns:
+        Tuple[List[Order], Optional[str]]: 注文オブジェクトのリストと次ページのカーソル
+    
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    query = _order_query(db, load)
     if filters:
         query = query.filter(and_(*filters))
-    return query.offset(skip).limit(limit).all()
+    return paginate_keyset(
+        query,
+        [Order.created_at, Order.id],
+        limit,
+        cursor=cursor,
+        descending=True
+    )
 
 def create_order(db: Session, order: OrderCreate) -> Order:
     """
@@ -67,10 +173,347 @@ def create_order(db: Session, order: OrderCreate) -> Order:
     db.refresh(db_order)
     return db_order
 
+def insert_order_batch(
+    db: Session,
+    orders: Sequence[Dict[str, Any]],
+    lines: Sequence[Sequence[Dict[str, Any]]]
+) -> List[int]:
+    """
+    注文ヘッダと明細をmulti-row INSERTでまとめて書き込む（コミットは呼び出し側で行う）
+    注文ヘッダの合計金額と明細数は明細から計算して設定する
+    
+    Args:
+        db: データベースセッション
+        orders: 注文ヘッダの値の辞書のリスト
+        lines: 注文ごとの明細の値の辞書のリスト（ordersと同じ順序）
+    
+    Returns:
+        List[int]: 登録された注文IDのリスト（ordersと同じ順序）
+    """
+    if not orders:
+        return []
+
+    # 明細から合計金額と明細数を計算し、注文ヘッダと同じINSERTで書き込む
+    order_rows = [
+        {
+            **order,
+            "total_amount": sum(line["quantity"] * line["unit_price"] for line in order_lines),
+            "line_count": len(order_lines),
+        }
+        for order, order_lines in zip(orders, lines)
+    ]
+
+    # RETURNINGの結果をパラメータ順に揃えて明細と対応付ける
+    # 明細には注文の注文日（パーティションキー）も必要なため、IDと合わせて受け取る
+    returned = db.execute(
+        insert(Order).returning(Order.id, Order.order_date, sort_by_parameter_order=True),
+        order_rows
+    ).all()
+
+    line_rows = [
+        {**line, "order_id": order_id, "order_date": order_date}
+        for (order_id, order_date), order_lines in zip(returned, lines)
+        for line in order_lines
+    ]
+    if line_rows:
+        db.execute(insert(OrderItem), line_rows)
+    return [order_id for order_id, _order_date in returned]
+
+class UnknownReferenceError(ValueError):
+    """一括登録の注文が存在しない顧客・商品を参照している場合のエラー"""
+
+    def __init__(self, customer_ids: List[int], item_ids: List[int]):
+        super().__init__("存在しない顧客または商品が指定されています")
+        self.customer_ids = customer_ids
+        self.item_ids = item_ids
+
+
+class BulkInsertError(ValueError):
+    """一括登録の途中のバッチで書き込みに失敗した場合のエラー（それまでのバッチはコミット済み）"""
+
+    def __init__(self, order_ids: List[int], failed_batch: int, reason: str):
+        super().__init__(f"{failed_batch + 1}番目のバッチの登録に失敗しました: {reason}")
+        self.order_ids = order_ids
+        self.failed_batch = failed_batch
+
+
+def _check_references(db: Session, orders: Sequence[OrderBulkCreate]) -> None:
+    """
+    注文が参照する顧客・商品が全て存在するか、書き込み前にまとめて確認する
+
+    Raises:
+        UnknownReferenceError: 存在しない顧客・商品がある場合
+    """
+    customer_ids = {order.customer_id for order in orders}
+    item_ids = {item.item_id for order in orders for item in order.items}
+    found_customers = set(db.execute(
+        select(Customer.id).where(
+            Customer.id == any_(bindparam("customer_ids", list(customer_ids), type_=ARRAY(Integer)))
+        )
+    ).scalars())
+    found_items = set(db.execute(
+        select(Item.id).where(
+            Item.id == any_(bindparam("item_ids", list(item_ids), type_=ARRAY(Integer)))
+        )
+    ).scalars())
+    db.rollback()
+    missing_customers = sorted(customer_ids - found_customers)
+    missing_items = sorted(item_ids - found_items)
+    if missing_customers or missing_items:
+        raise UnknownReferenceError(missing_customers, missing_items)
+
+
+def bulk_create_orders(
+    db: Session,
+    orders: Sequence[OrderBulkCreate],
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    明細付きの注文を一括登録する
+    バッチごとに1トランザクションで書き込み、ORMオブジェクトは生成しない
+    
+    参照する顧客・商品は書き込み前にまとめて確認するため、存在しないIDを含む場合は何も登録しない。
+    確認後に削除されたなどの理由で途中のバッチが失敗した場合は、
+    それまでにコミットした注文IDをBulkInsertErrorに含めて返す
+    
+    Args:
+        db: データベースセッション
+        orders: 登録する注文データのリスト
+        batch_size: 1トランザクションあたりの注文数（省略時は設定値）
+    
+    Returns:
+        Dict[str, Any]: created, lines, batches, order_ids（入力と同じ順序）
+    
+    Raises:
+        UnknownReferenceError: 存在しない顧客・商品を参照している場合
+        BulkInsertError: 途中のバッチの書き込みに失敗した場合
+    """
+    batch_size = batch_size or settings.ORDER_BULK_BATCH_SIZE
+    _check_references(db, orders)
+
+    order_ids: List[int] = []
+    batches = 0
+    for start in range(0, len(orders), batch_size):
+        batch = orders[start:start + batch_size]
+        try:
+            order_ids.extend(insert_order_batch(
+                db,
+                [
+                    {
+                        "customer_id": order.customer_id,
+                        "order_date": order.order_date,
+                        # 在庫の引当は/confirmでのみ行うため、一括登録は常に保留中で登録する
+                        "status": OrderStatus.PENDING.value,
+                    }
+                    for order in batch
+                ],
+                [
+                    [item.model_dump() for item in order.items]
+                    for order in batch
+                ]
+            ))
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise BulkInsertError(order_ids, batches, str(e.orig)) from e
+        except Exception:
+            db.rollback()
+            raise
+        batches += 1
+    return {
+        "created": len(order_ids),
+        "lines": sum(len(order.items) for order in orders),
+        "batches": batches,
+        "order_ids": order_ids,
+    }
+
+def apply_order_total_delta(
+    db: Session,
+    order_id: int,
+    order_date: datetime,
+    amount: float,
+    lines: int
+) -> None:
+    """
+    注文の合計金額と明細数に差分を加算する（コミットは呼び出し側で行う）
+    
+    読み込んで書き戻すのではなく、UPDATE文の中で加算するため
+    同じ注文への同時更新でも値が失われない
+    
+    Args:
+        db: データベースセッション
+        order_id: 注文ID
+        order_date: 注文日（パーティションの絞り込みに使用）
+        amount: 合計金額の差分
+        lines: 明細数の差分
+    """
+    db.execute(
+        update(Order)
+        .where(Order.id == order_id, Order.order_date == order_date)
+        .values(
+            total_amount=Order.total_amount + amount,
+            line_count=Order.line_count + lines
+        )
+    )
+
+def _line_totals():
+    """注文ごとの明細金額の合計と明細数を求めるサブクエリ"""
+    return (
+        select(
+            OrderItem.order_id.label("order_id"),
+            OrderItem.order_date.label("order_date"),
+            func.sum(OrderItem.quantity * OrderItem.unit_price).label("total_amount"),
+            func.count(OrderItem.id).label("line_count"),
+        )
+        .group_by(OrderItem.order_id, OrderItem.order_date)
+        .subquery()
+    )
+
+def find_inconsistent_order_totals(db: Session, limit: int = 100) -> List[Dict[str, Any]]:
+    """
+    保存されている合計金額・明細数が明細の集計と一致しない注文を探す
+    
+    Args:
+        db: データベースセッション
+        limit: 取得する最大件数
+    
+    Returns:
+        List[Dict[str, Any]]: order_id, stored_amount, actual_amount, stored_lines, actual_lines
+    """
+    lines = _line_totals()
+    actual_amount = func.coalesce(lines.c.total_amount, 0.0)
+    actual_lines = func.coalesce(lines.c.line_count, 0)
+    rows = db.execute(
+        select(
+            Order.id.label("order_id"),
+            Order.total_amount.label("stored_amount"),
+            actual_amount.label("actual_amount"),
+            Order.line_count.label("stored_lines"),
+            actual_lines.label("actual_lines"),
+        )
+        .outerjoin(
+            lines,
+            and_(lines.c.order_id == Order.id, lines.c.order_date == Order.order_date)
+        )
+        .where(or_(
+            func.abs(Order.total_amount - actual_amount) > TOTAL_AMOUNT_TOLERANCE,
+            Order.line_count != actual_lines
+        ))
+        .order_by(Order.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in rows]
+
+def recalculate_order_totals(
+    db: Session,
+    order_ids: Optional[Sequence[int]] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    明細から合計金額と明細数を再計算して保存する（不整合の修復・バックフィル用）
+    
+    保存値が明細の集計と一致しない注文だけを更新する。一致している注文を更新すると
+    updated_atのトリガーで更新日時が進み、ETagや売上サマリーの増分更新の対象が無駄に増えるため。
+    全注文を対象とする場合はIDの範囲でバッチに分け、バッチごとにコミットする
+    
+    Args:
+        db: データベースセッション
+        order_ids: 対象の注文IDのリスト（省略時は全注文）
+        batch_size: 1トランザクションで処理する注文IDの範囲・件数（省略時は設定値）
+    
+    Returns:
+        int: 更新した注文数
+    """
+    batch_size = batch_size or settings.ORDER_BULK_BATCH_SIZE
+    # 注文ごとに明細をインデックス（ix_order_items_order_id）で集計する相関サブクエリ
+    actual_amount = func.coalesce(
+        select(func.sum(OrderItem.quantity * OrderItem.unit_price))
+        .where(OrderItem.order_id == Order.id, OrderItem.order_date == Order.order_date)
+        .scalar_subquery(),
+        0.0
+    )
+    actual_lines = (
+        select(func.count(OrderItem.id))
+        .where(OrderItem.order_id == Order.id, OrderItem.order_date == Order.order_date)
+        .scalar_subquery()
+    )
+    # find_inconsistent_order_totalsと同じ判定（金額は浮動小数点の誤差を許容する）
+    stmt = (
+        update(Order)
+        .where(or_(
+            func.abs(Order.total_amount - actual_amount) > TOTAL_AMOUNT_TOLERANCE,
+            Order.line_count.is_distinct_from(actual_lines)
+        ))
+        .values(total_amount=actual_amount, line_count=actual_lines)
+        .execution_options(synchronize_session=False)
+    )
+
+    if order_ids is not None:
+        ids = list(dict.fromkeys(order_ids))
+        ranges = [
+            Order.id == any_(bindparam("order_ids", ids[start:start + batch_size], type_=ARRAY(Integer)))
+            for start in range(0, len(ids), batch_size)
+        ]
+    else:
+        low, high = db.execute(select(func.min(Order.id), func.max(Order.id))).one()
+        if low is None:
+            return 0
+        ranges = [
+            and_(Order.id >= start, Order.id < start + batch_size)
+            for start in range(low, high + 1, batch_size)
+        ]
+
+    updated = 0
+    for condition in ranges:
+        try:
+            updated += db.execute(stmt.where(condition)).rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return updated
+
+def status_transition(order: Order, status: OrderStatus):
+    """
+    注文のステータスを遷移させるUPDATE文を返す
+    
+    ORDER_STATUS_TRANSITIONSで許可された遷移のみ受け付け、
+    遷移元のステータスをWHERE句に含めるため、他の処理が先にステータスを変更した場合は更新されない
+    
+    Args:
+        order: 対象の注文
+        status: 遷移先のステータス
+    
+    Returns:
+        UPDATE ... RETURNING orders.id の文（更新されなかった場合は結果が空）
+    
+    Raises:
+        OrderStateError: 許可されていない遷移の場合
+    """
+    allowed_from = ORDER_STATUS_TRANSITIONS.get(status)
+    if allowed_from is None:
+        raise OrderStateError(f"ステータス {status.value} には変更できません")
+    if order.status not in allowed_from:
+        raise OrderStateError(f"ステータスが {order.status} の注文は {status.value} に変更できません")
+    return (
+        update(Order)
+        .where(
+            Order.id == order.id,
+            Order.order_date == order.order_date,
+            Order.status.in_([s.value for s in allowed_from])
+        )
+        .values(status=status.value)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    )
+
 def update_order(db: Session, order: Order, order_update: OrderUpdate) -> Order:
     """
     注文を更新する
     
+    ステータスの変更はORDER_STATUS_TRANSITIONSで許可された遷移のみ行える
+    （確定・キャンセルは在庫の引当・戻しを伴うため crud.stock で行う）
+    
     Args:
         db: データベースセッション
         order: 更新する注文オブジェクト
@@ -78,8 +521,16 @@ def update_order(db: Session, order: Order, order_update: OrderUpdate) -> Order:
     
     Returns:
         Order: 更新された注文オブジェクト
+    
+    Raises:
+        OrderStateError: 許可されていないステータスの変更の場合
     """
     update_data = order_update.model_dump(exclude_unset=True)
+    status = update_data.pop("status", None)
+    if status is not None and status != order.status:
+        if db.execute(status_transition(order, status)).scalar() is None:
+            db.rollback()
+            raise OrderStateError("注文のステータスが他の処理で変更されました")
     for field, value in update_data.items():
         setattr(order, field, value)
     
@@ -88,15 +539,164 @@ def update_order(db: Session, order: Order, order_update: OrderUpdate) -> Order:
     db.refresh(order)
     return order
 
-def delete_order(db: Session, order_id: int) -> None:
+def bulk_transition_status(
+    db: Session,
+    order_ids: Sequence[int],
+    status: OrderStatus
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    複数の注文のステータスを1つのUPDATE文でまとめて遷移させる
+    
+    ORDER_STATUS_TRANSITIONSで遷移元として許可されたステータスの注文だけを更新し、
+    それ以外の注文（存在しない注文を含む）は拒否として返す
+    
+    Args:
+        db: データベースセッション
+        order_ids: 注文IDのリスト
+        status: 遷移先のステータス
+    
+    Returns:
+        Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+            更新した注文（order_id, status）と拒否した注文（order_id, status）のリスト。
+            拒否した注文のstatusは現在のステータス（存在しない場合はNone）
+    
+    Raises:
+        ValueError: 一括遷移できないステータスが指定された場合
+    """
+    allowed_from = ORDER_STATUS_TRANSITIONS.get(status)
+    if allowed_from is None:
+        raise ValueError(f"ステータス {status.value} には一括で変更できません")
+    ids = list(dict.fromkeys(order_ids))
+
+    # IDは配列1つのパラメータで渡すため、件数に関わらず同じSQL文になる
+    id_array = bindparam("order_ids", ids, type_=ARRAY(Integer))
+    updated = db.execute(
+        update(Order)
+        .where(
+            Order.id == any_(id_array),
+            Order.status.in_([s.value for s in allowed_from])
+        )
+        .values(status=status.value)
+        .returning(Order.id, Order.status)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+
+    updated_ids = {row.id for row in updated}
+    rejected_ids = [order_id for order_id in ids if order_id not in updated_ids]
+    current = {}
+    if rejected_ids:
+        current = dict(db.execute(
+            select(Order.id, Order.status).where(Order.id.in_(rejected_ids))
+        ).all())
+    return (
+        [{"order_id": row.id, "status": row.status} for row in updated],
+        [{"order_id": order_id, "status": current.get(order_id)} for order_id in rejected_ids],
+    )
+
+def delete_order(db: Session, order_id: int) -> bool:
     """
     注文を削除する
     
+    注文を読み込まずにDELETE ... RETURNINGで削除する。
+    明細はorder_items.order_idの外部キー（ON DELETE CASCADE）によりDB側で削除される。
+    在庫を引き当てたままの注文（UNDELETABLE_STATUSES）は削除しない
+    
     Args:
         db: データベースセッション
         order_id: 削除する注文のID
+    
+    Returns:
+        bool: 削除した場合はTrue、注文が存在しない場合はFalse
+    
+    Raises:
+        OrderStateError: 在庫を引き当てている注文の場合
+    """
+    deleted_id = db.execute(
+        delete(Order)
+        .where(
+            Order.id == order_id,
+            Order.status.notin_([status.value for status in UNDELETABLE_STATUSES])
+        )
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if deleted_id is None:
+        status = db.execute(select(Order.status).where(Order.id == order_id)).scalar()
+        db.rollback()
+        if status is not None:
+            raise OrderStateError(
+                f"ステータスが {status} の注文は在庫を引き当てているため削除できません。先にキャンセルしてください"
+            )
+        return False
+    db.commit()
+    return True
+
+def bulk_delete_orders(
+    db: Session,
+    order_ids: Optional[Sequence[int]] = None,
+    before: Optional[datetime] = None,
+    statuses: Sequence[OrderStatus] = PURGEABLE_STATUSES,
+    batch_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    条件に一致する注文をバッチごとにDELETE ... RETURNINGで削除する
+    
+    ORMオブジェクトは生成せず、バッチごとにコミットするため、
+    大量の古い注文を削除しても長時間のロックやメモリ消費が発生しない
+    
+    Args:
+        db: データベースセッション
+        order_ids: 削除する注文IDのリスト
+        before: この日時より前の注文日の注文を削除する
+        statuses: 削除対象とするステータス（PURGEABLE_STATUSESの一部）
+        batch_size: 1トランザクションで削除する注文数（省略時は設定値）
+    
+    Returns:
+        Dict[str, int]: deleted（削除した注文数）, batches（コミットしたバッチ数）
+    
+    Raises:
+        ValueError: order_idsとbeforeのどちらも指定されていない場合、
+            またはPURGEABLE_STATUSES以外のステータスが指定された場合
     """
-    order = get_order(db=db, order_id=order_id)
-    if order:
-        db.delete(order)
-        db.commit() 
\ No newline at end of file
+    if not order_ids and before is None:
+        raise ValueError("削除する注文IDまたは日付を指定してください")
+    invalid = [status for status in statuses if status not in PURGEABLE_STATUSES]
+    if invalid:
+        raise ValueError(
+            f"ステータス {', '.join(status.value for status in invalid)} の注文は一括削除できません"
+            f"（対象にできるのは {', '.join(status.value for status in PURGEABLE_STATUSES)} のみ）"
+        )
+    batch_size = batch_size or settings.ORDER_BULK_BATCH_SIZE
+
+    conditions = [Order.status.in_([status.value for status in statuses])]
+    if order_ids:
+        conditions.append(
+            Order.id == any_(bindparam("order_ids", list(order_ids), type_=ARRAY(Integer)))
+        )
+    if before is not None:
+        conditions.append(Order.order_date < before)
+    targets = (
+        select(Order.id)
+        .where(and_(*conditions))
+        .order_by(Order.id)
+        .limit(batch_size)
+    )
+
+    deleted = 0
+    batches = 0
+    while True:
+        ids = db.execute(
+            delete(Order)
+            .where(Order.id.in_(targets.scalar_subquery()))
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.commit()
+        if not ids:
+            break
+        deleted += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+    return {"deleted": deleted, "batches": batches}
@@ -0,0 +1,124 @@
+"""
+キーセット（カーソル）ページネーションの共通処理
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import BigInteger, Integer, tuple_
+from sqlalchemy.orm import Query
+
+# 整数のキー列が受け付ける値の範囲（範囲外の値はDB側でエラーになるため、デコード時に拒否する）
+_INTEGER_LIMIT = 2 ** 31
+_BIG_INTEGER_LIMIT = 2 ** 63
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    キー列の値を不透明なカーソル文字列にエンコードします
+    
+    Args:
+        values: 最後に返した行のキー列の値
+        
+    Returns:
+        str: URLセーフなカーソル文字列
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_value(column: Any, value: Any) -> Any:
+    """
+    カーソルの値をキー列の型に変換します（型が合わない場合はValueError）
+    """
+    column_type = column.type
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return value
+
+    if python_type is datetime:
+        if not isinstance(value, str):
+            raise ValueError("カーソルが不正です")
+        return datetime.fromisoformat(value)
+    if python_type is int:
+        # boolはintのサブクラスのため、明示的に除外する
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("カーソルが不正です")
+        limit = _BIG_INTEGER_LIMIT if isinstance(column_type, BigInteger) else _INTEGER_LIMIT
+        if isinstance(column_type, Integer) and not -limit <= value < limit:
+            raise ValueError("カーソルが不正です")
+        return value
+    if python_type is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError("カーソルが不正です")
+        return float(value)
+    if python_type is str and not isinstance(value, str):
+        raise ValueError("カーソルが不正です")
+    return value
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    カーソル文字列をキー列の値にデコードします
+    
+    Args:
+        cursor: encode_cursorで生成したカーソル文字列
+        columns: キー列（値の型変換に使用）
+        
+    Returns:
+        List[Any]: キー列の値
+        
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("カーソルが不正です")
+        # 値の型をキー列ごとに検証し、DBに渡す前に不正なカーソルを拒否する
+        return [
+            None if value is None else _decode_value(column, value)
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise ValueError("カーソルが不正です") from e
+
+def paginate_keyset(
+    query: Query,
+    columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    キーセット方式でクエリの1ページ分を取得します
+    OFFSETを使わないため、深いページでも先頭ページと同じコストで取得できます
+    
+    Args:
+        query: フィルター済みのクエリ
+        columns: 並び順のキー列（最後の列は一意であること）
+        limit: 取得する最大件数
+        cursor: 前ページのnext_cursor（先頭ページの場合はNone）
+        descending: 降順で取得する場合はTrue
+        
+    Returns:
+        Tuple[List[Any], Optional[str]]: 取得した行と次ページのカーソル（最終ページの場合はNone）
+        
+    Raises:
+        ValueError: カーソルが不正な場合
+    """
+    if cursor:
+        key = tuple_(*columns)
+        values = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < values if descending else key > values)
+
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows, next_cursor
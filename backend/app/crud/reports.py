@@ -0,0 +1,230 @@
+"""
+Sales summary refresh and read operations.
+
+月次売上サマリー（顧客別・商品別）をorders/order_itemsから再集計する。
+増分更新では、トリガーが記録した変更ログ（sales_summary_changes）の月だけを再集計する。
+"""
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, and_, cast, delete, func, insert, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.report import (
+    MonthlyCustomerSales, MonthlyItemSales, SalesSummaryChange, SummaryRefreshState
+)
+
+# 更新状態テーブルでのサマリー名
+SALES_SUMMARY = "sales_monthly"
+
+_month = cast(func.date_trunc(literal_column("'month'"), Order.order_date), Date)
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _lock_state(db: Session) -> SummaryRefreshState:
+    """
+    更新状態の行を取得し、同時実行を防ぐため行ロックを取得する
+    """
+    db.execute(
+        pg_insert(SummaryRefreshState)
+        .values(name=SALES_SUMMARY)
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return (
+        db.query(SummaryRefreshState)
+        .filter(SummaryRefreshState.name == SALES_SUMMARY)
+        .with_for_update()
+        .one()
+    )
+
+
+def _consume_changes(db: Session) -> List[date]:
+    """
+    変更ログを削除し、再集計が必要な月の一覧を返す
+
+    DELETEはコミット済みの行だけを対象とするため、実行中のトランザクションが記録した行は
+    次回の更新まで残る（コミット順に取り込まれ、取りこぼしがない）
+    """
+    rows = db.execute(
+        delete(SalesSummaryChange).returning(SalesSummaryChange.month)
+    ).scalars()
+    return sorted(set(rows))
+
+
+def _rebuild(db: Session, months: Optional[List[date]]) -> None:
+    """
+    サマリーを再集計する。monthsがNoneの場合は全期間を作り直す
+    （アーカイブ済みの月のサマリーは削除しない）
+    """
+    conditions = [Order.status != OrderStatus.CANCELLED]
+    if months is not None:
+        # order_dateの範囲条件にすることでix_orders_order_dateを使用できる
+        conditions.append(or_(*[
+            and_(Order.order_date >= month, Order.order_date < _next_month(month))
+            for month in months
+        ]))
+    amount = func.sum(OrderItem.quantity * OrderItem.unit_price)
+    targets = (
+        (MonthlyCustomerSales, Order.customer_id),
+        (MonthlyItemSales, OrderItem.item_id),
+    )
+    if months is None:
+        # アーカイブ済み（パーティションを切り離した）月のサマリーは残すため、
+        # 全件の作り直しでも現在の注文の最初の月以降だけを削除する
+        first_month = db.query(func.min(_month)).scalar()
+        if first_month is None:
+            return
+    for table, key in targets:
+        purge = delete(table)
+        if months is not None:
+            purge = purge.where(table.month.in_(months))
+        else:
+            purge = purge.where(table.month >= first_month)
+        db.execute(purge)
+        source = (
+            select(
+                _month,
+                key,
+                func.count(func.distinct(Order.id)),
+                func.sum(OrderItem.quantity),
+                amount,
+            )
+            .select_from(Order)
+            .join(
+                OrderItem,
+                and_(OrderItem.order_id == Order.id, OrderItem.order_date == Order.order_date)
+            )
+            .where(and_(*conditions))
+            .group_by(_month, key)
+        )
+        db.execute(
+            insert(table).from_select(
+                ["month", key.key, "order_count", "total_quantity", "total_amount"],
+                source
+            )
+        )
+
+
+def refresh_sales_summary(db: Session, full: bool = False) -> Dict[str, Any]:
+    """
+    月次売上サマリーを更新する
+
+    増分更新では、orders / order_items のトリガーが記録した変更ログから対象の月を取り出し、その月だけを再集計する。
+    ログの行は書き込んだトランザクションのコミット時に見えるようになるため、
+    Excel取込や一括登録のような長いトランザクションの変更も、コミット後の次回の更新で必ず反映される。
+    削除された注文の月もログに記録されるため、増分更新で反映される。
+
+    Args:
+        db: データベースセッション
+        full: 全期間を作り直す場合はTrue（初回は常に全件）
+
+    Returns:
+        Dict[str, Any]: mode, months（再集計した月のリスト。全件の場合はNone）, duration_ms
+    """
+    started = time.perf_counter()
+    state = _lock_state(db)
+
+    if full or state.last_mode is None:
+        mode = "full"
+        months = None
+        # 全件を作り直すため、それまでの変更ログは不要
+        _consume_changes(db)
+    else:
+        mode = "incremental"
+        months = _consume_changes(db)
+
+    if months is None or months:
+        _rebuild(db, months)
+
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    state.last_refreshed_at = func.now()
+    state.last_mode = mode
+    state.last_months = None if months is None else len(months)
+    state.last_duration_ms = duration_ms
+    db.commit()
+    return {
+        "mode": mode,
+        "months": months,
+        "duration_ms": duration_ms,
+    }
+
+
+def get_refresh_state(db: Session) -> Optional[SummaryRefreshState]:
+    """
+    月次売上サマリーの更新状態を取得する
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        Optional[SummaryRefreshState]: 更新状態（未実行の場合はNone）
+    """
+    return db.query(SummaryRefreshState).get(SALES_SUMMARY)
+
+
+def get_customer_sales(
+    db: Session,
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    customer_id: Optional[int] = None
+) -> List[MonthlyCustomerSales]:
+    """
+    顧客別月次売上をサマリーテーブルから取得する（月の古い順、金額の大きい順）
+
+    Args:
+        db: データベースセッション
+        start_month: この月以降（月初日に丸める）
+        end_month: この月以前（月初日に丸める）
+        customer_id: 特定の顧客のみ
+
+    Returns:
+        List[MonthlyCustomerSales]: 顧客別月次売上のリスト
+    """
+    query = db.query(MonthlyCustomerSales)
+    if start_month:
+        query = query.filter(MonthlyCustomerSales.month >= start_month.replace(day=1))
+    if end_month:
+        query = query.filter(MonthlyCustomerSales.month <= end_month.replace(day=1))
+    if customer_id:
+        query = query.filter(MonthlyCustomerSales.customer_id == customer_id)
+    return query.order_by(
+        MonthlyCustomerSales.month,
+        MonthlyCustomerSales.total_amount.desc()
+    ).all()
+
+
+def get_item_sales(
+    db: Session,
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    item_id: Optional[int] = None
+) -> List[MonthlyItemSales]:
+    """
+    商品別月次売上をサマリーテーブルから取得する（月の古い順、金額の大きい順）
+
+    Args:
+        db: データベースセッション
+        start_month: この月以降（月初日に丸める）
+        end_month: この月以前（月初日に丸める）
+        item_id: 特定の商品のみ
+
+    Returns:
+        List[MonthlyItemSales]: 商品別月次売上のリスト
+    """
+    query = db.query(MonthlyItemSales)
+    if start_month:
+        query = query.filter(MonthlyItemSales.month >= start_month.replace(day=1))
+    if end_month:
+        query = query.filter(MonthlyItemSales.month <= end_month.replace(day=1))
+    if item_id:
+        query = query.filter(MonthlyItemSales.item_id == item_id)
+    return query.order_by(
+        MonthlyItemSales.month,
+        MonthlyItemSales.total_amount.desc()
+    ).all()
@@ -0,0 +1,109 @@
+"""
+Trigram search for master data (items / customers).
+
+列に search_normalize()（NFKC正規化＋小文字化）を適用した式にpg_trgmのGINインデックスを作成し、
+部分一致（LIKE）とあいまい一致（単語類似度）で検索する。
+検索語は app.core.text.normalize_search_text で同じ正規化をしてからSQLに渡す。
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.text import normalize_search_text
+
+# トライグラムを取り出せる検索語の最小文字数（これより短い場合はコードの前方一致のみ）
+MIN_TRIGRAM_LENGTH = 3
+
+
+def search_normalize(column):
+    """列にDB側の正規化関数を適用した式（インデックスの式と一致させる）"""
+    return func.search_normalize(column)
+
+
+def like_pattern(term: str, prefix: bool = False) -> str:
+    """
+    LIKEのワイルドカードをエスケープしたパターンを返す（エスケープ文字はPostgreSQL既定のバックスラッシュ）
+
+    Args:
+        term: 正規化済みの検索語
+        prefix: 前方一致の場合はTrue（Falseの場合は部分一致）
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def contains(column, term: str):
+    """
+    正規化した列が正規化した検索語を含む条件
+
+    Args:
+        column: 対象の列
+        term: 検索語（未正規化）
+    """
+    return search_normalize(column).like(like_pattern(normalize_search_text(term)))
+
+
+def search_master(
+    db: Session,
+    model,
+    columns: Sequence,
+    term: str,
+    limit: int = 20,
+    is_active: Optional[bool] = None
+) -> List:
+    """
+    マスタをトライグラムインデックスで検索し、関連度の高い順に返す
+
+    並び順:
+        1. コードの完全一致
+        2. コードの前方一致
+        3. いずれかの列との単語類似度（word_similarity）の高い順
+
+    検索語が MIN_TRIGRAM_LENGTH 文字未満の場合は、トライグラムを使えないため
+    コードの前方一致のみで検索する（text_pattern_opsのインデックスを使用）。
+
+    Args:
+        db: データベースセッション
+        model: 対象のモデル（code列を持つこと）
+        columns: 検索対象の列
+        term: 検索語
+        limit: 取得する最大件数
+        is_active: アクティブなもののみを取得する場合はTrue
+
+    Returns:
+        List: 検索結果のリスト
+    """
+    normalized = normalize_search_text(term)
+    if not normalized:
+        return []
+
+    code = search_normalize(model.code)
+    prefix = code.like(like_pattern(normalized, prefix=True))
+    query = db.query(model)
+    if len(normalized) < MIN_TRIGRAM_LENGTH:
+        query = query.filter(prefix)
+    else:
+        pattern = like_pattern(normalized)
+        conditions = []
+        for column in columns:
+            expr = search_normalize(column)
+            conditions.append(expr.like(pattern))
+            # %> は pg_trgm.word_similarity_threshold 以上で一致する（表記ゆれ・誤字を拾う）
+            conditions.append(expr.op("%>")(normalized))
+        query = query.filter(or_(*conditions))
+    if is_active is not None:
+        query = query.filter(model.is_active == is_active)
+
+    similarity = func.greatest(*[
+        func.word_similarity(normalized, search_normalize(column)) for column in columns
+    ])
+    return (
+        query.order_by(
+            case((code == normalized, 0), (prefix, 1), else_=2),
+            similarity.desc(),
+            model.id
+        )
+        .limit(limit)
+        .all()
+    )
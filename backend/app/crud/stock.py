@@ -0,0 +1,221 @@
+"""
+Stock reservation for order confirmation and cancellation.
+
+在庫の引当（注文確定時の減算）と戻し（キャンセル時の加算）を行う。
+注文の全明細を1つのUPDATE文で反映し、ステータスの変更と同じトランザクションでコミットする。
+"""
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.crud import item as item_crud
+from app.models.item import Item
+from app.models.order import Order, OrderItem, OrderStatus
+
+# 在庫を引き当てられる（確定できる）ステータス
+RESERVABLE_STATUSES = (OrderStatus.PENDING,)
+# 在庫を戻してキャンセルできるステータス（引当済みで未出荷）
+RELEASABLE_STATUSES = (OrderStatus.CONFIRMED, OrderStatus.PROCESSING)
+# 在庫に影響せずキャンセルできるステータス
+CANCELLABLE_STATUSES = RESERVABLE_STATUSES + RELEASABLE_STATUSES
+# 明細を追加・変更・削除できるステータス（在庫を引き当てる前のみ）
+EDITABLE_STATUSES = RESERVABLE_STATUSES
+
+# 在庫数が未設定（NULL）の商品は在庫0として扱う
+_current_stock = func.coalesce(Item.current_stock, 0)
+
+
+class OrderStateError(ValueError):
+    """注文が要求された操作を行えないステータスにある場合のエラー"""
+
+
+class StockShortageError(ValueError):
+    """在庫が不足している商品がある場合のエラー"""
+
+    def __init__(self, shortages: List[Dict[str, Any]]):
+        super().__init__("在庫が不足している商品があります")
+        self.shortages = shortages
+
+
+def _order_lines(order: Order):
+    """注文の明細を商品ごとに数量を合計したサブクエリ（注文日で明細のパーティションを絞り込む）"""
+    return (
+        select(
+            OrderItem.item_id.label("item_id"),
+            func.sum(OrderItem.quantity).label("quantity")
+        )
+        .where(OrderItem.order_id == order.id, OrderItem.order_date == order.order_date)
+        .group_by(OrderItem.item_id)
+        .subquery()
+    )
+
+
+def _lock_order(db: Session, order_id: int):
+    """
+    注文の行ロックを取得する（同じ注文の二重確定を防ぐ）
+
+    セッションに読み込み済みの注文でも、ロック取得後の値（ステータス）で上書きする
+    """
+    return (
+        db.query(Order)
+        .filter(Order.id == order_id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+
+
+def _lock_items(db: Session, lines) -> None:
+    """
+    明細の商品の行ロックをID順に取得する
+
+    全ての処理が同じ順序でロックを取るため、
+    複数の注文が同じ商品を含んでいてもデッドロックにならない
+    """
+    db.execute(
+        select(Item.id)
+        .where(Item.id.in_(select(lines.c.item_id)))
+        .order_by(Item.id)
+        .with_for_update()
+    ).all()
+
+
+def lock_editable_order(db: Session, order_id: int) -> Order:
+    """
+    明細を変更する注文の行ロックを取得し、在庫を引き当てる前のステータスか確認する
+
+    確定（reserve_order_stock）と同じ注文の行ロックを取るため、
+    確定と明細の変更が並行しても、引当済みの在庫と明細が食い違わない
+
+    Args:
+        db: データベースセッション
+        order_id: 注文ID
+
+    Returns:
+        Order: ロックした注文
+
+    Raises:
+        OrderStateError: 注文が存在しない場合、または在庫を引き当てたステータスの場合
+    """
+    order = _lock_order(db, order_id)
+    if order is None:
+        db.rollback()
+        raise OrderStateError("注文が見つかりません")
+    if order.status not in EDITABLE_STATUSES:
+        db.rollback()
+        raise OrderStateError(f"ステータスが {order.status} の注文の明細は変更できません")
+    return order
+
+
+def _invalidate_items(rows) -> None:
+    """在庫数が変わった商品のマスタキャッシュを削除する"""
+    for row in rows:
+        item_crud.invalidate_cache(row)
+
+
+def reserve_order_stock(db: Session, order_id: int) -> Dict[str, Any]:
+    """
+    注文の在庫を引き当てて確定済みにする
+
+    1. 注文の行ロックを取得し、確定できるステータスか確認する
+    2. 明細の商品の行ロックをID順に取得する
+    3. 全明細の在庫を1つのUPDATE文（current_stock >= 数量 の条件付き）で減算する
+    4. 更新できなかった商品があれば全体をロールバックする
+
+    Args:
+        db: データベースセッション
+        order_id: 注文ID
+
+    Returns:
+        Dict[str, Any]: order_id, status, stock_items（在庫を更新した商品数）。
+            注文が存在しない場合は空の辞書
+
+    Raises:
+        OrderStateError: 注文が確定できないステータスの場合、または明細がない場合
+        StockShortageError: 在庫が不足している商品がある場合
+    """
+    order = _lock_order(db, order_id)
+    if order is None:
+        db.rollback()
+        return {}
+    if order.status not in RESERVABLE_STATUSES:
+        db.rollback()
+        raise OrderStateError(f"ステータスが {order.status} の注文は確定できません")
+
+    lines = _order_lines(order)
+    line_count = db.execute(select(func.count()).select_from(lines)).scalar()
+    if not line_count:
+        db.rollback()
+        raise OrderStateError("明細のない注文は確定できません")
+
+    _lock_items(db, lines)
+    reserved = db.execute(
+        update(Item)
+        .where(Item.id == lines.c.item_id, _current_stock >= lines.c.quantity)
+        .values(current_stock=_current_stock - lines.c.quantity)
+        .returning(Item.id, Item.code)
+    ).all()
+
+    if len(reserved) < line_count:
+        # 条件を満たさず更新されなかった商品は元の在庫数のまま
+        shortages = [
+            dict(row._mapping)
+            for row in db.execute(
+                select(
+                    Item.id.label("item_id"),
+                    Item.code,
+                    _current_stock.label("current_stock"),
+                    lines.c.quantity.label("requested")
+                )
+                .where(Item.id == lines.c.item_id, _current_stock < lines.c.quantity)
+                .order_by(Item.id)
+            )
+        ]
+        db.rollback()
+        raise StockShortageError(shortages)
+
+    order.status = OrderStatus.CONFIRMED
+    db.commit()
+    _invalidate_items(reserved)
+    return {"order_id": order_id, "status": OrderStatus.CONFIRMED, "stock_items": len(reserved)}
+
+
+def cancel_order(db: Session, order_id: int) -> Dict[str, Any]:
+    """
+    注文をキャンセルし、引当済みの在庫があれば戻す
+
+    Args:
+        db: データベースセッション
+        order_id: 注文ID
+
+    Returns:
+        Dict[str, Any]: order_id, status, stock_items（在庫を戻した商品数）。
+            注文が存在しない場合は空の辞書
+
+    Raises:
+        OrderStateError: 注文がキャンセルできないステータスの場合
+    """
+    order = _lock_order(db, order_id)
+    if order is None:
+        db.rollback()
+        return {}
+    if order.status not in CANCELLABLE_STATUSES:
+        db.rollback()
+        raise OrderStateError(f"ステータスが {order.status} の注文はキャンセルできません")
+
+    released = []
+    if order.status in RELEASABLE_STATUSES:
+        lines = _order_lines(order)
+        _lock_items(db, lines)
+        released = db.execute(
+            update(Item)
+            .where(Item.id == lines.c.item_id)
+            .values(current_stock=_current_stock + lines.c.quantity)
+            .returning(Item.id, Item.code)
+        ).all()
+
+    order.status = OrderStatus.CANCELLED
+    db.commit()
+    _invalidate_items(released)
+    return {"order_id": order_id, "status": OrderStatus.CANCELLED, "stock_items": len(released)}
@@ -1,7 +1,9 @@
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from app.crud.pagination import paginate_keyset
 from app.models.supplier import Supplier
 from app.schemas.supplier import SupplierCreate, SupplierUpdate
 
@@ -18,6 +20,13 @@ def get_suppliers(
 ) -> List[Supplier]:
     return db.query(Supplier).offset(skip).limit(limit).all()
 
+def get_suppliers_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List[Supplier], Optional[str]]:
+    return paginate_keyset(db.query(Supplier), [Supplier.id], limit, cursor=cursor)
+
 def create_supplier(db: Session, supplier: SupplierCreate) -> Supplier:
     try:
         db_supplier = Supplier(**supplier.model_dump())
@@ -57,10 +66,12 @@ def update_supplier(
         )
 
 def delete_supplier(db: Session, supplier_id: int) -> bool:
-    db_supplier = get_supplier(db, supplier_id)
-    if not db_supplier:
-        return False
-
-    db.delete(db_supplier)
+    # 読み込まずにDELETE ... RETURNINGで削除し、削除できたかどうかを返す
+    deleted_id = db.execute(
+        delete(Supplier)
+        .where(Supplier.id == supplier_id)
+        .returning(Supplier.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
     db.commit()
-    return True 
\ No newline at end of file
+    return deleted_id is not None 
\ No newline at end of file
@@ -2,14 +2,9 @@ from sqlalchemy.orm import Session
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
 from ..core.security import get_password_hash
-from typing import Optional
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def get_password_hash(password: str) -> str:
-    """パスワードをハッシュ化します"""
-    return pwd_context.hash(password)
+from .pagination import paginate_keyset
+from ..core.user_cache import invalidate_user
+from typing import List, Optional, Tuple
 
 def get(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
@@ -23,6 +18,10 @@ def get_by_email(db: Session, email: str):
 def get_multi(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
+def get_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[User], Optional[str]]:
+    """ユーザー一覧をキーセット方式で取得します"""
+    return paginate_keyset(db.query(User), [User.id], limit, cursor=cursor)
+
 def create(db: Session, obj_in: UserCreate) -> User:
     db_obj = User(
         username=obj_in.username,
@@ -41,18 +40,21 @@ def update(db: Session, db_obj: User, obj_in: UserUpdate) -> User:
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
     
+    invalidate_user(db_obj)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
     
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_user(db_obj)
     return db_obj
 
 def delete(db: Session, user_id: int) -> bool:
     obj = db.query(User).get(user_id)
     if not obj:
         return False
+    invalidate_user(obj)
     db.delete(obj)
     db.commit()
     return True
@@ -145,12 +147,14 @@ def update_user(db: Session, user_id: int, user: UserUpdate) -> Optional[User]:
         if get_user_by_email(db, update_data["email"]):
             raise ValueError(f"メールアドレス '{update_data['email']}' は既に使用されています")
     
-    # 各フィールドを更新
+    # 各フィールドを更新（変更前のユーザー名・メールアドレスのキャッシュも削除する）
+    invalidate_user(db_user)
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
     db.commit()
     db.refresh(db_user)
+    invalidate_user(db_user)
     
     return db_user
 
@@ -169,6 +173,7 @@ def delete_user(db: Session, user_id: int) -> bool:
     if not db_user:
         return False
         
+    invalidate_user(db_user)
     db.delete(db_user)
     db.commit()
     
@@ -0,0 +1,32 @@
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+def get_async_database_url() -> URL:
+    """
+    非同期エンジン用の接続URLを返す
+    ASYNC_DATABASE_URLが未設定の場合はDATABASE_URLのドライバをasyncpgに置き換える
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return make_url(settings.ASYNC_DATABASE_URL)
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+# 非同期エンジンを作成
+async_engine = create_async_engine(
+    get_async_database_url(),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+
+# 非同期セッションファクトリを作成
+# コミット後もレスポンスの組み立てで属性を参照できるよう、expire_on_commitは無効にする
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
@@ -6,4 +6,5 @@ from app.models.settings import UserSettings
 from app.models.item import Item
 from app.models.customer import Customer
 from app.models.order import Order, OrderItem
-from app.models.inbound import Inbound, InboundItem 
\ No newline at end of file
+from app.models.inbound import Inbound, InboundItem
+from app.models.report import MonthlyCustomerSales, MonthlyItemSales, SalesSummaryChange, SummaryRefreshState
@@ -58,25 +58,42 @@ CREATE TABLE IF NOT EXISTS items (
     updated_at TIMESTAMP WITH TIME ZONE
 );
 
--- orders テーブル
+-- orders テーブル（注文日で月単位にパーティション分割。月次パーティションは起動時に作成する）
 CREATE TABLE IF NOT EXISTS orders (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     customer_id INTEGER NOT NULL REFERENCES customers(id),
     order_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     status VARCHAR NOT NULL DEFAULT 'pending',
+    total_amount FLOAT NOT NULL DEFAULT 0,
+    line_count INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
-);
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, order_date)
+) PARTITION BY RANGE (order_date);
 
--- order_items テーブル
+-- order_items テーブル（注文と同じ月単位でパーティション分割）
 CREATE TABLE IF NOT EXISTS order_items (
-    id SERIAL PRIMARY KEY,
-    order_id INTEGER NOT NULL REFERENCES orders(id),
+    id SERIAL,
+    order_id INTEGER NOT NULL,
+    order_date TIMESTAMP NOT NULL,
     item_id INTEGER NOT NULL REFERENCES items(id),
     quantity INTEGER NOT NULL,
     unit_price FLOAT NOT NULL,
-    notes VARCHAR
-);
+    notes VARCHAR,
+    PRIMARY KEY (id, order_date),
+    CONSTRAINT fk_order_items_order FOREIGN KEY (order_id, order_date)
+        REFERENCES orders(id, order_date) ON DELETE CASCADE
+) PARTITION BY RANGE (order_date);
+
+-- 月次パーティションの範囲外の行を受け入れるDEFAULTパーティション
+-- （パーティション化前に作成された既存のテーブルには作成しない）
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('orders')) = 'p' THEN
+        CREATE TABLE IF NOT EXISTS orders_default PARTITION OF orders DEFAULT;
+        CREATE TABLE IF NOT EXISTS order_items_default PARTITION OF order_items DEFAULT;
+    END IF;
+END $$;
 
 -- inbounds テーブル
 CREATE TABLE IF NOT EXISTS inbounds (
@@ -100,6 +117,85 @@ CREATE TABLE IF NOT EXISTS inbound_items (
     notes TEXT
 );
 
+-- 顧客別月次売上サマリー
+CREATE TABLE IF NOT EXISTS sales_monthly_customer (
+    month DATE NOT NULL,
+    customer_id INTEGER NOT NULL REFERENCES customers(id),
+    order_count INTEGER NOT NULL,
+    total_quantity INTEGER NOT NULL,
+    total_amount FLOAT NOT NULL,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (month, customer_id)
+);
+
+-- 商品別月次売上サマリー
+CREATE TABLE IF NOT EXISTS sales_monthly_item (
+    month DATE NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items(id),
+    order_count INTEGER NOT NULL,
+    total_quantity INTEGER NOT NULL,
+    total_amount FLOAT NOT NULL,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (month, item_id)
+);
+
+-- サマリーの更新状態
+CREATE TABLE IF NOT EXISTS summary_refresh_state (
+    name VARCHAR(50) PRIMARY KEY,
+    last_refreshed_at TIMESTAMP WITH TIME ZONE,
+    last_mode VARCHAR(20),
+    last_months INTEGER,
+    last_duration_ms INTEGER
+);
+-- 増分更新はsales_summary_changesで行うため、旧来のウォーターマーク列は削除する
+ALTER TABLE summary_refresh_state DROP COLUMN IF EXISTS watermark;
+
+-- 売上サマリーの再集計が必要な月の変更ログ（トリガーで記録する）
+CREATE TABLE IF NOT EXISTS sales_summary_changes (
+    month DATE NOT NULL,
+    txid BIGINT NOT NULL,
+    PRIMARY KEY (month, txid)
+);
+
+-- 注文検索用インデックス
+CREATE INDEX IF NOT EXISTS ix_orders_id ON orders (id);
+CREATE INDEX IF NOT EXISTS ix_order_items_id ON order_items (id);
+CREATE INDEX IF NOT EXISTS ix_orders_customer_id_order_date ON orders (customer_id, order_date);
+CREATE INDEX IF NOT EXISTS ix_orders_order_date ON orders (order_date);
+CREATE INDEX IF NOT EXISTS ix_orders_status_created_at ON orders (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_orders_created_at_id ON orders (created_at, id);
+-- 売上サマリーの増分更新が変更ログに移行したため、updated_atのインデックスは不要
+DROP INDEX IF EXISTS ix_orders_updated_at;
+CREATE INDEX IF NOT EXISTS ix_orders_open_created_at ON orders (created_at)
+    WHERE status IN ('pending', 'confirmed', 'processing');
+CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id);
+CREATE INDEX IF NOT EXISTS ix_order_items_item_id ON order_items (item_id);
+CREATE INDEX IF NOT EXISTS ix_inbound_items_inbound_id ON inbound_items (inbound_id);
+CREATE INDEX IF NOT EXISTS ix_inbound_items_item_id ON inbound_items (item_id);
+CREATE INDEX IF NOT EXISTS ix_sales_monthly_customer_customer_id ON sales_monthly_customer (customer_id);
+CREATE INDEX IF NOT EXISTS ix_sales_monthly_item_item_id ON sales_monthly_item (item_id);
+
+-- マスタ検索用の正規化関数とインデックス（全角・半角、大文字・小文字を区別しない検索）
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION search_normalize(value text)
+RETURNS text AS $$
+    SELECT lower(normalize(value, NFKC))
+$$ LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE;
+
+CREATE INDEX IF NOT EXISTS ix_items_search_trgm ON items USING gin (
+    search_normalize(code) gin_trgm_ops,
+    search_normalize(name) gin_trgm_ops,
+    search_normalize(description) gin_trgm_ops
+);
+CREATE INDEX IF NOT EXISTS ix_items_search_code_prefix ON items (search_normalize(code) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_customers_search_trgm ON customers USING gin (
+    search_normalize(code) gin_trgm_ops,
+    search_normalize(name) gin_trgm_ops,
+    search_normalize(contact_person) gin_trgm_ops
+);
+CREATE INDEX IF NOT EXISTS ix_customers_search_code_prefix ON customers (search_normalize(code) text_pattern_ops);
+
 -- 更新日時を自動更新するトリガー関数
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -109,11 +205,53 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
+-- 注文日（パーティションキー）の変更を禁止するトリガー関数
+-- パーティション間の移動は明細の外部キーと両立しないため
+CREATE OR REPLACE FUNCTION prevent_order_date_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.order_date <> OLD.order_date THEN
+        RAISE EXCEPTION 'orders.order_date cannot be changed';
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- 注文・明細の変更を売上サマリーの変更ログに記録するトリガー関数（文単位）
+-- 1つの文で変更された行の月をまとめて記録するため、一括登録でも文ごとに1回のINSERTで済む
+-- 注文日は変更できないため、UPDATEは変更後の行（new_rows）だけを見ればよい
+CREATE OR REPLACE FUNCTION record_sales_summary_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO sales_summary_changes (month, txid)
+        SELECT DISTINCT date_trunc('month', order_date)::date, txid_current() FROM old_rows
+        ON CONFLICT DO NOTHING;
+    ELSE
+        INSERT INTO sales_summary_changes (month, txid)
+        SELECT DISTINCT date_trunc('month', order_date)::date, txid_current() FROM new_rows
+        ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
 -- 既存のトリガーを削除
+DROP TRIGGER IF EXISTS prevent_orders_order_date_change ON orders;
+-- 行単位だった旧来の変更ログのトリガーも削除する
+DROP TRIGGER IF EXISTS record_orders_sales_summary_change ON orders;
+DROP TRIGGER IF EXISTS record_order_items_sales_summary_change ON order_items;
+DROP TRIGGER IF EXISTS record_orders_sales_summary_insert ON orders;
+DROP TRIGGER IF EXISTS record_orders_sales_summary_update ON orders;
+DROP TRIGGER IF EXISTS record_orders_sales_summary_delete ON orders;
+DROP TRIGGER IF EXISTS record_order_items_sales_summary_insert ON order_items;
+DROP TRIGGER IF EXISTS record_order_items_sales_summary_update ON order_items;
+DROP TRIGGER IF EXISTS record_order_items_sales_summary_delete ON order_items;
 DROP TRIGGER IF EXISTS update_users_updated_at ON users;
 DROP TRIGGER IF EXISTS update_customers_updated_at ON customers;
 DROP TRIGGER IF EXISTS update_items_updated_at ON items;
 DROP TRIGGER IF EXISTS update_orders_updated_at ON orders;
+-- order_itemsにはupdated_at列がないため、トリガーは作成しない（既存のDBからは削除する）
 DROP TRIGGER IF EXISTS update_order_items_updated_at ON order_items;
 
 -- 各テーブルに更新日時トリガーを設定
@@ -137,7 +275,43 @@ CREATE TRIGGER update_orders_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
-CREATE TRIGGER update_order_items_updated_at
-    BEFORE UPDATE ON order_items
+CREATE TRIGGER prevent_orders_order_date_change
+    BEFORE UPDATE OF order_date ON orders
     FOR EACH ROW
-    EXECUTE FUNCTION update_updated_at_column(); 
\ No newline at end of file
+    EXECUTE FUNCTION prevent_order_date_change();
+
+CREATE TRIGGER record_orders_sales_summary_insert
+    AFTER INSERT ON orders
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
+
+CREATE TRIGGER record_orders_sales_summary_update
+    AFTER UPDATE ON orders
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
+
+CREATE TRIGGER record_orders_sales_summary_delete
+    AFTER DELETE ON orders
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
+
+CREATE TRIGGER record_order_items_sales_summary_insert
+    AFTER INSERT ON order_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
+
+CREATE TRIGGER record_order_items_sales_summary_update
+    AFTER UPDATE ON order_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
+
+CREATE TRIGGER record_order_items_sales_summary_delete
+    AFTER DELETE ON order_items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION record_sales_summary_change();
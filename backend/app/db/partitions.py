@@ -0,0 +1,250 @@
+"""
+注文テーブル（orders / order_items）の月次パーティションの管理
+
+- ensure_partitions: 当月から指定月数先までのパーティションを作成する
+- archive_partitions: 古いパーティションを切り離し、archiveスキーマへ移動する
+  （未完了の注文が残る月は切り離さない）
+- list_partitions: パーティションの一覧を返す
+
+どちらのテーブルも注文日（order_date）で同じ月単位に分割するため、
+パーティションの作成・切り離しは常に両テーブルで対にして行う。
+範囲外の注文日の行はDEFAULTパーティション（*_default）に入る。
+"""
+import logging
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# 親テーブル（参照される側が先）
+PARTITIONED_TABLES = ("orders", "order_items")
+# 切り離したパーティションの移動先スキーマ
+ARCHIVE_SCHEMA = "archive"
+# 明細から注文への外部キー名（切り離したパーティションからは削除する）
+ORDER_ITEMS_FK = "fk_order_items_order"
+# 未完了の注文のステータス（この注文が残る月はアーカイブしない）
+OPEN_STATUSES = (OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.PROCESSING)
+
+# archiveスキーマで同名のテーブルと衝突した場合は連番（例: orders_p202401_2）を付けて移動する
+_PARTITION_NAME = re.compile(
+    r"^(?P<table>orders|order_items)_p(?P<year>\d{4})(?P<month>\d{2})(?:_\d+)?$"
+)
+
+
+class PartitionArchiveError(ValueError):
+    """パーティションをアーカイブできない場合のエラー"""
+
+
+def add_months(month: date, months: int) -> date:
+    """月初日に月数を加算した月初日を返す"""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """パーティション名（例: orders_p202401）を返す"""
+    return f"{table}_p{month:%Y%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """ordersがパーティションテーブルかどうか（移行前のDBではFalse）"""
+    return bool(db.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('orders')")
+    ).scalar())
+
+
+def _default_has_rows(db: Session, table: str, start: date, end: date) -> bool:
+    return db.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {table}_default "
+            "WHERE order_date >= :start AND order_date < :end)"
+        ),
+        {"start": start, "end": end}
+    ).scalar()
+
+
+def ensure_partitions(
+    db: Session,
+    start: Optional[date] = None,
+    months_ahead: Optional[int] = None
+) -> List[str]:
+    """
+    月次パーティションを作成する（既に存在する場合は何もしない）
+
+    DEFAULTパーティションに同じ月の行が既にある場合、その月は作成せずに警告を出す
+    （PostgreSQLはDEFAULTに該当する行がある範囲のパーティションを作成できないため）。
+
+    Args:
+        db: データベースセッション
+        start: 作成を開始する月（省略時は当月）
+        months_ahead: 当月から何か月先まで作成するか（省略時は設定値）
+
+    Returns:
+        List[str]: 作成（または存在を確認）したordersのパーティション名のリスト
+    """
+    if not is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+    today = date.today().replace(day=1)
+    month = (start or today).replace(day=1)
+    last = add_months(today, months_ahead)
+
+    ensured = []
+    while month <= last:
+        upper = add_months(month, 1)
+        if any(_default_has_rows(db, table, month, upper) for table in PARTITIONED_TABLES):
+            logger.warning(
+                "DEFAULTパーティションに %s の行があるため、パーティションを作成できません",
+                f"{month:%Y-%m}"
+            )
+        else:
+            for table in PARTITIONED_TABLES:
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+                    f"PARTITION OF {table} FOR VALUES FROM ('{month}') TO ('{upper}')"
+                ))
+            ensured.append(partition_name("orders", month))
+        month = upper
+    db.commit()
+    return ensured
+
+
+def list_partitions(db: Session, schema: str = "public") -> List[Dict[str, Any]]:
+    """
+    月次パーティションの一覧を返す（月の古い順）
+
+    Args:
+        db: データベースセッション
+        schema: 対象のスキーマ（archiveを指定すると切り離し済みのテーブル）
+
+    Returns:
+        List[Dict[str, Any]]: table, name, month, estimated_rows
+    """
+    rows = db.execute(
+        text(
+            "SELECT c.relname AS name, c.reltuples::bigint AS estimated_rows "
+            "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relkind = 'r' "
+            "AND c.relname ~ '^(orders|order_items)_p[0-9]{6}(_[0-9]+)?$'"
+        ),
+        {"schema": schema}
+    ).all()
+    partitions = []
+    for row in rows:
+        match = _PARTITION_NAME.match(row.name)
+        partitions.append({
+            "table": match.group("table"),
+            "name": row.name,
+            "month": date(int(match.group("year")), int(match.group("month")), 1),
+            "estimated_rows": max(row.estimated_rows, 0),
+        })
+    return sorted(partitions, key=lambda p: (p["month"], p["table"]))
+
+
+def _open_order_months(db: Session, months: List[date]) -> List[date]:
+    """指定した月のうち、未完了の注文が残っている月を返す"""
+    if not months:
+        return []
+    rows = db.execute(
+        text(
+            "SELECT DISTINCT date_trunc('month', order_date)::date AS month FROM orders "
+            "WHERE order_date >= :start AND order_date < :end AND status IN :statuses"
+        ).bindparams(bindparam("statuses", expanding=True)),
+        {
+            "start": months[0],
+            "end": add_months(months[-1], 1),
+            "statuses": [status.value for status in OPEN_STATUSES],
+        }
+    ).scalars().all()
+    return sorted(month for month in rows if month in months)
+
+
+def _archive_name(db: Session, name: str) -> str:
+    """archiveスキーマで使われていないテーブル名を返す（衝突する場合は連番を付ける）"""
+    candidate = name
+    suffix = 1
+    while db.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": f"{ARCHIVE_SCHEMA}.{candidate}"}
+    ).scalar():
+        suffix += 1
+        candidate = f"{name}_{suffix}"
+    return candidate
+
+
+def archive_partitions(db: Session, before: date) -> List[str]:
+    """
+    指定した月より前の月次パーティションを切り離し、archiveスキーマへ移動する
+
+    切り離したテーブルは通常のテーブルとして残るため、必要に応じて参照・ダンプできる。
+    明細のパーティションを先に切り離して外部キーを外し、その後に注文のパーティションを切り離す。
+    月ごとに1トランザクションで処理する。
+
+    未完了（保留中・確認済み・処理中）の注文が残る月が1つでもあれば、何も切り離さずにエラーとする
+    （切り離すと在庫の引当・戻しやステータス更新ができなくなるため）。
+    各月の処理中はパーティションをロックしてから再確認するため、確認後に注文が戻されることもない。
+    archiveスキーマに同名のテーブルが既にある場合は連番を付けた名前に変更してから移動する。
+
+    Args:
+        db: データベースセッション
+        before: この月より前（月初日に丸める）のパーティションを対象とする
+
+    Returns:
+        List[str]: 切り離したordersのパーティション名のリスト（archiveスキーマでの名前）
+
+    Raises:
+        PartitionArchiveError: 未完了の注文が残る月がある場合
+    """
+    if not is_partitioned(db):
+        return []
+    before = before.replace(day=1)
+    months = sorted({
+        p["month"] for p in list_partitions(db)
+        if p["table"] == "orders" and p["month"] < before
+    })
+
+    open_months = _open_order_months(db, months)
+    if open_months:
+        raise PartitionArchiveError(
+            "未完了の注文が残っている月はアーカイブできません: "
+            + ", ".join(f"{month:%Y-%m}" for month in open_months)
+        )
+
+    archived = []
+    db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+    db.commit()
+    for month in months:
+        items = partition_name("order_items", month)
+        orders = partition_name("orders", month)
+        # 切り離しと同じ順序でロックし、確認から切り離しまでの間の注文の変更を防ぐ
+        db.execute(text(f"LOCK TABLE {items}, {orders} IN ACCESS EXCLUSIVE MODE"))
+        if _open_order_months(db, [month]):
+            db.rollback()
+            raise PartitionArchiveError(
+                f"未完了の注文が残っている月はアーカイブできません: {month:%Y-%m}"
+            )
+        db.execute(text(f"ALTER TABLE order_items DETACH PARTITION {items}"))
+        db.execute(text(f"ALTER TABLE {items} DROP CONSTRAINT IF EXISTS {ORDER_ITEMS_FK}"))
+        db.execute(text(f"ALTER TABLE orders DETACH PARTITION {orders}"))
+        moved = []
+        for name in (items, orders):
+            target = _archive_name(db, name)
+            if target != name:
+                logger.warning(
+                    "%s.%s が既に存在するため、%s として移動します", ARCHIVE_SCHEMA, name, target
+                )
+                db.execute(text(f"ALTER TABLE {name} RENAME TO {target}"))
+            db.execute(text(f"ALTER TABLE {target} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            moved.append(target)
+        db.commit()
+        archived.append(moved[-1])
+        logger.info("注文パーティション %s をアーカイブしました", moved[-1])
+    return archived
@@ -0,0 +1,116 @@
+"""
+コネクションプールの計測
+"""
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    コネクション取得の待ち時間・待ち回数・タイムアウト回数を集計するクラス
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """集計値を初期化します"""
+        with self._lock:
+            self.checkouts = 0
+            self.waits = 0
+            self.timeouts = 0
+            self.total_checkout_seconds = 0.0
+            self.max_checkout_seconds = 0.0
+
+    def record(self, elapsed: float, waited: bool, timed_out: bool = False) -> None:
+        """
+        1回のコネクション取得を記録します
+        
+        Args:
+            elapsed: 取得にかかった時間（秒）
+            waited: 空きコネクションがなく待機が必要だった場合はTrue
+            timed_out: 取得がタイムアウトした場合はTrue
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_checkout_seconds += elapsed
+            if waited:
+                self.waits += 1
+            if elapsed > self.max_checkout_seconds:
+                self.max_checkout_seconds = elapsed
+
+    def snapshot(self) -> Dict[str, Any]:
+        """集計値を辞書で返します"""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "avg_checkout_ms": round(
+                    self.total_checkout_seconds / self.checkouts * 1000, 3
+                ) if self.checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    コネクション取得の待ち時間を計測するQueuePool
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        # dispose()後も集計を引き継ぐ
+        pool.metrics = self.metrics
+        return pool
+
+    @property
+    def capacity(self) -> int:
+        """同時に保持できる最大コネクション数（無制限の場合は-1）"""
+        if self._max_overflow < 0:
+            return -1
+        return self.size() + self._max_overflow
+
+    def _do_get(self):
+        capacity = self.capacity
+        # 空きがなく、上限まで接続済みの場合は返却待ちになる
+        waited = self.checkedin() == 0 and capacity >= 0 and self.checkedout() >= capacity
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, waited, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started, waited)
+        return conn
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        プールの現在の状態と集計値を返します
+        
+        Returns:
+            Dict[str, Any]: プールサイズ、使用中の接続数、飽和度、取得待ちの集計値
+        """
+        capacity = self.capacity
+        checked_out = self.checkedout()
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": checked_out,
+            "overflow": self.overflow(),
+            "saturation": round(checked_out / capacity, 3) if capacity > 0 else None,
+            **self.metrics.snapshot(),
+        }
@@ -1,7 +1,15 @@
-from typing import List, Dict, Any, Optional
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import Session
+import csv
+import io
+import json
+import threading
+from typing import List, Dict, Any, Optional, Iterator
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, CursorResult, Engine
 from ..core.config import settings
+from ..db.session import engine as default_engine
+
+# ストリーミングで対応する出力形式
+STREAM_FORMATS = ("ndjson", "csv")
 
 class DBConnector:
     """
@@ -9,11 +17,18 @@ class DBConnector:
     
     このクラスは、PostgreSQLデータベースへの接続を確立し、
     データの読み取りと書き込みを行うためのメソッドを提供します。
+    インスタンスはプロセス内で共有し（get_db_connectorを参照）、
+    接続はアプリケーション共通のコネクションプールから取得します。
     """
     
-    def __init__(self):
-        """コネクタを初期化します"""
-        self._engine = create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    def __init__(self, engine: Optional[Engine] = None):
+        """
+        コネクタを初期化します
+        
+        Args:
+            engine: 使用するエンジン（省略時はアプリケーション共通のエンジン）
+        """
+        self._engine = engine or default_engine
         
     def execute_query(self, query: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -30,13 +45,103 @@ class DBConnector:
             Exception: クエリの実行に失敗した場合
         """
         try:
-            with Session(self._engine) as session:
-                result = session.execute(text(query), params or {})
+            with self._engine.connect() as conn:
+                result = conn.execute(text(query), params or {})
                 return [dict(row._mapping) for row in result]
                 
         except Exception as e:
             raise Exception(f"クエリの実行に失敗しました: {str(e)}")
             
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        fmt: str = "ndjson",
+        max_rows: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        サーバーサイドカーソルでSQLクエリを実行し、結果をチャンク単位で出力するイテレータを返します
+        
+        クエリの実行（構文エラー等の検出）はこのメソッドの呼び出し時に行い、
+        行の取得と整形は返されたイテレータの消費に合わせて少しずつ行います。
+        
+        Args:
+            query: 実行するSQLクエリ
+            params: クエリパラメータ（オプション）
+            fmt: 出力形式（"ndjson" または "csv"）
+            max_rows: 出力する最大行数（設定値DB_QUERY_STREAM_MAX_ROWSが上限）
+            chunk_size: 1回に取得・出力する行数
+            
+        Returns:
+            Iterator[bytes]: 整形済みのチャンク
+            
+        Raises:
+            ValueError: 出力形式が不正な場合
+            Exception: クエリの実行に失敗した場合
+        """
+        if fmt not in STREAM_FORMATS:
+            raise ValueError(f"出力形式が不正です: {fmt}")
+        max_rows = min(max_rows or settings.DB_QUERY_STREAM_MAX_ROWS, settings.DB_QUERY_STREAM_MAX_ROWS)
+        chunk_size = chunk_size or settings.DB_QUERY_STREAM_CHUNK_SIZE
+
+        conn = self._engine.connect()
+        try:
+            result = conn.execution_options(
+                stream_results=True,
+                max_row_buffer=chunk_size
+            ).execute(text(query), params or {})
+        except Exception as e:
+            conn.close()
+            raise Exception(f"クエリの実行に失敗しました: {str(e)}")
+
+        return self._iter_chunks(conn, result, fmt, max_rows, chunk_size)
+
+    @staticmethod
+    def _iter_chunks(
+        conn: Connection,
+        result: CursorResult,
+        fmt: str,
+        max_rows: int,
+        chunk_size: int
+    ) -> Iterator[bytes]:
+        """
+        ストリーミング結果を整形してチャンク単位で返すジェネレータ
+        消費が終わるか中断された時点でカーソルと接続を解放します
+        """
+        try:
+            columns = list(result.keys())
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+
+            remaining = max_rows
+            for partition in result.partitions(chunk_size):
+                rows = partition[:remaining]
+                if fmt == "csv":
+                    writer.writerows(rows)
+                    chunk = buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    chunk = "".join(
+                        json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) + "\n"
+                        for row in rows
+                    )
+                yield chunk.encode("utf-8")
+
+                remaining -= len(rows)
+                if remaining <= 0:
+                    break
+
+            # 行が0件の場合もCSVのヘッダーは出力する
+            if fmt == "csv" and buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+        finally:
+            result.close()
+            conn.close()
+
     def execute_update(self, query: str, params: Optional[Dict[str, Any]] = None) -> int:
         """
         更新系のSQLクエリを実行し、影響を受けた行数を返します
@@ -52,11 +157,9 @@ class DBConnector:
             Exception: クエリの実行に失敗した場合
         """
         try:
-            with Session(self._engine) as session:
-                result = session.execute(text(query), params or {})
-                affected_rows = result.rowcount
-                session.commit()
-                return affected_rows
+            with self._engine.begin() as conn:
+                result = conn.execute(text(query), params or {})
+                return result.rowcount
                 
         except Exception as e:
             raise Exception(f"更新クエリの実行に失敗しました: {str(e)}")
@@ -96,4 +199,21 @@ class DBConnector:
             WHERE table_name = :table_name
             ORDER BY ordinal_position
         """
-        return self.execute_query(query, {'table_name': table_name}) 
\ No newline at end of file
+        return self.execute_query(query, {'table_name': table_name}) 
+
+_connector: Optional[DBConnector] = None
+_connector_lock = threading.Lock()
+
+def get_db_connector() -> DBConnector:
+    """
+    プロセス内で共有するDBConnectorを返します（FastAPIの依存関係としても使用）
+    
+    Returns:
+        DBConnector: 共有のコネクタ
+    """
+    global _connector
+    if _connector is None:
+        with _connector_lock:
+            if _connector is None:
+                _connector = DBConnector()
+    return _connector
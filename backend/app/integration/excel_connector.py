@@ -1,19 +1,163 @@
 """
 Excel integration module for handling Excel file operations.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple, BinaryIO, Iterable, Set
 import os
+import sys
+import time
 from datetime import datetime
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 from fastapi import HTTPException, UploadFile
 
-from app.models.order import Order
+from app.core.config import settings
+from app.crud.orders import insert_order_batch
+from app.models.order import OrderStatus
 from app.models.customer import Customer
 from app.models.item import Item
 from app.schemas.order import OrderCreate
 
+try:
+    import resource
+except ImportError:  # Windows環境ではresourceモジュールが存在しない
+    resource = None
+
+# 取込行: (顧客コード, 商品コード, 数量, 備考)
+OrderRow = Tuple[str, str, int, Optional[str]]
+
+def iter_order_rows(file: BinaryIO, chunk_size: Optional[int] = None) -> Iterator[List[OrderRow]]:
+    """
+    Excelファイルを読み取り専用モードで逐次読み込み、注文行をチャンク単位で返すジェネレータ
+
+    シート全体をメモリに展開しないため、行数に関わらずメモリ使用量は
+    チャンクサイズ分に抑えられます。
+
+    Args:
+        file: Excelファイルのファイルオブジェクト
+        chunk_size: 1チャンクあたりの行数（省略時は設定値）
+
+    Yields:
+        List[OrderRow]: 注文行のチャンク
+    """
+    chunk_size = chunk_size or settings.EXCEL_IMPORT_CHUNK_SIZE
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        chunk: List[OrderRow] = []
+        # ヘッダー行をスキップ
+        for values in sheet.iter_rows(min_row=2, max_col=4, values_only=True):
+            values = tuple(values) + (None,) * (4 - len(values))
+            customer_code, item_code, quantity, notes = values[:4]
+            # 必要なデータが存在する場合のみ処理
+            if not (customer_code and item_code and quantity):
+                continue
+            chunk.append((
+                str(customer_code),
+                str(item_code),
+                int(quantity),
+                str(notes) if notes is not None else None
+            ))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        # 読み取り専用モードではファイルハンドルを明示的に解放する
+        workbook.close()
+
+class CodeResolver:
+    """
+    取込時に顧客コード・商品コードをIDへ一括解決するクラス
+
+    チャンク内の未解決コードをまとめて1回のIN句クエリで解決し、
+    結果をファイル全体の取込が終わるまでキャッシュします。
+    見つからなかったコードは記録され、最後にまとめて報告できます。
+    """
+
+    def __init__(self, db: Any):
+        self._db = db
+        self._customers: Dict[str, int] = {}
+        # 商品コード -> (商品ID, 単価)
+        self._items: Dict[str, Tuple[int, float]] = {}
+        self.unknown_customer_codes: Set[str] = set()
+        self.unknown_item_codes: Set[str] = set()
+
+    def resolve(self, rows: Iterable[OrderRow]) -> None:
+        """
+        チャンク内の未解決コードを一括で解決します
+
+        Args:
+            rows: 注文行のチャンク
+        """
+        customer_codes: Set[str] = set()
+        item_codes: Set[str] = set()
+        for customer_code, item_code, _quantity, _notes in rows:
+            customer_codes.add(customer_code)
+            item_codes.add(item_code)
+
+        customer_codes -= self._customers.keys() | self.unknown_customer_codes
+        item_codes -= self._items.keys() | self.unknown_item_codes
+
+        if customer_codes:
+            found = self._db.query(Customer.code, Customer.id).filter(
+                Customer.code.in_(customer_codes)
+            ).all()
+            self._customers.update({code: customer_id for code, customer_id in found})
+            self.unknown_customer_codes |= customer_codes - self._customers.keys()
+
+        if item_codes:
+            found = self._db.query(Item.code, Item.id, Item.unit_price).filter(
+                Item.code.in_(item_codes)
+            ).all()
+            self._items.update({
+                code: (item_id, unit_price or 0.0) for code, item_id, unit_price in found
+            })
+            self.unknown_item_codes |= item_codes - self._items.keys()
+
+    def customer_id(self, code: str) -> Optional[int]:
+        """解決済みの顧客IDを返します。未登録のコードの場合はNone"""
+        return self._customers.get(code)
+
+    def item(self, code: str) -> Optional[Tuple[int, float]]:
+        """解決済みの(商品ID, 単価)を返します。未登録のコードの場合はNone"""
+        return self._items.get(code)
+
+    @property
+    def has_unknown(self) -> bool:
+        return bool(self.unknown_customer_codes or self.unknown_item_codes)
+
+    def unknown_codes_error(self) -> HTTPException:
+        """
+        見つからなかった全てのコードをまとめたHTTPExceptionを生成します
+        """
+        messages = []
+        if self.unknown_customer_codes:
+            messages.append(f"顧客コード {', '.join(sorted(self.unknown_customer_codes))} が見つかりません")
+        if self.unknown_item_codes:
+            messages.append(f"商品コード {', '.join(sorted(self.unknown_item_codes))} が見つかりません")
+        return HTTPException(
+            status_code=400,
+            detail={
+                "message": " / ".join(messages),
+                "unknown_customer_codes": sorted(self.unknown_customer_codes),
+                "unknown_item_codes": sorted(self.unknown_item_codes),
+            }
+        )
+
+def _peak_rss_mb() -> Optional[float]:
+    """
+    プロセスのピークRSS（MB）を返します。取得できない環境ではNoneを返します。
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # LinuxはKB単位、macOSはバイト単位
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
 def process_order_excel(file: UploadFile, db: Any) -> List[OrderCreate]:
     """
     Excelファイルから注文データを処理する関数
@@ -29,51 +173,116 @@ def process_order_excel(file: UploadFile, db: Any) -> List[OrderCreate]:
         HTTPException: Excelファイルの処理中にエラーが発生した場合
     """
     try:
-        # Excelファイルを読み込む
-        workbook = openpyxl.load_workbook(file.file)
-        sheet = workbook.active
-        
         orders: List[OrderCreate] = []
-        # ヘッダー行をスキップ
-        for row in sheet.iter_rows(min_row=2):
-            # 必要なデータが存在する場合のみ処理
-            if row[0].value and row[1].value and row[2].value:
-                customer_code = str(row[0].value)
-                item_code = str(row[1].value)
-                quantity = int(row[2].value)
-                
-                # 顧客とアイテムの存在確認
-                customer = db.query(Customer).filter(Customer.code == customer_code).first()
-                item = db.query(Item).filter(Item.code == item_code).first()
-                
-                if not customer:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"顧客コード {customer_code} が見つかりません"
-                    )
-                if not item:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"商品コード {item_code} が見つかりません"
-                    )
+        resolver = CodeResolver(db)
+        for chunk in iter_order_rows(file.file):
+            resolver.resolve(chunk)
+            for customer_code, item_code, quantity, _notes in chunk:
+                customer_id = resolver.customer_id(customer_code)
+                item = resolver.item(item_code)
+                if customer_id is None or item is None:
+                    continue
                 
                 # 注文データの作成
                 order = OrderCreate(
-                    customer_id=customer.id,
-                    item_id=item.id,
+                    customer_id=customer_id,
+                    item_id=item[0],
                     quantity=quantity,
                     order_date=datetime.now()
                 )
                 orders.append(order)
+
+        # 見つからなかったコードは最後にまとめて報告する
+        if resolver.has_unknown:
+            raise resolver.unknown_codes_error()
         
         return orders
     
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Excelファイルの処理中にエラーが発生しました: {str(e)}"
+        )
+
+def import_order_excel(file: UploadFile, db: Any, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Excelファイルの注文データをストリーミングでデータベースに取り込む関数
+
+    行をチャンク単位で読み込み、チャンクごとにmulti-row INSERTで書き込むため、
+    シートの行数に関わらずメモリ使用量は一定に保たれます。
+    取込は単一トランザクションで行い、途中でエラーが発生した場合は全件ロールバックします。
+
+    Args:
+        file (UploadFile): アップロードされたExcelファイル
+        db (Session): データベースセッション
+        chunk_size: 1チャンクあたりの行数（省略時は設定値）
+
+    Returns:
+        Dict[str, Any]: 取込件数、処理時間、行/秒、ピークRSSを含む取込結果
+
+    Raises:
+        HTTPException: Excelファイルの処理中にエラーが発生した場合
+    """
+    started = time.perf_counter()
+    rows = 0
+    chunks = 0
+    try:
+        resolver = CodeResolver(db)
+        for chunk in iter_order_rows(file.file, chunk_size):
+            resolver.resolve(chunk)
+            order_date = datetime.now()
+            orders: List[Dict[str, Any]] = []
+            lines: List[List[Dict[str, Any]]] = []
+            for customer_code, item_code, quantity, notes in chunk:
+                customer_id = resolver.customer_id(customer_code)
+                item = resolver.item(item_code)
+                # 未登録コードを含む行は書き込まず、最後にまとめて報告する
+                if customer_id is None or item is None or resolver.has_unknown:
+                    continue
+
+                item_id, unit_price = item
+                orders.append({
+                    "customer_id": customer_id,
+                    "order_date": order_date,
+                    "status": OrderStatus.PENDING.value,
+                })
+                lines.append([{
+                    "item_id": item_id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "notes": notes,
+                }])
+
+            # チャンク単位でmulti-row INSERTを発行し、ORMオブジェクトは保持しない
+            insert_order_batch(db, orders, lines)
+            rows += len(chunk)
+            chunks += 1
+
+        if resolver.has_unknown:
+            raise resolver.unknown_codes_error()
+
+        db.commit()
+
     except Exception as e:
+        db.rollback()
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(
             status_code=400,
             detail=f"Excelファイルの処理中にエラーが発生しました: {str(e)}"
         )
 
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "chunks": chunks,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
 def generate_order_template() -> bytes:
     """
     注文用のExcelテンプレートを生成する関数
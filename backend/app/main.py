@@ -1,14 +1,22 @@
+from datetime import date
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
+from .core.responses import default_response_class
+from .core.scheduler import scheduler
+from .crud import item as crud_item
+from .crud.reports import refresh_sales_summary
 from .db.init_db import init_db
+from .db.partitions import add_months, archive_partitions, ensure_partitions
 from .db.session import SessionLocal
-from .routers import users, items, customers, orders, db_integration, excel_integration
+from .routers import users, items, customers, orders, db_integration, excel_integration, metrics, reports, partitions
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=default_response_class()
 )
 
 # Set all CORS enabled origins
@@ -27,15 +35,71 @@ app.include_router(customers.router, prefix=settings.API_V1_STR)
 app.include_router(orders.router, prefix=settings.API_V1_STR)
 app.include_router(db_integration.router, prefix=settings.API_V1_STR)
 app.include_router(excel_integration.router, prefix=settings.API_V1_STR)
+app.include_router(metrics.router, prefix=settings.API_V1_STR)
+app.include_router(reports.router, prefix=settings.API_V1_STR)
+app.include_router(partitions.router, prefix=settings.API_V1_STR)
+
+def refresh_sales_summary_job():
+    db = SessionLocal()
+    try:
+        refresh_sales_summary(db)
+    finally:
+        db.close()
+
+scheduler.register(
+    "sales-summary-refresh",
+    settings.REPORT_REFRESH_INTERVAL_SECONDS,
+    refresh_sales_summary_job
+)
+
+def maintain_order_partitions_job():
+    db = SessionLocal()
+    try:
+        ensure_partitions(db)
+        if settings.ORDER_ARCHIVE_AFTER_MONTHS > 0:
+            today = date.today().replace(day=1)
+            archive_partitions(db, add_months(today, -settings.ORDER_ARCHIVE_AFTER_MONTHS))
+    finally:
+        db.close()
+
+scheduler.register(
+    "order-partition-maintenance",
+    settings.ORDER_PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+    maintain_order_partitions_job
+)
+
+def rebuild_item_typeahead_job():
+    db = SessionLocal()
+    try:
+        crud_item.load_typeahead(db)
+    finally:
+        db.close()
+
+scheduler.register(
+    "item-typeahead-rebuild",
+    settings.TYPEAHEAD_REBUILD_INTERVAL_SECONDS,
+    rebuild_item_typeahead_job
+)
 
 @app.on_event("startup")
 def init_data():
     db = SessionLocal()
     try:
         init_db(db)
+        # 当月以降のパーティションがないと注文がDEFAULTパーティションに入るため、起動時にも作成する
+        ensure_partitions(db)
+        crud_item.load_typeahead(db)
     finally:
         db.close()
 
+@app.on_event("startup")
+def start_scheduler():
+    scheduler.start()
+
+@app.on_event("shutdown")
+def stop_scheduler():
+    scheduler.stop()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to My Order System API"} 
\ No newline at end of file
@@ -2,7 +2,9 @@ from .user import User
 from .item import Item
 from .customer import Customer
 from .order import Order, OrderItem, OrderStatus
+from .inbound import Inbound, InboundItem
 from .settings import UserSettings
+from .report import MonthlyCustomerSales, MonthlyItemSales, SalesSummaryChange, SummaryRefreshState
 
 # データベースマイグレーション時に必要なため、
 # 全てのモデルをインポートしておく
@@ -13,5 +15,10 @@ __all__ = [
     "Order",
     "OrderItem",
     "OrderStatus",
+    "Inbound",
+    "InboundItem",
     "UserSettings",
+    "MonthlyCustomerSales",
+    "MonthlyItemSales",
+    "SummaryRefreshState",
 ] 
\ No newline at end of file
@@ -31,8 +31,8 @@ class InboundItem(Base):
     __tablename__ = "inbound_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    inbound_id = Column(Integer, ForeignKey("inbounds.id"))
-    item_id = Column(Integer, ForeignKey("items.id"))
+    inbound_id = Column(Integer, ForeignKey("inbounds.id"), index=True)
+    item_id = Column(Integer, ForeignKey("items.id"), index=True)
     expected_quantity = Column(Integer, default=0)
     received_quantity = Column(Integer, default=0)
     notes = Column(Text, nullable=True)
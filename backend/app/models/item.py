@@ -40,4 +40,5 @@ class Item(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # リレーションシップ
-    order_items = relationship("OrderItem", back_populates="item") 
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="item")
+    inbound_items = relationship("InboundItem", back_populates="item") 
\ No newline at end of file
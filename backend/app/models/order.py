@@ -2,7 +2,7 @@
 Order database model.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, ForeignKeyConstraint, Enum, Index, text
 from sqlalchemy.orm import relationship
 import enum
 
@@ -17,6 +17,14 @@ class OrderStatus(str, enum.Enum):
     DELIVERED = "delivered"  # 配達済み
     CANCELLED = "cancelled"  # キャンセル
 
+# ステータス遷移の定義（遷移先 -> 遷移元として許可するステータス）
+# CONFIRMEDとCANCELLEDへの遷移は在庫の引当・戻しを伴うため、crud.stockでのみ行う
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PROCESSING: (OrderStatus.CONFIRMED,),
+    OrderStatus.SHIPPED: (OrderStatus.CONFIRMED, OrderStatus.PROCESSING),
+    OrderStatus.DELIVERED: (OrderStatus.SHIPPED,),
+}
+
 class Order(Base):
     """
     注文モデル
@@ -26,6 +34,8 @@ class Order(Base):
         customer_id (int): 顧客ID（外部キー）
         status (str): 注文ステータス
         order_date (datetime): 注文日
+        total_amount (float): 明細金額（数量×単価）の合計。明細の書き込み時に更新する
+        line_count (int): 明細数。明細の書き込み時に更新する
         created_at (datetime): 作成日時
         updated_at (datetime): 更新日時
         
@@ -33,15 +43,31 @@ class Order(Base):
         items (List[OrderItem]): 注文明細リスト
     """
     __tablename__ = "orders"
+    # 注文日で月単位にレンジパーティション分割する（パーティションはapp.db.partitionsで作成する）
+    # パーティションキーを含める必要があるため、テーブルの主キーは(id, order_date)
+    __table_args__ = (
+        Index("ix_orders_customer_id_order_date", "customer_id", "order_date"),
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        Index(
+            "ix_orders_open_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'confirmed', 'processing')")
+        ),
+        {"postgresql_partition_by": "RANGE (order_date)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
-    order_date = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # パーティションキー。パーティション間の移動は明細の外部キーと両立しないため更新不可（DBトリガーで禁止）
+    order_date = Column(DateTime, primary_key=True, default=datetime.utcnow, index=True)
     status = Column(
         String,
         nullable=False,
         default=OrderStatus.PENDING
     )
+    total_amount = Column(Float, nullable=False, default=0, server_default="0")
+    line_count = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(
         DateTime,
@@ -50,9 +76,18 @@ class Order(Base):
         onupdate=datetime.utcnow
     )
 
+    # IDはシーケンスで一意のため、ORM上の同一性はIDのみで判定する
+    __mapper_args__ = {"primary_key": [id]}
+
     # リレーションシップ
     customer = relationship("Customer", back_populates="orders")
-    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
+    # 明細はDB側のON DELETE CASCADEで削除されるため、注文の削除時に明細を読み込まない
+    items = relationship(
+        "OrderItem",
+        back_populates="order",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
 
 class OrderItem(Base):
     """
@@ -61,6 +96,7 @@ class OrderItem(Base):
     Attributes:
         id (int): 主キー
         order_id (int): 注文ID（外部キー）
+        order_date (datetime): 注文の注文日（外部キー、パーティションキー）
         item_id (int): 商品ID（外部キー）
         quantity (int): 数量
         unit_price (float): 単価
@@ -70,10 +106,21 @@ class OrderItem(Base):
         item (Item): 商品（リレーション）
     """
     __tablename__ = "order_items"
+    # 注文と同じ月単位のパーティションに分割し、注文の削除はDB側でカスケードする
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_date"],
+            ["orders.id", "orders.order_date"],
+            name="fk_order_items_order",
+            ondelete="CASCADE"
+        ),
+        {"postgresql_partition_by": "RANGE (order_date)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
-    item_id = Column(Integer, ForeignKey("items.id"), nullable=False)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    order_id = Column(Integer, nullable=False, index=True)
+    order_date = Column(DateTime, primary_key=True)
+    item_id = Column(Integer, ForeignKey("items.id"), nullable=False, index=True)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Float, nullable=False)
     notes = Column(String, nullable=True)
@@ -81,3 +128,5 @@ class OrderItem(Base):
     # リレーションシップ
     order = relationship("Order", back_populates="items")
     item = relationship("Item", back_populates="order_items")
+
+    __mapper_args__ = {"primary_key": [id]}
@@ -0,0 +1,86 @@
+"""
+Sales summary (reporting) database models.
+"""
+from sqlalchemy import BigInteger, Column, Integer, String, Float, Date, DateTime, ForeignKey, func
+
+from app.database import Base
+
+class MonthlyCustomerSales(Base):
+    """
+    顧客別月次売上サマリー
+
+    orders/order_itemsから集計した値を保持する。crud.reports.refresh_sales_summaryで更新する
+
+    Attributes:
+        month (date): 対象月（月初日）
+        customer_id (int): 顧客ID
+        order_count (int): 注文数
+        total_quantity (int): 数量の合計
+        total_amount (float): 金額の合計
+        refreshed_at (datetime): 集計日時
+    """
+    __tablename__ = "sales_monthly_customer"
+
+    month = Column(Date, primary_key=True)
+    customer_id = Column(Integer, ForeignKey("customers.id"), primary_key=True, index=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class MonthlyItemSales(Base):
+    """
+    商品別月次売上サマリー
+
+    Attributes:
+        month (date): 対象月（月初日）
+        item_id (int): 商品ID
+        order_count (int): 注文数
+        total_quantity (int): 数量の合計
+        total_amount (float): 金額の合計
+        refreshed_at (datetime): 集計日時
+    """
+    __tablename__ = "sales_monthly_item"
+
+    month = Column(Date, primary_key=True)
+    item_id = Column(Integer, ForeignKey("items.id"), primary_key=True, index=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    total_quantity = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+class SummaryRefreshState(Base):
+    """
+    サマリーテーブルの更新状態
+
+    Attributes:
+        name (str): サマリー名
+        last_refreshed_at (datetime): 前回の更新日時
+        last_mode (str): 前回の更新方式（"full" または "incremental"）
+        last_months (int): 前回の更新で再集計した月数
+        last_duration_ms (int): 前回の更新の所要時間（ミリ秒）
+    """
+    __tablename__ = "summary_refresh_state"
+
+    name = Column(String(50), primary_key=True)
+    last_refreshed_at = Column(DateTime(timezone=True), nullable=True)
+    last_mode = Column(String(20), nullable=True)
+    last_months = Column(Integer, nullable=True)
+    last_duration_ms = Column(Integer, nullable=True)
+
+class SalesSummaryChange(Base):
+    """
+    売上サマリーの再集計が必要な月の変更ログ
+
+    orders / order_items のINSERT・UPDATE・DELETEでトリガー（record_sales_summary_change）が
+    注文日の月とトランザクションIDを記録する。行は書き込んだトランザクションのコミット時に見えるようになるため、
+    長時間のトランザクションでも増分更新で取りこぼさない。crud.reports.refresh_sales_summaryが読み取りと同時に削除する
+
+    Attributes:
+        month (date): 再集計が必要な月（月初日）
+        txid (int): 変更したトランザクションのID（同じトランザクション内の重複を1行にまとめるため）
+    """
+    __tablename__ = "sales_summary_changes"
+
+    month = Column(Date, primary_key=True)
+    txid = Column(BigInteger, primary_key=True)
@@ -1,11 +1,14 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..core.auth import get_current_active_user
+from ..core.etag import compute_etag, etag_matches, not_modified, set_etag
 from ..database import get_db
 from ..schemas.user import User
+from ..schemas.pagination import CursorPage
 from ..schemas.customer import Customer, CustomerCreate, CustomerUpdate
 from ..crud import customer as crud_customer
 
@@ -14,15 +17,46 @@ router = APIRouter(prefix="/customers", tags=["customers"])
 
 @router.get("/", response_model=List[Customer])
 def read_customers(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     name: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
+    etag = compute_etag(crud_customer.get_multi_versions(db, skip=skip, limit=limit, name=name))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     customers = crud_customer.get_multi(db, skip=skip, limit=limit, name=name)
     return customers
 
 
+@router.get("/cursor", response_model=CursorPage[Customer])
+def read_customers_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, gt=0, le=1000),
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        customers, next_cursor = crud_customer.get_page(db, cursor=cursor, limit=limit, is_active=is_active)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": customers, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=List[Customer])
+def search_customers(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, gt=0, le=100),
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    # コードの完全一致・前方一致、名前などの部分一致・類似度の順に並べる
+    return crud_customer.search(db, q=q, limit=limit, is_active=is_active)
+
+
 @router.post("/", response_model=Customer)
 def create_customer(customer_in: CustomerCreate, db: Session = Depends(get_db)):
     customer = crud_customer.get_by_code(db, code=customer_in.code)
@@ -35,10 +69,20 @@ def create_customer(customer_in: CustomerCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{customer_id}", response_model=Customer)
-def read_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = crud_customer.get(db, customer_id=customer_id)
+def read_customer(
+    customer_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    customer = crud_customer.get_cached(db, customer_id=customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="顧客が見つかりません")
+    # キャッシュ済みの値から計算するため、ヒット時はDBに問い合わせない
+    etag = compute_etag([(customer.id, customer.updated_at or customer.created_at)])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return customer
 
 
@@ -52,15 +96,19 @@ def update_customer(customer_id: int, customer_in: CustomerUpdate, db: Session =
 
 @router.delete("/{customer_id}", response_model=Customer)
 def delete_customer(customer_id: int, db: Session = Depends(get_db)):
-    customer = crud_customer.get(db, customer_id=customer_id)
+    try:
+        customer = crud_customer.remove(db, customer_id=customer_id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="注文などから参照されているため削除できません")
     if not customer:
         raise HTTPException(status_code=404, detail="顧客が見つかりません")
-    return crud_customer.remove(db, customer_id=customer_id)
+    return customer
 
 
 @router.get("/code/{code}", response_model=Customer)
 def read_customer_by_code(code: str, db: Session = Depends(get_db)):
-    customer = crud_customer.get_by_code(db, code=code)
+    customer = crud_customer.get_by_code_cached(db, code=code)
     if not customer:
         raise HTTPException(status_code=404, detail="顧客が見つかりません")
     return customer
@@ -1,9 +1,11 @@
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from ..integration.db_connector import DBConnector
-from ..core.deps import get_db
+from ..core.auth import get_current_admin_user
+from ..core.config import settings
+from ..schemas.user import User
+from ..integration.db_connector import DBConnector, get_db_connector
 
 router = APIRouter(
     prefix="/api/db",
@@ -12,45 +14,67 @@ router = APIRouter(
 )
 
 @router.get("/tables", response_model=List[str])
-def get_tables(db: Session = Depends(get_db)):
+def get_tables(connector: DBConnector = Depends(get_db_connector)):
     """
     データベース内のテーブル一覧を取得します
     """
     try:
-        connector = DBConnector()
         return connector.get_tables()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/tables/{table_name}/schema", response_model=List[Dict[str, Any]])
-def get_table_schema(table_name: str, db: Session = Depends(get_db)):
+def get_table_schema(table_name: str, connector: DBConnector = Depends(get_db_connector)):
     """
     指定されたテーブルのスキーマ情報を取得します
     """
     try:
-        connector = DBConnector()
         return connector.get_table_schema(table_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/query", response_model=List[Dict[str, Any]])
-def execute_query(query: str, params: Dict[str, Any] = None, db: Session = Depends(get_db)):
+def execute_query(query: str, params: Dict[str, Any] = None, connector: DBConnector = Depends(get_db_connector)):
     """
     SQLクエリを実行し、結果を返します
     """
     try:
-        connector = DBConnector()
         return connector.execute_query(query, params)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/query/stream")
+def stream_query(
+    query: str,
+    params: Dict[str, Any] = None,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    max_rows: Optional[int] = Query(None, gt=0),
+    connector: DBConnector = Depends(get_db_connector),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    SQLクエリを実行し、結果をNDJSONまたはCSVでストリーミングします（管理者のみ）
+    サーバーサイドカーソルでチャンク単位に取得するため、大きな結果でもメモリ使用量は一定です
+    """
+    row_limit = min(max_rows or settings.DB_QUERY_STREAM_MAX_ROWS, settings.DB_QUERY_STREAM_MAX_ROWS)
+    try:
+        chunks = connector.stream_query(query, params, fmt=format, max_rows=row_limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"X-Max-Rows": str(row_limit)}
+    )
+
 @router.post("/update", response_model=int)
-def execute_update(query: str, params: Dict[str, Any] = None, db: Session = Depends(get_db)):
+def execute_update(query: str, params: Dict[str, Any] = None, connector: DBConnector = Depends(get_db_connector)):
     """
     更新系のSQLクエリを実行し、影響を受けた行数を返します
     """
     try:
-        connector = DBConnector()
         return connector.execute_update(query, params)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -6,7 +6,7 @@ import os
 
 from ..core.auth import get_current_active_user
 from ..database import get_db
-from ..integration.excel_connector import process_order_excel, generate_order_template
+from ..integration.excel_connector import process_order_excel, import_order_excel, generate_order_template
 from ..schemas.user import User
 
 router = APIRouter(prefix="/excel", tags=["excel_integration"])
@@ -36,6 +36,30 @@ async def upload_order_excel(
         raise HTTPException(status_code=500, detail=f"処理中にエラーが発生しました: {str(e)}")
 
 
+@router.post("/import-orders")
+def import_orders_excel(
+    file: UploadFile = File(...),
+    chunk_size: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    大量の注文データをストリーミングで取り込む
+    シートをチャンク単位で読み込むため、行数に関わらずメモリ使用量は一定です。
+    """
+    if not file.filename.endswith('.xlsx'):
+        raise HTTPException(status_code=400, detail="Excelファイル(.xlsx)をアップロードしてください")
+    if chunk_size is not None and chunk_size <= 0:
+        raise HTTPException(status_code=400, detail="chunk_sizeには1以上を指定してください")
+
+    result = import_order_excel(file, db, chunk_size=chunk_size)
+    return {
+        "status": "success",
+        "message": f"{result['rows']}件の注文データが取り込まれました",
+        **result,
+    }
+
+
 @router.get("/generate-template")
 async def get_excel_template(
     customer_id: Optional[int] = None,
@@ -1,12 +1,16 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..core.auth import get_current_active_user
+from ..core.etag import compute_etag, etag_matches, not_modified, set_etag
+from ..core.responses import model_response
 from ..database import get_db
 from ..schemas.user import User
-from ..schemas.item import Item, ItemCreate, ItemUpdate
+from ..schemas.pagination import CursorPage
+from ..schemas.item import Item, ItemCreate, ItemSuggestion, ItemUpdate
 from ..crud import item as crud_item
 
 router = APIRouter(prefix="/items", tags=["items"])
@@ -14,13 +18,53 @@ router = APIRouter(prefix="/items", tags=["items"])
 
 @router.get("/", response_model=List[Item])
 def read_items(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     name: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
+    etag = compute_etag(crud_item.get_multi_versions(db, skip=skip, limit=limit, name=name))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     items = crud_item.get_multi(db, skip=skip, limit=limit, name=name)
-    return items
+    response = model_response(List[Item], items)
+    set_etag(response, etag)
+    return response
+
+
+@router.get("/cursor", response_model=CursorPage[Item])
+def read_items_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, gt=0, le=1000),
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        items, next_cursor = crud_item.get_page(db, cursor=cursor, limit=limit, is_active=is_active)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=List[Item])
+def search_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, gt=0, le=100),
+    is_active: Optional[bool] = None,
+    db: Session = Depends(get_db),
+):
+    # コードの完全一致・前方一致、名前などの部分一致・類似度の順に並べる
+    return crud_item.search(db, q=q, limit=limit, is_active=is_active)
+
+
+@router.get("/suggest", response_model=List[ItemSuggestion])
+def suggest_items(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, gt=0, le=50),
+):
+    # プロセス内の前方一致インデックスから返すため、DBには問い合わせない
+    return crud_item.suggest(q, limit=limit)
 
 
 @router.post("/", response_model=Item)
@@ -35,10 +79,20 @@ def create_item(item_in: ItemCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{item_id}", response_model=Item)
-def read_item(item_id: int, db: Session = Depends(get_db)):
-    item = crud_item.get(db, item_id=item_id)
+def read_item(
+    item_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    item = crud_item.get_cached(db, item_id=item_id)
     if not item:
         raise HTTPException(status_code=404, detail="部品が見つかりません")
+    # キャッシュ済みの値から計算するため、ヒット時はDBに問い合わせない
+    etag = compute_etag([(item.id, item.updated_at or item.created_at)])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return item
 
 
@@ -52,15 +106,19 @@ def update_item(item_id: int, item_in: ItemUpdate, db: Session = Depends(get_db)
 
 @router.delete("/{item_id}", response_model=Item)
 def delete_item(item_id: int, db: Session = Depends(get_db)):
-    item = crud_item.get(db, item_id=item_id)
+    try:
+        item = crud_item.remove(db, item_id=item_id)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="注文などから参照されているため削除できません")
     if not item:
         raise HTTPException(status_code=404, detail="部品が見つかりません")
-    return crud_item.remove(db, item_id=item_id)
+    return item
 
 
 @router.get("/code/{code}", response_model=Item)
 def read_item_by_code(code: str, db: Session = Depends(get_db)):
-    item = crud_item.get_by_code(db, code=code)
+    item = crud_item.get_by_code_cached(db, code=code)
     if not item:
         raise HTTPException(status_code=404, detail="部品が見つかりません")
     return item
@@ -0,0 +1,52 @@
+"""
+Metrics router module for exposing runtime metrics.
+"""
+from fastapi import APIRouter, Depends
+
+from app.core.deps import get_current_active_user
+from app.core.scheduler import scheduler
+from app.core.security import password_hash_pool
+from app.core.user_cache import user_cache
+from app.crud.customer import customer_cache
+from app.crud.item import item_cache, item_typeahead
+from app.db.session import engine
+from app.models.user import User
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("/db-pool")
+def read_db_pool_metrics(current_user: User = Depends(get_current_active_user)) -> dict:
+    """
+    コネクションプールの状態を取得する
+    - checked_out / saturation: 使用中の接続数と上限に対する割合
+    - waits / timeouts: 空き接続の待機回数とタイムアウト回数
+    - avg_checkout_ms / max_checkout_ms: 接続取得にかかった時間
+    """
+    return engine.pool.stats()
+
+@router.get("/caches")
+def read_cache_metrics(current_user: User = Depends(get_current_active_user)) -> dict:
+    """
+    プロセス内キャッシュのヒット数・ミス数・件数と、商品の入力補完インデックスの件数を取得する
+    """
+    return {
+        "user": user_cache.stats(),
+        "item": item_cache.stats(),
+        "customer": customer_cache.stats(),
+        "item_typeahead": item_typeahead.stats(),
+    }
+
+@router.get("/password-hash")
+def read_password_hash_metrics(current_user: User = Depends(get_current_active_user)) -> dict:
+    """
+    パスワードハッシュ計算用ワーカープールの状態を取得する
+    - queue_depth: ワーカーの空きを待っている件数
+    """
+    return password_hash_pool.stats()
+
+@router.get("/jobs")
+def read_job_metrics(current_user: User = Depends(get_current_active_user)) -> list:
+    """
+    定期ジョブの実行回数・失敗回数を取得する
+    """
+    return scheduler.stats()
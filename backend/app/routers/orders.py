@@ -3,18 +3,48 @@ Orders router module for handling order-related API endpoints.
 """
 from typing import List, Optional
 from datetime import datetime, date
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from app.core.deps import get_db, get_current_active_user
+from app.core.etag import compute_etag, etag_matches, not_modified, set_etag
+from app.core.responses import model_response
 from app.crud import orders as orders_crud
+from app.crud import order_aggregates
+from app.crud import stock as stock_crud
 from app.models.user import User
-from app.models.order import Order
-from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.models.order import Order, OrderStatus
+from app.schemas.pagination import CursorPage
+from app.schemas.order import (
+    OrderCreate, OrderUpdate, OrderResponse, OrderDetailResponse,
+    OrderBulkRequest, OrderBulkResult,
+    OrderTotal, CustomerOrderTotal, PeriodOrderTotal, ItemOrderTotal,
+    OrderTotalsMismatch, OrderTotalsRepairResult, OrderStockResult,
+    OrderStatusBulkUpdate, OrderStatusBulkResult,
+    OrderBulkDelete, OrderBulkDeleteResult
+)
 
 router = APIRouter()
 
+# 在庫の引当・戻しを伴うため、専用のエンドポイントでのみ変更できるステータス
+STOCK_STATUSES = (OrderStatus.CONFIRMED, OrderStatus.CANCELLED)
+
+def _order_filters(
+    customer_id: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date]
+) -> list:
+    """一覧取得用のフィルター条件を組み立てる"""
+    filters = []
+    if customer_id:
+        filters.append(Order.customer_id == customer_id)
+    if start_date:
+        filters.append(Order.order_date >= start_date)
+    if end_date:
+        filters.append(Order.order_date <= end_date)
+    return filters
+
 @router.post("/", response_model=OrderResponse)
 def create_order(
     order: OrderCreate,
@@ -26,8 +56,86 @@ def create_order(
     """
     return orders_crud.create_order(db=db, order=order)
 
+@router.post("/bulk", response_model=OrderBulkResult)
+def create_orders_bulk(
+    request: OrderBulkRequest,
+    batch_size: Optional[int] = Query(None, gt=0, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    明細付きの注文を一括登録する
+    EDI等の大量データ向けに、バッチ単位のmulti-row INSERTで書き込む
+    - 存在しない顧客・商品を参照している場合は何も登録せず400を返す
+    - 途中のバッチが失敗した場合は409を返し、コミット済みの注文IDをdetailに含める
+    """
+    try:
+        return orders_crud.bulk_create_orders(
+            db=db,
+            orders=request.orders,
+            batch_size=batch_size
+        )
+    except orders_crud.UnknownReferenceError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": str(e), "customer_ids": e.customer_ids, "item_ids": e.item_ids}
+        )
+    except orders_crud.BulkInsertError as e:
+        # 失敗したバッチより前のバッチはコミット済みのため、登録済みの注文IDを返す
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "failed_batch": e.failed_batch, "order_ids": e.order_ids}
+        )
+
+@router.post("/bulk/status", response_model=OrderStatusBulkResult)
+def update_orders_status_bulk(
+    request: OrderStatusBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    複数の注文のステータスをまとめて変更する（例: 出荷済みへの一括変更）
+    - 遷移元として許可されていないステータスの注文と存在しない注文はrejectedに返す
+    - 確定・キャンセルは在庫の引当・戻しを伴うため対象外（/confirm, /cancelを使用する）
+    """
+    try:
+        updated, rejected = orders_crud.bulk_transition_status(
+            db=db,
+            order_ids=request.order_ids,
+            status=request.status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"updated": updated, "rejected": rejected}
+
+@router.post("/bulk/delete", response_model=OrderBulkDeleteResult)
+def delete_orders_bulk(
+    request: OrderBulkDelete,
+    batch_size: Optional[int] = Query(None, gt=0, le=10000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    古い注文などをまとめて削除する
+    - order_ids / before（注文日）で対象を指定し、statusesで対象のステータスを絞り込む
+    - statusesに指定できるのは配達済み・キャンセルのみ（引当済みの在庫がある注文は削除しない。それ以外は400）
+    - 削除した注文は次回の月次売上サマリーの更新で集計から外れる
+      （過去の月のレポートを残す場合は、削除ではなく/partitions/archiveでパーティションごとアーカイブする）
+    """
+    try:
+        return orders_crud.bulk_delete_orders(
+            db=db,
+            order_ids=request.order_ids,
+            before=request.before,
+            statuses=request.statuses,
+            batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/", response_model=List[OrderResponse])
 def read_orders(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     customer_id: Optional[int] = None,
@@ -35,41 +143,219 @@ def read_orders(
     end_date: Optional[date] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
-) -> List[Order]:
+) -> Response:
     """
     注文一覧を取得する
     フィルタリング：
     - customer_id: 特定の顧客の注文のみ
     - start_date: この日付以降の注文
     - end_date: この日付以前の注文
+    If-None-MatchがETagに一致する場合は304を返す
     """
-    filters = []
-    if customer_id:
-        filters.append(Order.customer_id == customer_id)
-    if start_date:
-        filters.append(Order.order_date >= start_date)
-    if end_date:
-        filters.append(Order.order_date <= end_date)
+    filters = _order_filters(customer_id, start_date, end_date)
+    etag = compute_etag(orders_crud.get_order_versions(
+        db=db,
+        skip=skip,
+        limit=limit,
+        filters=filters
+    ))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     
-    return orders_crud.get_orders(
+    orders = orders_crud.get_orders(
         db=db,
         skip=skip,
         limit=limit,
         filters=filters
     )
+    response = model_response(List[OrderResponse], orders)
+    set_etag(response, etag)
+    return response
+
+@router.get("/cursor", response_model=CursorPage[OrderResponse])
+def read_orders_by_cursor(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, gt=0, le=1000),
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    注文一覧をカーソル方式で取得する（作成日時の新しい順）
+    レスポンスのnext_cursorを次のリクエストのcursorに指定する
+    """
+    filters = _order_filters(customer_id, start_date, end_date)
+    try:
+        orders, next_cursor = orders_crud.get_orders_page(
+            db=db,
+            cursor=cursor,
+            limit=limit,
+            filters=filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": orders, "next_cursor": next_cursor}
+
+@router.get("/detail", response_model=List[OrderDetailResponse])
+def read_orders_detail(
+    skip: int = 0,
+    limit: int = Query(100, gt=0, le=1000),
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> List[Order]:
+    """
+    顧客と明細を含む注文一覧を取得する
+    関連データは一括読み込みするため、件数に関わらずクエリ数は一定
+    """
+    return orders_crud.get_orders(
+        db=db,
+        skip=skip,
+        limit=limit,
+        filters=_order_filters(customer_id, start_date, end_date),
+        load="detail"
+    )
+
+@router.get("/aggregates/orders", response_model=List[OrderTotal])
+def read_order_totals(
+    skip: int = 0,
+    limit: int = Query(100, gt=0, le=1000),
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_cancelled: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    注文ごとの明細数・数量・金額を集計する（注文日の新しい順）
+    """
+    return order_aggregates.get_order_totals(
+        db=db,
+        skip=skip,
+        limit=limit,
+        filters=_order_filters(customer_id, start_date, end_date),
+        include_cancelled=include_cancelled
+    )
+
+@router.get("/aggregates/customers", response_model=List[CustomerOrderTotal])
+def read_customer_totals(
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_cancelled: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    顧客ごとの注文数・数量・金額を集計する（金額の大きい順）
+    """
+    return order_aggregates.get_customer_totals(
+        db=db,
+        filters=_order_filters(customer_id, start_date, end_date),
+        include_cancelled=include_cancelled
+    )
+
+@router.get("/aggregates/periods", response_model=List[PeriodOrderTotal])
+def read_period_totals(
+    period: str = Query("day", pattern="^(day|month)$"),
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_cancelled: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    注文日の日別（period=day）または月別（period=month）に集計する
+    """
+    return order_aggregates.get_period_totals(
+        db=db,
+        period=period,
+        filters=_order_filters(customer_id, start_date, end_date),
+        include_cancelled=include_cancelled
+    )
+
+@router.get("/aggregates/items", response_model=List[ItemOrderTotal])
+def read_item_totals(
+    customer_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_cancelled: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    商品ごとの注文数・数量・金額を集計する（金額の大きい順）
+    """
+    return order_aggregates.get_item_totals(
+        db=db,
+        filters=_order_filters(customer_id, start_date, end_date),
+        include_cancelled=include_cancelled
+    )
+
+@router.get("/totals/check", response_model=List[OrderTotalsMismatch])
+def check_order_totals(
+    limit: int = Query(100, gt=0, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    注文に保存されている合計金額・明細数が明細の集計と一致しない注文を取得する
+    空のリストが返れば整合している
+    """
+    return orders_crud.find_inconsistent_order_totals(db=db, limit=limit)
+
+@router.post("/totals/repair", response_model=OrderTotalsRepairResult)
+def repair_order_totals(
+    order_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    明細から合計金額・明細数を再計算する（order_ids省略時は全注文）
+    保存値が明細の集計と一致しない注文だけを更新し、更新した件数を返す
+    """
+    updated = orders_crud.recalculate_order_totals(db=db, order_ids=order_ids)
+    return {"updated": updated}
+
+@router.get("/{order_id}/detail", response_model=OrderDetailResponse)
+def read_order_detail(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> Order:
+    """
+    顧客と明細を含む注文を取得する
+    """
+    order = orders_crud.get_order(db=db, order_id=order_id, load="detail")
+    if order is None:
+        raise HTTPException(status_code=404, detail="注文が見つかりません")
+    return order
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def read_order(
     order_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Order:
     """
     特定の注文を取得する
+    If-None-MatchがETagに一致する場合は304を返す
     """
     order = orders_crud.get_order(db=db, order_id=order_id)
     if order is None:
         raise HTTPException(status_code=404, detail="注文が見つかりません")
+    etag = compute_etag([(order.id, order.updated_at)])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return order
 
 @router.put("/{order_id}", response_model=OrderResponse)
@@ -81,11 +367,60 @@ def update_order(
 ) -> Order:
     """
     注文を更新する
+    ステータスは処理中・発送済み・配達済みへの順方向の遷移のみ変更できる（それ以外は409）
     """
     order = orders_crud.get_order(db=db, order_id=order_id)
     if order is None:
         raise HTTPException(status_code=404, detail="注文が見つかりません")
-    return orders_crud.update_order(db=db, order=order, order_update=order_update)
+    if order_update.status in STOCK_STATUSES and order_update.status != order.status:
+        raise HTTPException(
+            status_code=400,
+            detail="確定・キャンセルは在庫の引当・戻しを伴うため、/confirm または /cancel を使用してください"
+        )
+    try:
+        return orders_crud.update_order(db=db, order=order, order_update=order_update)
+    except stock_crud.OrderStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/{order_id}/confirm", response_model=OrderStockResult)
+def confirm_order(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    注文を確定し、全明細の在庫を引き当てる
+    在庫が不足している商品がある場合は何も変更せず409を返す
+    """
+    try:
+        result = stock_crud.reserve_order_stock(db=db, order_id=order_id)
+    except stock_crud.StockShortageError as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": str(e), "shortages": e.shortages}
+        )
+    except stock_crud.OrderStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not result:
+        raise HTTPException(status_code=404, detail="注文が見つかりません")
+    return result
+
+@router.post("/{order_id}/cancel", response_model=OrderStockResult)
+def cancel_order(
+    order_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    注文をキャンセルする。確定済み・処理中の注文は引き当てた在庫を戻す
+    """
+    try:
+        result = stock_crud.cancel_order(db=db, order_id=order_id)
+    except stock_crud.OrderStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not result:
+        raise HTTPException(status_code=404, detail="注文が見つかりません")
+    return result
 
 @router.delete("/{order_id}")
 def delete_order(
@@ -95,9 +430,12 @@ def delete_order(
 ) -> dict:
     """
     注文を削除する
+    確定済み・処理中の注文は在庫を引き当てているため409を返す（先に/cancelで在庫を戻す）
     """
-    order = orders_crud.get_order(db=db, order_id=order_id)
-    if order is None:
+    try:
+        deleted = orders_crud.delete_order(db=db, order_id=order_id)
+    except stock_crud.OrderStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
         raise HTTPException(status_code=404, detail="注文が見つかりません")
-    orders_crud.delete_order(db=db, order_id=order_id)
     return {"message": "注文を削除しました"} 
\ No newline at end of file
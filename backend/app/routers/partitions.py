@@ -0,0 +1,60 @@
+"""
+Partitions router module for maintaining monthly order partitions.
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_current_active_user
+from app.db import partitions as partitions_db
+from app.models.user import User
+from app.schemas.partition import OrderPartitionList, OrderPartitionResult
+
+router = APIRouter(prefix="/partitions", tags=["partitions"])
+
+@router.get("/", response_model=OrderPartitionList)
+def read_partitions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    注文テーブルの月次パーティションと、アーカイブ済みのテーブルの一覧を取得する
+    """
+    return {
+        "partitions": partitions_db.list_partitions(db),
+        "archived": partitions_db.list_partitions(db, schema=partitions_db.ARCHIVE_SCHEMA),
+    }
+
+@router.post("/ensure", response_model=OrderPartitionResult)
+def ensure_partitions(
+    months_ahead: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    当月から指定月数先までの月次パーティションを作成する（省略時は設定値）
+    """
+    if months_ahead is not None and months_ahead < 0:
+        raise HTTPException(status_code=400, detail="months_aheadは0以上を指定してください")
+    return {"partitions": partitions_db.ensure_partitions(db, months_ahead=months_ahead)}
+
+@router.post("/archive", response_model=OrderPartitionResult)
+def archive_partitions(
+    before: date,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    指定した月より前のパーティションを切り離し、archiveスキーマへ移動する
+    - 切り離した月の注文・明細は通常のAPIからは参照できなくなる
+    - 売上サマリーの該当月は保持される
+    - 未完了（保留中・確認済み・処理中）の注文が残る月がある場合は何も切り離さず409を返す
+    """
+    if before > date.today():
+        raise HTTPException(status_code=400, detail="未来の月はアーカイブできません")
+    try:
+        return {"partitions": partitions_db.archive_partitions(db, before)}
+    except partitions_db.PartitionArchiveError as e:
+        raise HTTPException(status_code=409, detail=str(e))
@@ -0,0 +1,80 @@
+"""
+Reports router module for sales summary endpoints.
+"""
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.deps import get_db, get_current_active_user
+from app.crud import reports as reports_crud
+from app.models.user import User
+from app.schemas.report import (
+    MonthlyCustomerSales, MonthlyItemSales, SummaryRefreshState, SummaryRefreshResult
+)
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+@router.get("/sales/customers", response_model=List[MonthlyCustomerSales])
+def read_customer_sales(
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    customer_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    顧客別月次売上をサマリーテーブルから取得する
+    値は前回のサマリー更新時点のもの（/reports/sales/stateで確認できる）
+    """
+    return reports_crud.get_customer_sales(
+        db=db,
+        start_month=start_month,
+        end_month=end_month,
+        customer_id=customer_id
+    )
+
+@router.get("/sales/items", response_model=List[MonthlyItemSales])
+def read_item_sales(
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    item_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> list:
+    """
+    商品別月次売上をサマリーテーブルから取得する
+    """
+    return reports_crud.get_item_sales(
+        db=db,
+        start_month=start_month,
+        end_month=end_month,
+        item_id=item_id
+    )
+
+@router.get("/sales/state", response_model=SummaryRefreshState)
+def read_sales_summary_state(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    売上サマリーの更新状態を取得する
+    """
+    state = reports_crud.get_refresh_state(db)
+    if state is None:
+        raise HTTPException(status_code=404, detail="売上サマリーはまだ作成されていません")
+    return state
+
+@router.post("/sales/refresh", response_model=SummaryRefreshResult)
+def refresh_sales_summary(
+    full: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> dict:
+    """
+    売上サマリーを更新する
+    - full=false: 前回以降に変更（登録・更新・削除）された注文・明細を含む月だけを再集計する
+    - full=true: 全期間を作り直す（注文の削除を反映する場合など）
+    """
+    return reports_crud.refresh_sales_summary(db, full=full)
@@ -1,13 +1,14 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
-from ..core.auth import authenticate_user, create_access_token, get_current_active_user, get_current_admin_user
+from ..core.auth import authenticate_user_async, create_access_token, get_current_active_user, get_current_admin_user
 from ..core.config import settings
 from ..database import get_db
+from ..schemas.pagination import CursorPage
 from ..schemas.token import Token
 from ..schemas.user import User, UserCreate, UserUpdate
 from ..crud import user as crud_user
@@ -18,7 +19,7 @@ users_router = APIRouter(prefix="/api/users", tags=["users"])
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +39,7 @@ async def validate_token(current_user: User = Depends(get_current_active_user)):
 
 
 @users_router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-async def create_user(user_in: UserCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+def create_user(user_in: UserCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
     user = crud_user.get_by_username(db, username=user_in.username)
     if user:
         raise HTTPException(
@@ -60,13 +61,22 @@ async def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_
     return users
 
 
+@users_router.get("/cursor", response_model=CursorPage[User])
+async def read_users_by_cursor(cursor: Optional[str] = None, limit: int = Query(100, gt=0, le=1000), db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+    try:
+        users, next_cursor = crud_user.get_page(db, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": users, "next_cursor": next_cursor}
+
+
 @users_router.get("/me", response_model=User)
 async def read_user_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
 @users_router.put("/me", response_model=User)
-async def update_user_me(user_in: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+def update_user_me(user_in: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     user = crud_user.update(db, db_obj=current_user, obj_in=user_in)
     return user
 
@@ -80,7 +90,7 @@ async def read_user(user_id: int, db: Session = Depends(get_db), current_user: U
 
 
 @users_router.put("/{user_id}", response_model=User)
-async def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
+def update_user(user_id: int, user_in: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_admin_user)):
     user = crud_user.get(db, user_id=user_id)
     if not user:
         raise HTTPException(status_code=404, detail="ユーザーが見つかりません")
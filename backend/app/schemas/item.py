@@ -46,3 +46,12 @@ class Item(ItemInDBBase):
 
 class ItemWithStock(Item):
     stock_status: str  # "normal", "low", "out"
+
+
+class ItemSuggestion(BaseModel):
+    """入力補完の候補"""
+    id: int
+    code: str
+    name: str
+    unit: Optional[str] = None
+    unit_price: Optional[float] = None
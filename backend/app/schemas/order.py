@@ -1,7 +1,7 @@
 from typing import List, Optional
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from .customer import Customer
 from .item import Item
@@ -64,6 +64,8 @@ class OrderResponse(OrderBase):
     """注文レスポンス用スキーマ"""
     id: int = Field(..., description="注文ID")
     order_date: datetime = Field(..., description="注文日時")
+    total_amount: float = Field(0, description="合計金額")
+    line_count: int = Field(0, description="明細数")
     created_at: datetime = Field(..., description="作成日時")
     updated_at: datetime = Field(..., description="更新日時")
 
@@ -72,8 +74,164 @@ class OrderResponse(OrderBase):
         from_attributes = True
 
 
+class OrderBulkCreate(BaseModel):
+    """一括登録用の注文スキーマ（明細を含む）"""
+    customer_id: int = Field(..., description="顧客ID")
+    order_date: datetime = Field(default_factory=datetime.utcnow, description="注文日時")
+    status: OrderStatus = Field(default=OrderStatus.PENDING, description="注文ステータス（保留中のみ）")
+    items: List[OrderItemCreate] = Field(..., min_length=1, description="注文明細")
+
+    @field_validator("status")
+    @classmethod
+    def status_must_be_pending(cls, value: OrderStatus) -> OrderStatus:
+        # 在庫の引当は/confirmで行うため、確定済みなどのステータスでは登録できない
+        if value != OrderStatus.PENDING:
+            raise ValueError("一括登録の注文は保留中(pending)で登録し、/confirmで確定してください")
+        return value
+
+
+class OrderBulkRequest(BaseModel):
+    """注文一括登録リクエスト"""
+    orders: List[OrderBulkCreate] = Field(..., min_length=1, description="登録する注文のリスト")
+
+
+class OrderBulkResult(BaseModel):
+    """注文一括登録の結果"""
+    created: int = Field(..., description="登録された注文数")
+    lines: int = Field(..., description="登録された明細数")
+    batches: int = Field(..., description="コミットしたバッチ数")
+    order_ids: List[int] = Field(..., description="登録された注文IDのリスト（リクエスト順）")
+
+
+class OrderDetailResponse(BaseModel):
+    """明細と顧客を含む注文レスポンス用スキーマ"""
+    id: int = Field(..., description="注文ID")
+    customer_id: int = Field(..., description="顧客ID")
+    status: OrderStatus = Field(..., description="注文ステータス")
+    order_date: datetime = Field(..., description="注文日時")
+    total_amount: float = Field(0, description="合計金額")
+    line_count: int = Field(0, description="明細数")
+    created_at: datetime = Field(..., description="作成日時")
+    updated_at: datetime = Field(..., description="更新日時")
+    customer: Customer = Field(..., description="顧客")
+    items: List[OrderItemWithItem] = Field(..., description="注文明細")
+
+    class Config:
+        """Pydantic設定"""
+        from_attributes = True
+
+
+class OrderTotal(BaseModel):
+    """注文ごとの集計結果"""
+    order_id: int = Field(..., description="注文ID")
+    customer_id: int = Field(..., description="顧客ID")
+    order_date: datetime = Field(..., description="注文日時")
+    status: OrderStatus = Field(..., description="注文ステータス")
+    line_count: int = Field(..., description="明細数")
+    total_quantity: int = Field(..., description="数量の合計")
+    total_amount: float = Field(..., description="金額の合計")
+
+    class Config:
+        """Pydantic設定"""
+        from_attributes = True
+
+
+class CustomerOrderTotal(BaseModel):
+    """顧客ごとの集計結果"""
+    customer_id: int = Field(..., description="顧客ID")
+    order_count: int = Field(..., description="注文数")
+    total_quantity: int = Field(..., description="数量の合計")
+    total_amount: float = Field(..., description="金額の合計")
+
+    class Config:
+        """Pydantic設定"""
+        from_attributes = True
+
+
+class PeriodOrderTotal(BaseModel):
+    """期間（日・月）ごとの集計結果"""
+    period: datetime = Field(..., description="期間の開始日時")
+    order_count: int = Field(..., description="注文数")
+    total_quantity: int = Field(..., description="数量の合計")
+    total_amount: float = Field(..., description="金額の合計")
+
+    class Config:
+        """Pydantic設定"""
+        from_attributes = True
+
+
+class ItemOrderTotal(BaseModel):
+    """商品ごとの集計結果"""
+    item_id: int = Field(..., description="商品ID")
+    order_count: int = Field(..., description="注文数")
+    total_quantity: int = Field(..., description="数量の合計")
+    total_amount: float = Field(..., description="金額の合計")
+
+    class Config:
+        """Pydantic設定"""
+        from_attributes = True
+
+
+class OrderTotalsMismatch(BaseModel):
+    """保存されている合計金額・明細数と明細の集計が一致しない注文"""
+    order_id: int = Field(..., description="注文ID")
+    stored_amount: float = Field(..., description="保存されている合計金額")
+    actual_amount: float = Field(..., description="明細から集計した合計金額")
+    stored_lines: int = Field(..., description="保存されている明細数")
+    actual_lines: int = Field(..., description="明細から集計した明細数")
+
+
+class OrderTotalsRepairResult(BaseModel):
+    """合計金額の再計算結果"""
+    updated: int = Field(..., description="不整合を修正した注文数")
+
+
+class OrderStockResult(BaseModel):
+    """注文の確定・キャンセル（在庫の引当・戻し）の結果"""
+    order_id: int = Field(..., description="注文ID")
+    status: OrderStatus = Field(..., description="変更後の注文ステータス")
+    stock_items: int = Field(..., description="在庫数を更新した商品数")
+
+
+class OrderStatusBulkUpdate(BaseModel):
+    """注文ステータスの一括変更リクエスト"""
+    order_ids: List[int] = Field(..., min_length=1, max_length=10000, description="注文IDのリスト")
+    status: OrderStatus = Field(..., description="変更後のステータス（processing / shipped / delivered）")
+
+
+class OrderStatusChange(BaseModel):
+    """ステータスを変更した（または拒否された）注文"""
+    order_id: int = Field(..., description="注文ID")
+    status: Optional[OrderStatus] = Field(None, description="ステータス（拒否の場合は現在の値、存在しない注文はnull）")
+
+
+class OrderStatusBulkResult(BaseModel):
+    """注文ステータスの一括変更結果"""
+    updated: List[OrderStatusChange] = Field(..., description="変更した注文")
+    rejected: List[OrderStatusChange] = Field(..., description="現在のステータスから遷移できない、または存在しない注文")
+
+
+class OrderBulkDelete(BaseModel):
+    """注文一括削除リクエスト（order_idsとbeforeの少なくとも一方を指定する）"""
+    order_ids: Optional[List[int]] = Field(None, max_length=100000, description="削除する注文IDのリスト")
+    before: Optional[datetime] = Field(None, description="この日時より前の注文日の注文を削除する")
+    statuses: List[OrderStatus] = Field(
+        default_factory=lambda: [OrderStatus.DELIVERED, OrderStatus.CANCELLED],
+        min_length=1,
+        description="削除対象とするステータス（delivered / cancelled のみ指定できる）"
+    )
+
+
+class OrderBulkDeleteResult(BaseModel):
+    """注文一括削除の結果"""
+    deleted: int = Field(..., description="削除した注文数")
+    batches: int = Field(..., description="コミットしたバッチ数")
+
+
 class OrderInDBBase(OrderBase):
     id: int
+    total_amount: float = 0
+    line_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
 
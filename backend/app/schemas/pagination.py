@@ -0,0 +1,11 @@
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """カーソルページネーションのレスポンス"""
+    items: List[T] = Field(..., description="このページの要素")
+    next_cursor: Optional[str] = Field(None, description="次ページのカーソル（最終ページの場合はnull）")
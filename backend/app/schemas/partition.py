@@ -0,0 +1,23 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class OrderPartition(BaseModel):
+    """注文テーブルの月次パーティション"""
+    table: str = Field(..., description="親テーブル名（orders / order_items）")
+    name: str = Field(..., description="パーティション名")
+    month: date = Field(..., description="対象月（月初日）")
+    estimated_rows: int = Field(..., description="推定行数（統計情報による）")
+
+
+class OrderPartitionList(BaseModel):
+    """パーティションの一覧"""
+    partitions: List[OrderPartition] = Field(..., description="有効なパーティション")
+    archived: List[OrderPartition] = Field(..., description="切り離し済み（archiveスキーマ）のテーブル")
+
+
+class OrderPartitionResult(BaseModel):
+    """パーティションの作成・アーカイブの結果"""
+    partitions: List[str] = Field(..., description="対象となったordersのパーティション名")
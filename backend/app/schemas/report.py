@@ -0,0 +1,44 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class MonthlySalesBase(BaseModel):
+    month: date = Field(..., description="対象月（月初日）")
+    order_count: int = Field(..., description="注文数")
+    total_quantity: int = Field(..., description="数量の合計")
+    total_amount: float = Field(..., description="金額の合計")
+    refreshed_at: datetime = Field(..., description="集計日時")
+
+    class Config:
+        from_attributes = True
+
+
+class MonthlyCustomerSales(MonthlySalesBase):
+    """顧客別月次売上"""
+    customer_id: int = Field(..., description="顧客ID")
+
+
+class MonthlyItemSales(MonthlySalesBase):
+    """商品別月次売上"""
+    item_id: int = Field(..., description="商品ID")
+
+
+class SummaryRefreshState(BaseModel):
+    """サマリーの更新状態"""
+    name: str
+    last_refreshed_at: Optional[datetime] = None
+    last_mode: Optional[str] = None
+    last_months: Optional[int] = None
+    last_duration_ms: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SummaryRefreshResult(BaseModel):
+    """サマリー更新の結果"""
+    mode: str = Field(..., description="更新方式（full または incremental）")
+    months: Optional[List[date]] = Field(None, description="再集計した月（全件の場合はnull）")
+    duration_ms: int = Field(..., description="所要時間（ミリ秒）")
@@ -0,0 +1,47 @@
+"""
+DBConnectorの呼び出しごとのオーバーヘッドの測定
+
+以前の実装（呼び出しごとにエンジンを作成し、接続の確立・認証から行う）と、
+プロセス内で共有するコネクタ（コネクションプールの接続を再利用する）で
+同じクエリの1回あたりの実行時間を比較する。
+"""
+import pytest
+from sqlalchemy import create_engine
+
+from app.integration.db_connector import DBConnector
+from tests.benchmarks.timing import median_ms
+
+pytestmark = pytest.mark.benchmark
+
+CALLS = 200
+QUERIES = [
+    ("SELECT 1", "SELECT 1", None),
+    (
+        "テーブル定義の取得",
+        "SELECT column_name, data_type FROM information_schema.columns "
+        "WHERE table_name = :table_name ORDER BY ordinal_position",
+        {"table_name": "pg_class"},
+    ),
+]
+
+
+def _per_call(url: str, query: str, params) -> None:
+    # 以前の実装と同じく、呼び出しのたびにエンジン（コネクションプール）を作成する
+    engine = create_engine(url)
+    try:
+        DBConnector(engine).execute_query(query, params)
+    finally:
+        engine.dispose()
+
+
+def test_shared_connector_overhead(bench_engine):
+    url = bench_engine.url.render_as_string(hide_password=False)
+    shared = DBConnector(bench_engine)
+
+    print(f"\n1回あたりの実行時間（{CALLS}回の中央値）")
+    print(f"{'クエリ':<24} {'呼び出しごとに接続':>16} {'共有':>10} {'倍率':>8}")
+    for name, query, params in QUERIES:
+        per_call = median_ms(lambda: _per_call(url, query, params), repeat=CALLS)
+        pooled = median_ms(lambda: shared.execute_query(query, params), repeat=CALLS)
+        print(f"{name:<24} {per_call:>14.2f}ms {pooled:>8.2f}ms {per_call / pooled:>7.1f}x")
+        assert pooled < per_call, name
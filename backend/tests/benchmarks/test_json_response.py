@@ -0,0 +1,87 @@
+"""
+一覧APIのレスポンス生成（read_orders / read_items）の測定
+
+ORMオブジェクトのリストからレスポンスの本文を作るまでの時間を、
+FastAPI既定の経路（response_modelの検証→jsonable_encoder→json.dumps）と
+app.core.responses.model_response で比較する。PostgreSQLは不要。
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, List
+
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import model_response
+from app.models.item import Item as ItemModel
+from app.models.order import Order as OrderModel, OrderStatus
+from app.schemas.item import Item
+from app.schemas.order import OrderResponse
+from tests.benchmarks.timing import median_ms
+
+pytestmark = pytest.mark.benchmark
+
+ROWS = int(os.getenv("BENCH_RESPONSE_ROWS", "1000"))
+STATUSES = list(OrderStatus)
+
+
+def _orders() -> List[OrderModel]:
+    base = datetime(2024, 1, 1)
+    orders = []
+    for i in range(1, ROWS + 1):
+        order = OrderModel(
+            id=i, customer_id=1 + i % 50, status=STATUSES[i % len(STATUSES)].value,
+            order_date=base + timedelta(minutes=i), total_amount=i * 12.5, line_count=1 + i % 5,
+            created_at=base + timedelta(minutes=i), updated_at=base + timedelta(minutes=i)
+        )
+        # OrderResponseはOrderBaseのitem_id・quantityも必須とするため、計測用に値を持たせる
+        order.item_id = 1 + i % 200
+        order.quantity = 1 + i % 10
+        orders.append(order)
+    return orders
+
+
+def _items() -> List[ItemModel]:
+    base = datetime(2024, 1, 1)
+    return [
+        ItemModel(
+            id=i, code=f"ITEM-{i:06d}", name=f"商品{i}", description="説明" * 10,
+            specification=None, unit="個", unit_price=i * 1.5, min_stock=10,
+            current_stock=i % 100, is_active=True, created_at=base, updated_at=base
+        )
+        for i in range(1, ROWS + 1)
+    ]
+
+
+def _default_path(schema: Any, rows: list, response_class=JSONResponse) -> bytes:
+    # FastAPIがresponse_modelを指定したエンドポイントの戻り値に対して行う処理と同じ
+    field = create_response_field(name="Response", type_=schema)
+    content = asyncio.run(serialize_response(field=field, response_content=rows, is_coroutine=True))
+    return response_class(content).body
+
+
+@pytest.mark.parametrize(
+    "endpoint, schema, factory",
+    [
+        ("read_orders", List[OrderResponse], _orders),
+        ("read_items", List[Item], _items),
+    ],
+)
+def test_list_response(endpoint, schema, factory):
+    rows = factory()
+    # どちらの経路でも同じJSONになること
+    assert json.loads(_default_path(schema, rows)) == json.loads(model_response(schema, rows).body)
+
+    before = median_ms(lambda: _default_path(schema, rows), repeat=20)
+    orjson_default = median_ms(lambda: _default_path(schema, rows, ORJSONResponse), repeat=20)
+    after = median_ms(lambda: model_response(schema, rows), repeat=20)
+
+    print(f"\n{endpoint}（{ROWS:,} 行）")
+    print(f"  FastAPI既定（JSONResponse）     {before:>8.2f}ms")
+    print(f"  FAST_JSON_RESPONSE（ORJSON）    {orjson_default:>8.2f}ms  {before / orjson_default:>5.1f}x")
+    print(f"  model_response                 {after:>8.2f}ms  {before / after:>5.1f}x")
+    assert after < before
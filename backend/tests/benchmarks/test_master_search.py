@@ -0,0 +1,111 @@
+"""
+商品・顧客の検索（トライグラムインデックス）のレイテンシの測定
+
+ベンチマーク用のDBにアプリケーションのテーブル定義（create_tables.sql）を適用し、
+作業用スキーマに同じ定義（インデックスを含む）の items / customers を作成して
+BENCH_SEARCH_ROWS 件（既定 100万件）の商品を投入する。
+検索はsearch_pathで作業用スキーマを優先し、アプリケーションと同じCRUD関数で行う。
+"""
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import customer as crud_customer
+from app.crud import item as crud_item
+
+pytestmark = pytest.mark.benchmark
+
+SCHEMA = "bench_master_search"
+ITEM_ROWS = int(os.getenv("BENCH_SEARCH_ROWS", "1000000"))
+CUSTOMER_ROWS = int(os.getenv("BENCH_SEARCH_CUSTOMERS", "100000"))
+# 入力補完で許容する1回の検索時間（p95）
+TARGET_MS = float(os.getenv("BENCH_SEARCH_TARGET_MS", "20"))
+REPEAT = 50
+
+CREATE_TABLES = Path(__file__).resolve().parents[2] / "app" / "db" / "migrations" / "create_tables.sql"
+
+# 商品名の語（全角・半角・大文字小文字の表記ゆれを含む）
+WORDS = [
+    "六角ボルト", "ﾅｯﾄ", "ワッシャー", "ＳＵＳ", "sus", "ステンレス", "アルミ", "ｱﾙﾐ", "スチール",
+    "真鍮", "ベアリング", "スプリング", "ピン", "リベット", "ブラケット", "ヒンジ", "キャスター",
+    "ケーブル", "コネクタ", "ホース", "継手", "バルブ", "パッキン", "Oリング", "ＯＲＩＮＧ",
+    "モーター", "ギア", "プーリー", "ベルト", "チェーン", "シャフト", "カップリング",
+]
+
+# (名前, CRUD関数, 検索語)
+QUERIES = [
+    ("商品: コード完全一致", crud_item.search, "ITM-0123456"),
+    ("商品: コード前方一致（2文字）", crud_item.search, "IT"),
+    ("商品: コード前方一致", crud_item.search, "itm-01234"),
+    ("商品: 名前（全角）", crud_item.search, "ベアリング"),
+    ("商品: 名前（半角カナ）", crud_item.search, "ﾍﾞｱﾘﾝｸﾞ"),
+    ("商品: 名前（誤字）", crud_item.search, "ベアリンク"),
+    ("商品: 英字（全角）", crud_item.search, "ＳＵＳ３０４"),
+    ("顧客: 名前", crud_customer.search, "山田商事"),
+    ("顧客: 担当者", crud_customer.search, "佐藤"),
+    ("顧客: コード前方一致", crud_customer.search, "cus-0004"),
+]
+
+
+@pytest.fixture(scope="module")
+def search_db(bench_engine):
+    with bench_engine.begin() as conn:
+        conn.execute(text(CREATE_TABLES.read_text(encoding="utf-8")))
+    with bench_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for table in ("items", "customers"):
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        conn.execute(text(
+            f"INSERT INTO {SCHEMA}.items (id, code, name, description, unit, unit_price, is_active) "
+            "SELECT g, 'ITM-' || lpad(g::text, 7, '0'), "
+            "(:words)[1 + g % cardinality(:words)] || ' ' || (:words)[1 + (g / 7) % cardinality(:words)] "
+            "|| ' M' || (3 + g % 20), "
+            "'SUS' || (300 + g % 30) || ' ' || (:words)[1 + (g / 13) % cardinality(:words)] || ' 用', "
+            "'個', (g % 5000) * 1.0, g % 10 <> 0 "
+            "FROM generate_series(1, :rows) AS g"
+        ), {"words": WORDS, "rows": ITEM_ROWS})
+        conn.execute(text(
+            f"INSERT INTO {SCHEMA}.customers (id, code, name, contact_person, is_active) "
+            "SELECT g, 'CUS-' || lpad(g::text, 6, '0'), "
+            "(ARRAY['山田','鈴木','高橋','田中','伊藤','渡辺','中村','小林'])[1 + g % 8] "
+            "|| (ARRAY['商事','工業','製作所','物産','電機'])[1 + (g / 8) % 5] || ' ' || g, "
+            "(ARRAY['佐藤','加藤','吉田','山本','松本','井上'])[1 + (g / 3) % 6] || ' ' || g, true "
+            "FROM generate_series(1, :rows) AS g"
+        ), {"rows": CUSTOMER_ROWS})
+        conn.execute(text(f"ANALYZE {SCHEMA}.items"))
+        conn.execute(text(f"ANALYZE {SCHEMA}.customers"))
+    yield bench_engine
+    with bench_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+def test_search_latency(search_db):
+    db = sessionmaker(bind=search_db)()
+    try:
+        db.execute(text(f"SET search_path TO {SCHEMA}, public"))
+        results = {}
+        for name, search, term in QUERIES:
+            search(db, term)
+            timings = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                rows = search(db, term)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1], len(rows))
+    finally:
+        db.close()
+
+    print(f"\n商品 {ITEM_ROWS:,} 件・顧客 {CUSTOMER_ROWS:,} 件（目標 p95 {TARGET_MS:.0f}ms）")
+    print(f"{'検索':<32} {'中央値':>8} {'p95':>8} {'件数':>5}")
+    for name, (median, p95, count) in results.items():
+        print(f"{name:<32} {median:>6.2f}ms {p95:>6.2f}ms {count:>5}")
+
+    slow = {name: p95 for name, (_median, p95, _count) in results.items() if p95 > TARGET_MS}
+    assert not slow, slow
@@ -0,0 +1,106 @@
+"""
+注文の検索パターンに対するインデックス（リビジョン 3b47f43dbfc8）の効果の測定
+
+作業用スキーマに注文テーブルと同じ列のテーブルを作成し、BENCH_ORDER_ROWS 件（既定 1000万件）を
+投入して、インデックスなし・ありで同じクエリの実行時間を比較する。
+"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+from tests.benchmarks.timing import median_ms
+
+pytestmark = pytest.mark.benchmark
+
+SCHEMA = "bench_order_indexes"
+ROWS = int(os.getenv("BENCH_ORDER_ROWS", "10000000"))
+CUSTOMERS = 10000
+
+# マイグレーションと同じ定義（alembicのリビジョンはalembicなしでは読み込めないため複製する）
+INDEXES = [
+    ("ix_orders_customer_id_order_date", "customer_id, order_date", None),
+    ("ix_orders_status_created_at", "status, created_at", None),
+    ("ix_orders_created_at_id", "created_at, id", None),
+    ("ix_orders_open_created_at", "created_at", "status IN ('pending', 'confirmed', 'processing')"),
+]
+
+# (名前, クエリ) 各ルーター・CRUDのアクセスパスに対応する
+QUERIES = [
+    (
+        "read_orders: customer_id + order_date範囲",
+        "SELECT * FROM orders WHERE customer_id = 4242 "
+        "AND order_date >= DATE '2024-03-01' AND order_date < DATE '2024-06-01'",
+    ),
+    (
+        "get_multi: 新着順（先頭100件）",
+        "SELECT * FROM orders ORDER BY created_at DESC, id DESC LIMIT 100",
+    ),
+    (
+        "ステータス別の新着順（先頭100件）",
+        "SELECT * FROM orders WHERE status = 'shipped' ORDER BY created_at DESC LIMIT 100",
+    ),
+    (
+        "未完了注文の古い順（先頭100件）",
+        "SELECT * FROM orders WHERE status IN ('pending', 'confirmed', 'processing') "
+        "ORDER BY created_at LIMIT 100",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def bench_orders(bench_engine):
+    with bench_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(
+            f"CREATE TABLE {SCHEMA}.orders ("
+            "id bigint PRIMARY KEY, customer_id integer NOT NULL, order_date timestamp NOT NULL, "
+            "status varchar NOT NULL, total_amount double precision NOT NULL, "
+            "created_at timestamp NOT NULL)"
+        ))
+        # 未完了の注文は全体の約3%（直近の注文に偏る）とする
+        conn.execute(text(
+            f"INSERT INTO {SCHEMA}.orders "
+            "SELECT g, 1 + (g * 7919) % :customers, "
+            "TIMESTAMP '2020-01-01' + (g * interval '1 minute') * (5 * 365 * 1440.0 / :rows), "
+            "CASE WHEN g > :rows * 0.97 THEN (ARRAY['pending','confirmed','processing'])[(1 + g % 3)::int] "
+            "ELSE (ARRAY['shipped','delivered','cancelled'])[(1 + g % 3)::int] END, "
+            "(g % 1000) * 10.0, "
+            "TIMESTAMP '2020-01-01' + (g * interval '1 minute') * (5 * 365 * 1440.0 / :rows) "
+            "FROM generate_series(1::bigint, :rows) AS g"
+        ), {"rows": ROWS, "customers": CUSTOMERS})
+        conn.execute(text(f"ANALYZE {SCHEMA}.orders"))
+    yield bench_engine
+    with bench_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+def _measure(engine) -> dict:
+    results = {}
+    with engine.connect() as conn:
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        for name, sql in QUERIES:
+            results[name] = median_ms(lambda: conn.execute(text(sql)).all())
+        conn.rollback()
+    return results
+
+
+def test_order_indexes(bench_orders):
+    before = _measure(bench_orders)
+    with bench_orders.begin() as conn:
+        for name, columns, where in INDEXES:
+            sql = f"CREATE INDEX {name} ON {SCHEMA}.orders ({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            conn.execute(text(sql))
+        conn.execute(text(f"ANALYZE {SCHEMA}.orders"))
+    after = _measure(bench_orders)
+
+    print(f"\n注文 {ROWS:,} 件")
+    print(f"{'クエリ':<40} {'インデックスなし':>14} {'あり':>10} {'倍率':>8}")
+    for name, _sql in QUERIES:
+        print(f"{name:<40} {before[name]:>12.1f}ms {after[name]:>8.2f}ms {before[name] / after[name]:>7.1f}x")
+
+    for name, _sql in QUERIES:
+        assert after[name] < before[name], name
@@ -0,0 +1,52 @@
+"""
+パスワードハッシュのコスト（bcryptのrounds）ごとのログイン処理性能の測定
+
+ログイン時と同じverify_and_updateを1スレッドで繰り返し、1コアあたりの
+ログイン数/秒を求める。PostgreSQLは不要。
+
+    RUN_BENCHMARKS=1 BENCH_BCRYPT_ROUNDS=10,11,12,13 BENCH_LOGIN_SLO_MS=250 \
+        python -m pytest -s tests/benchmarks/test_password_hash.py
+"""
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import pwd_context
+from tests.benchmarks.timing import median_ms
+
+pytestmark = pytest.mark.benchmark
+
+ROUNDS = [int(r) for r in os.getenv("BENCH_BCRYPT_ROUNDS", "10,11,12,13,14").split(",")]
+# ログイン1回あたりのハッシュ検証に許容する時間
+SLO_MS = float(os.getenv("BENCH_LOGIN_SLO_MS", "250"))
+PASSWORD = "correct horse battery staple"
+
+
+def _context(rounds: int):
+    # アプリケーションと同じポリシー（min/maxを揃える）でコストだけを変える
+    return pwd_context.copy(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def test_logins_per_second_per_core():
+    timings = {}
+    for rounds in sorted(ROUNDS):
+        context = _context(rounds)
+        hashed = context.hash(PASSWORD)
+        # コストが1上がるごとに計算量が倍になるため、低コストほど多く計測する
+        repeat = max(3, 2 ** (14 - rounds))
+        timings[rounds] = median_ms(lambda: context.verify_and_update(PASSWORD, hashed), repeat=repeat)
+
+    print(f"\nログイン1回あたりのハッシュ検証（1コア、SLO {SLO_MS:.0f}ms、現在の設定 {settings.PASSWORD_BCRYPT_ROUNDS}）")
+    print(f"{'rounds':>6} {'検証時間':>10} {'ログイン/秒/コア':>16} {'SLO':>5}")
+    for rounds, ms in timings.items():
+        current = " *" if rounds == settings.PASSWORD_BCRYPT_ROUNDS else ""
+        print(f"{rounds:>6} {ms:>8.1f}ms {1000 / ms:>16.1f} {'OK' if ms <= SLO_MS else 'NG':>5}{current}")
+
+    ordered = list(timings.values())
+    assert ordered == sorted(ordered)
+
@@ -0,0 +1,28 @@
+"""
+ベンチマークの計測ヘルパー
+"""
+import statistics
+import time
+from typing import Callable
+
+
+def median_ms(fn: Callable[[], object], repeat: int = 5, warmup: int = 1) -> float:
+    """
+    関数の実行時間の中央値（ミリ秒）を返す
+
+    Args:
+        fn: 計測する関数
+        repeat: 計測回数
+        warmup: 計測前に実行する回数（キャッシュを温める）
+
+    Returns:
+        float: 実行時間の中央値（ミリ秒）
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
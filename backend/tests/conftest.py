@@ -0,0 +1,39 @@
+"""
+テスト共通のフィクスチャ
+
+PostgreSQLを用意せずに実行できるよう、SQLiteのインメモリDBにテーブルを作成する。
+"""
+import pytest
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  全モデルのマッパーを登録する
+from app.database import Base
+
+# テストで作成するテーブル（PostgreSQL固有の型を使うテーブルは含めない）
+TEST_TABLES = ("customers", "items", "orders", "order_items")
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    # SQLiteは複合主キーの自動採番に対応しないため、採番しないテーブル定義の複製で作成する
+    # （テスト側でIDを明示して登録する）
+    metadata = MetaData()
+    for name in TEST_TABLES:
+        table = Base.metadata.tables[name].to_metadata(metadata)
+        if len(table.primary_key.columns) > 1:
+            table.c.id.autoincrement = False
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)
@@ -0,0 +1,53 @@
+"""
+テスト用のインプロセスRedisクライアント
+
+app.core.cache.RedisCacheが使うコマンド（get / set / delete / expire）だけを、
+redis-pyと同じ引数・戻り値で実装する。値はredis-pyと同様にbytesで返す。
+有効期限はtime.monotonicで判定するため、テストでは時計を差し替えて期限切れを再現できる。
+"""
+import time
+from typing import Dict, Optional, Tuple, Union
+
+Value = Union[bytes, str, int, float]
+
+
+class FakeRedis:
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    @staticmethod
+    def _encode(value: Value) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _live(self, name: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(name)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[name]
+            return None
+        return entry
+
+    def get(self, name: str) -> Optional[bytes]:
+        entry = self._live(name)
+        return None if entry is None else entry[0]
+
+    def set(self, name: str, value: Value, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        if nx and self._live(name) is not None:
+            return None
+        expires_at = None if ex is None else time.monotonic() + ex
+        self._data[name] = (self._encode(value), expires_at)
+        return True
+
+    def delete(self, *names: str) -> int:
+        deleted = 0
+        for name in names:
+            if self._live(name) is not None:
+                del self._data[name]
+                deleted += 1
+        return deleted
+
+    def expire(self, name: str, time_seconds: int) -> bool:
+        entry = self._live(name)
+        if entry is None:
+            return False
+        self._data[name] = (entry[0], time.monotonic() + time_seconds)
+        return True
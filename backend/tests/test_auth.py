@@ -0,0 +1,88 @@
+"""
+ログイン時の認証（app.core.auth.authenticate_user_async）のテスト
+"""
+import asyncio
+import threading
+
+import pytest
+from passlib.hash import bcrypt
+from sqlalchemy import MetaData, create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.auth import authenticate_user_async
+from app.core.security import pwd_context
+from app.db.base_class import Base as UserBase
+from app.models.user import User
+
+PASSWORD = "correct horse"
+
+
+@pytest.fixture
+def user_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    metadata = MetaData()
+    for name in ("users", "user_settings"):
+        UserBase.metadata.tables[name].to_metadata(metadata)
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sql_threads(user_engine):
+    threads = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        threads.append(threading.get_ident())
+
+    event.listen(user_engine, "before_cursor_execute", record)
+    yield threads
+    event.remove(user_engine, "before_cursor_execute", record)
+
+
+def _add_user(user_engine, hashed_password: str) -> None:
+    with sessionmaker(bind=user_engine)() as db:
+        db.add(User(id=1, username="yamada", email="yamada@example.com", name="山田", hashed_password=hashed_password))
+        db.commit()
+
+
+def _login(user_engine, password: str):
+    async def run():
+        with sessionmaker(bind=user_engine)() as db:
+            user = await authenticate_user_async(db, "yamada@example.com", password)
+            # ルートが返す属性の参照でSQLが発行されないこと（イベントループ上で読まない）
+            return threading.get_ident(), user and (user.username, user.name, user.role)
+    return asyncio.run(run())
+
+
+def test_lookup_runs_off_the_event_loop(user_engine, sql_threads):
+    _add_user(user_engine, pwd_context.hash(PASSWORD))
+    sql_threads.clear()
+    loop_thread, result = _login(user_engine, PASSWORD)
+    assert result == ("yamada", "山田", "user")
+    assert sql_threads and loop_thread not in sql_threads
+
+
+def test_wrong_password(user_engine):
+    _add_user(user_engine, pwd_context.hash(PASSWORD))
+    assert _login(user_engine, "wrong")[1] is None
+    assert _login(user_engine, PASSWORD)[1] is not None
+
+
+def test_rehash_commits_off_the_event_loop(user_engine, sql_threads):
+    # 現在の設定より低いコストのハッシュはログイン時に置き換えられる
+    _add_user(user_engine, bcrypt.using(rounds=4).hash(PASSWORD))
+    sql_threads.clear()
+    loop_thread, result = _login(user_engine, PASSWORD)
+    assert result == ("yamada", "山田", "user")
+    assert loop_thread not in sql_threads
+
+    with sessionmaker(bind=user_engine)() as db:
+        hashed = db.get(User, 1).hashed_password
+    assert not pwd_context.needs_update(hashed)
+    assert pwd_context.verify(PASSWORD, hashed)
@@ -0,0 +1,249 @@
+"""
+app.core.cache.create_cacheのテスト（memory / redis の両バックエンド）
+
+redisバックエンドはtests.fake_redis.FakeRedisを接続先として差し替える。
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import update
+
+from app.core import cache as cache_module
+from app.core.config import settings
+from app.crud import async_customer as async_crud_customer
+from app.crud import async_item as async_crud_item
+from app.crud import customer as crud_customer
+from app.crud import item as crud_item
+from app.models.customer import Customer
+from app.models.item import Item
+from app.schemas.customer import CustomerUpdate
+from app.schemas.item import ItemUpdate
+from tests.fake_redis import FakeRedis
+
+BACKENDS = ["memory", "redis"]
+
+
+class Clock:
+    """time.monotonicを差し替える時計（有効期限のテスト用）"""
+
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def redis_client(monkeypatch) -> FakeRedis:
+    client = FakeRedis()
+    monkeypatch.setattr(cache_module, "_redis_client", client)
+    return client
+
+
+@pytest.fixture(params=BACKENDS)
+def make_cache(request, monkeypatch, redis_client):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", request.param)
+
+    def make(namespace: str = "test", maxsize: int = 16, ttl: float = 60.0, invalidation_hold: float = 0.0):
+        return cache_module.create_cache(
+            namespace, maxsize=maxsize, ttl=ttl, invalidation_hold=invalidation_hold
+        )
+
+    make.backend = request.param
+    return make
+
+
+def test_create_cache_uses_configured_backend(make_cache):
+    cache = make_cache()
+    assert cache.stats()["backend"] == make_cache.backend
+
+
+def test_miss(make_cache):
+    cache = make_cache()
+    assert cache.get("id:1") is None
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 0
+
+
+def test_hit(make_cache):
+    cache = make_cache()
+    cache.set("id:1", {"id": 1, "name": "ボルト"})
+    assert cache.get("id:1") == {"id": 1, "name": "ボルト"}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 0
+
+
+def test_delete_invalidates(make_cache):
+    cache = make_cache()
+    cache.set("id:1", {"id": 1})
+    cache.set("code:B-1", {"id": 1})
+    cache.set("id:2", {"id": 2})
+    cache.delete("id:1", "code:B-1", "id:missing")
+    assert cache.get("id:1") is None
+    assert cache.get("code:B-1") is None
+    assert cache.get("id:2") == {"id": 2}
+
+
+def test_expires_after_ttl(make_cache, clock):
+    cache = make_cache(ttl=10)
+    cache.set("id:1", {"id": 1})
+    clock.advance(9)
+    assert cache.get("id:1") == {"id": 1}
+    clock.advance(2)
+    assert cache.get("id:1") is None
+
+
+def test_zero_ttl_disables_cache(make_cache):
+    cache = make_cache(ttl=0)
+    cache.set("id:1", {"id": 1})
+    assert cache.get("id:1") is None
+
+
+def test_add_keeps_existing_value(make_cache):
+    cache = make_cache()
+    assert cache.add("id:1", {"id": 1, "name": "ボルト"})
+    assert not cache.add("id:1", {"id": 1, "name": "古いボルト"})
+    assert cache.get("id:1") == {"id": 1, "name": "ボルト"}
+
+
+def test_invalidate_blocks_add_until_hold_expires(make_cache, clock):
+    cache = make_cache(invalidation_hold=5)
+    cache.set("id:1", {"id": 1})
+    cache.invalidate("id:1")
+    assert cache.get("id:1") is None
+    # 無効化の前に読み込まれた値は書き戻さない
+    assert not cache.add("id:1", {"id": 1, "stale": True})
+    assert cache.get("id:1") is None
+
+    clock.advance(6)
+    assert cache.add("id:1", {"id": 1})
+    assert cache.get("id:1") == {"id": 1}
+
+
+def test_invalidate_without_hold_deletes(make_cache):
+    cache = make_cache()
+    cache.set("id:1", {"id": 1})
+    cache.invalidate("id:1")
+    assert cache.get("id:1") is None
+    assert cache.add("id:1", {"id": 1})
+
+
+def test_redis_namespaces_share_client(redis_client, monkeypatch):
+    # 同じRedisを使う別のキャッシュ（別ワーカー想定）で無効化が共有されること
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    worker_a = cache_module.create_cache("item", maxsize=16, ttl=60)
+    worker_b = cache_module.create_cache("item", maxsize=16, ttl=60)
+    other = cache_module.create_cache("customer", maxsize=16, ttl=60)
+
+    worker_a.set("id:1", {"id": 1})
+    other.set("id:1", {"id": 100})
+    assert worker_b.get("id:1") == {"id": 1}
+
+    worker_b.delete("id:1")
+    assert worker_a.get("id:1") is None
+    assert other.get("id:1") == {"id": 100}
+
+
+def test_item_read_through(make_cache, monkeypatch, session_factory):
+    # crud.itemのキャッシュ経由の取得: 初回はDBから読み、以降はキャッシュ、無効化後は再読み込み
+    monkeypatch.setattr(crud_item, "item_cache", make_cache("item"))
+    with session_factory() as db:
+        db.add(Item(id=1, code="B-1", name="ボルト"))
+        db.commit()
+
+        assert crud_item.get_cached(db, 1).name == "ボルト"
+        assert crud_item.item_cache.stats()["misses"] == 1
+
+        db.execute(update(Item).where(Item.id == 1).values(name="六角ボルト"))
+        db.commit()
+        assert crud_item.get_cached(db, 1).name == "ボルト"
+        assert crud_item.get_by_code_cached(db, "B-1").name == "ボルト"
+        assert crud_item.item_cache.stats()["hits"] == 2
+
+        crud_item.invalidate_cache(db.get(Item, 1))
+        assert crud_item.get_cached(db, 1).name == "六角ボルト"
+        assert crud_item.get_by_code_cached(db, "B-1").name == "六角ボルト"
+
+        assert crud_item.get_cached(db, 999) is None
+
+
+@pytest.mark.parametrize(
+    "crud, cache_attr, model, values",
+    [
+        (crud_item, "item_cache", Item, {"code": "B-1", "name": "ボルト"}),
+        (crud_customer, "customer_cache", Customer, {"code": "C-1", "name": "山田商事"}),
+    ],
+)
+def test_stale_read_is_not_written_back(make_cache, monkeypatch, session_factory, crud, cache_attr, model, values):
+    # 読み込みと書き戻しの間に他のリクエストが更新・無効化しても、古い行をキャッシュしないこと
+    monkeypatch.setattr(crud, cache_attr, make_cache(cache_attr, invalidation_hold=5))
+    with session_factory() as db:
+        db.add(model(id=1, **values))
+        db.commit()
+
+    original_get = crud.get
+
+    def get_then_concurrent_update(db, obj_id):
+        # このセッションの行は読み込んだ時点（更新前）の値のまま
+        stale = original_get(db, obj_id)
+        with session_factory() as other:
+            db_obj = other.get(model, obj_id)
+            db_obj.name = "更新後"
+            other.commit()
+            crud.invalidate_cache(db_obj)
+        return stale
+
+    with session_factory() as db:
+        monkeypatch.setattr(crud, "get", get_then_concurrent_update)
+        assert crud.get_cached(db, 1).name == values["name"]
+        monkeypatch.setattr(crud, "get", original_get)
+        assert crud.get_cached(db, 1).name == "更新後"
+        assert crud.get_by_code_cached(db, values["code"]).name == "更新後"
+
+
+class _AsyncSessionStub:
+    """非同期CRUDのupdateが使うメソッドだけを持つセッション（キャッシュ操作のスレッドの確認用）"""
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+
+@pytest.mark.parametrize(
+    "crud, model, obj_in",
+    [
+        (async_crud_item, Item, ItemUpdate(name="六角ボルト")),
+        (async_crud_customer, Customer, CustomerUpdate(name="山田工業")),
+    ],
+)
+def test_async_update_invalidates_off_the_event_loop(monkeypatch, crud, model, obj_in):
+    threads = []
+    monkeypatch.setattr(crud, "invalidate_cache", lambda obj: threads.append(threading.get_ident()))
+    if hasattr(crud, "_sync_typeahead"):
+        monkeypatch.setattr(crud, "_sync_typeahead", lambda obj: None)
+
+    async def run():
+        await crud.update(_AsyncSessionStub(), model(id=1, code="X-1", name="旧"), obj_in)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    # 更新前と更新後の2回、いずれもイベントループ以外のスレッドで無効化する
+    assert len(threads) == 2
+    assert loop_thread not in threads
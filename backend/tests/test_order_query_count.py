@@ -0,0 +1,103 @@
+"""
+注文一覧の読み込み戦略（crud.orders.LOAD_PROFILES）が発行するクエリ数のテスト
+
+SQLiteのインメモリDBに注文を作成し、before_cursor_executeで発行されたSQLを数える。
+"""
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from sqlalchemy import event
+
+from app.crud.orders import LOAD_PROFILES, get_orders
+from app.models.customer import Customer
+from app.models.item import Item
+from app.models.order import Order, OrderItem
+
+# 明細の件数によらず、注文+顧客のJOINと明細+商品のSELECT IN の2本で済むこと
+DETAIL_QUERY_LIMIT = 2
+ITEMS_PER_ORDER = 3
+
+
+@pytest.fixture
+def statements(engine) -> List[str]:
+    executed: List[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def _create_orders(session_factory, count: int) -> None:
+    """
+    顧客・商品を共有しない注文をcount件作成する（遅延読み込みがあれば注文ごとにクエリが増える）
+    """
+    base_date = datetime(2024, 1, 1)
+    with session_factory() as db:
+        for n in range(1, count + 1):
+            order_date = base_date + timedelta(days=n % 60)
+            db.add(Customer(id=n, code=f"C{n:04d}", name=f"顧客{n}"))
+            db.add(Order(id=n, customer_id=n, order_date=order_date, status="pending"))
+            for line in range(ITEMS_PER_ORDER):
+                item_id = (n - 1) * ITEMS_PER_ORDER + line + 1
+                db.add(Item(id=item_id, code=f"I{item_id:05d}", name=f"商品{item_id}"))
+                db.add(OrderItem(
+                    id=item_id,
+                    order_id=n,
+                    order_date=order_date,
+                    item_id=item_id,
+                    quantity=1,
+                    unit_price=100.0
+                ))
+        db.commit()
+
+
+def _touch_detail(orders: List[Order]) -> None:
+    """
+    注文詳細のレスポンスが参照するリレーションをすべて読む
+    """
+    for order in orders:
+        assert order.customer.code
+        assert len(order.items) == ITEMS_PER_ORDER
+        for order_item in order.items:
+            assert order_item.item.code
+
+
+@pytest.mark.parametrize("count", [5, 50])
+def test_detail_profile_query_count_is_bounded(session_factory, statements, count):
+    _create_orders(session_factory, count)
+    statements.clear()
+
+    with session_factory() as db:
+        orders = get_orders(db, limit=count, load="detail")
+        _touch_detail(orders)
+
+    assert len(orders) == count
+    assert len(statements) <= DETAIL_QUERY_LIMIT, statements
+
+
+def test_detail_profile_does_not_grow_with_orders(session_factory, statements):
+    _create_orders(session_factory, 40)
+    counts = []
+    for limit in (1, 10, 40):
+        statements.clear()
+        with session_factory() as db:
+            _touch_detail(get_orders(db, limit=limit, load="detail"))
+        counts.append(len(statements))
+
+    assert len(set(counts)) == 1, counts
+
+
+def test_plain_profile_lazy_loads_per_order(session_factory, statements):
+    # 比較用: 読み込み戦略を指定しないと、注文ごとに顧客・明細の読み込みが発生する
+    _create_orders(session_factory, 10)
+    statements.clear()
+
+    with session_factory() as db:
+        _touch_detail(get_orders(db, limit=10, load="plain"))
+
+    assert len(statements) > DETAIL_QUERY_LIMIT * 10
+    assert LOAD_PROFILES["plain"] == ()
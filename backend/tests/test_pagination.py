@@ -0,0 +1,53 @@
+"""
+キーセットページネーションのカーソル（app.crud.pagination）のテスト
+"""
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.crud.pagination import decode_cursor, encode_cursor
+from app.models.order import Order
+from app.models.report import SalesSummaryChange
+
+ORDER_KEY = [Order.created_at, Order.id]
+
+
+def _raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    cursor = encode_cursor([created_at, 42])
+    assert decode_cursor(cursor, ORDER_KEY) == [created_at, 42]
+
+
+@pytest.mark.parametrize("values", [
+    [123, 1],                       # 日時の列に数値
+    ["x", 1],                       # 日時として解釈できない文字列
+    ["2024-05-01T00:00:00", "1"],   # 整数の列に文字列
+    ["2024-05-01T00:00:00", 1.5],   # 整数の列に小数
+    ["2024-05-01T00:00:00", True],  # 整数の列に真偽値
+    ["2024-05-01T00:00:00", 2 ** 31],  # integer型の範囲外
+    ["2024-05-01T00:00:00", [1]],
+    ["2024-05-01T00:00:00"],        # 列数の不一致
+    {"id": 1},
+])
+def test_rejects_values_that_do_not_match_the_columns(values):
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor(values), ORDER_KEY)
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm90IGpzb24", ""])
+def test_rejects_malformed_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, ORDER_KEY)
+
+
+def test_big_integer_range():
+    key = [SalesSummaryChange.txid]
+    assert decode_cursor(_raw_cursor([2 ** 40]), key) == [2 ** 40]
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor([2 ** 63]), key)
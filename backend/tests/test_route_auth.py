@@ -0,0 +1,41 @@
+"""
+認証が必要なエンドポイントに認証の依存関係が設定されていることのテスト
+
+HTTPクライアントを使わず、FastAPIのルートの依存関係ツリーを調べる。
+"""
+import pytest
+from fastapi.routing import APIRoute
+
+from app.core import auth, deps
+from app.main import app
+from app.routers import db_integration, metrics
+
+
+def _dependency_calls(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from _dependency_calls(dependency)
+
+
+def _route(router, path: str, method: str) -> APIRoute:
+    for route in router.routes:
+        if isinstance(route, APIRoute) and route.path == router.prefix + path and method in route.methods:
+            return route
+    raise AssertionError(f"{method} {path} が見つかりません")
+
+
+@pytest.mark.parametrize("path", ["/db-pool", "/caches", "/password-hash", "/jobs"])
+def test_metrics_require_active_user(path):
+    route = _route(metrics.router, path, "GET")
+    assert deps.get_current_active_user in set(_dependency_calls(route.dependant))
+
+
+def test_query_stream_requires_admin():
+    route = _route(db_integration.router, "/query/stream", "POST")
+    assert auth.get_current_admin_user in set(_dependency_calls(route.dependant))
+
+
+def test_routers_are_mounted():
+    paths = {route.path for route in app.routes}
+    assert any(path.endswith("/metrics/db-pool") for path in paths)
+    assert any(path.endswith("/api/db/query/stream") for path in paths)
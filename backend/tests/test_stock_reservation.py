@@ -0,0 +1,149 @@
+"""
+注文確定時の在庫引当（crud.stock）のテスト
+
+並行実行のテストはファイルのSQLite DBを使い、トランザクションをBEGIN IMMEDIATEで開始する。
+SQLiteはSELECT ... FOR UPDATEを無視するため、書き込みトランザクション全体を直列化して
+PostgreSQLの行ロックの代わりとする（在庫の判定は条件付きUPDATEのまま検証される）。
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+from sqlalchemy import MetaData, create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import order as crud_order
+from app.crud.stock import OrderStateError, StockShortageError, cancel_order, reserve_order_stock
+from app.database import Base
+from app.models.customer import Customer
+from app.models.item import Item
+from app.models.order import Order, OrderItem, OrderStatus
+from app.schemas.order import OrderItemCreate, OrderItemUpdate
+from tests.conftest import TEST_TABLES
+
+ORDER_DATE = datetime(2024, 4, 1)
+PARALLEL_ORDERS = 200
+STOCK = 37
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stock.db'}",
+        connect_args={"check_same_thread": False, "timeout": 60},
+        pool_size=PARALLEL_ORDERS,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        # pysqlite自身のBEGINを止め、beginイベントでBEGIN IMMEDIATEを発行する
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    metadata = MetaData()
+    for name in TEST_TABLES:
+        table = Base.metadata.tables[name].to_metadata(metadata)
+        if len(table.primary_key.columns) > 1:
+            table.c.id.autoincrement = False
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _seed(session_factory, orders: int, stock, quantity: int = 1) -> None:
+    with session_factory() as db:
+        db.add(Customer(id=1, code="C-001", name="顧客"))
+        db.add(Item(id=1, code="B-001", name="ボルト", current_stock=stock))
+        for n in range(1, orders + 1):
+            db.add(Order(id=n, customer_id=1, order_date=ORDER_DATE, status=OrderStatus.PENDING))
+            db.add(OrderItem(
+                id=n, order_id=n, order_date=ORDER_DATE, item_id=1, quantity=quantity, unit_price=10.0
+            ))
+        db.commit()
+
+
+def _stock(session_factory):
+    with session_factory() as db:
+        return db.execute(select(Item.current_stock).where(Item.id == 1)).scalar()
+
+
+def test_parallel_confirmations_never_oversell(file_engine):
+    session_factory = sessionmaker(bind=file_engine, autoflush=False, autocommit=False)
+    _seed(session_factory, PARALLEL_ORDERS, STOCK)
+    start = threading.Barrier(PARALLEL_ORDERS)
+
+    def confirm(order_id: int) -> str:
+        with session_factory() as db:
+            start.wait()
+            try:
+                reserve_order_stock(db, order_id)
+                return "confirmed"
+            except StockShortageError:
+                return "shortage"
+
+    with ThreadPoolExecutor(max_workers=PARALLEL_ORDERS) as pool:
+        results = list(pool.map(confirm, range(1, PARALLEL_ORDERS + 1)))
+
+    assert results.count("confirmed") == STOCK
+    assert results.count("shortage") == PARALLEL_ORDERS - STOCK
+    assert _stock(session_factory) == 0
+    with session_factory() as db:
+        confirmed = db.query(Order).filter(Order.status == OrderStatus.CONFIRMED).count()
+    assert confirmed == STOCK
+
+
+def test_null_stock_is_reported_as_shortage(session_factory):
+    _seed(session_factory, 1, stock=None, quantity=2)
+    with session_factory() as db:
+        with pytest.raises(StockShortageError) as exc_info:
+            reserve_order_stock(db, 1)
+    assert exc_info.value.shortages == [
+        {"item_id": 1, "code": "B-001", "current_stock": 0, "requested": 2}
+    ]
+
+
+def test_cancel_releases_reserved_stock(session_factory):
+    _seed(session_factory, 1, stock=5, quantity=2)
+    with session_factory() as db:
+        reserve_order_stock(db, 1)
+    assert _stock(session_factory) == 3
+    with session_factory() as db:
+        cancel_order(db, 1)
+    assert _stock(session_factory) == 5
+
+
+def test_lines_of_confirmed_order_cannot_change(session_factory):
+    _seed(session_factory, 1, stock=5, quantity=2)
+    with session_factory() as db:
+        order = db.get(Order, 1)
+        order_item = db.get(OrderItem, 1)
+        # 読み込んだ後に別のセッションで確定された
+        with session_factory() as other:
+            reserve_order_stock(other, 1)
+
+        with pytest.raises(OrderStateError):
+            crud_order.add_items(
+                db, order, [OrderItemCreate(item_id=1, quantity=1, unit_price=10.0)]
+            )
+        with pytest.raises(OrderStateError):
+            crud_order.update_item(db, db.get(OrderItem, 1), OrderItemUpdate(quantity=5))
+        with pytest.raises(OrderStateError):
+            crud_order.remove_item(db, order_item.id)
+
+    with session_factory() as db:
+        assert db.get(OrderItem, 1).quantity == 2
+        assert db.query(OrderItem).count() == 1
+    assert _stock(session_factory) == 3
+
+
+def test_lines_of_pending_order_can_change(session_factory):
+    _seed(session_factory, 1, stock=5, quantity=2)
+    with session_factory() as db:
+        crud_order.update_item(db, db.get(OrderItem, 1), OrderItemUpdate(quantity=4))
+        assert db.get(Order, 1).total_amount == 20.0
+        assert crud_order.remove_item(db, 1) is True
+        assert crud_order.remove_item(db, 1) is False
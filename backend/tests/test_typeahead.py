@@ -0,0 +1,89 @@
+"""
+app.core.typeahead.PrefixIndexと商品の入力補完インデックスの更新のテスト
+"""
+import pytest
+
+from app.core.typeahead import PrefixIndex
+from app.crud import item as crud_item
+from app.models.item import Item
+from app.schemas.item import ItemCreate, ItemUpdate
+
+
+def _entry(entry_id: int, code: str, name: str) -> dict:
+    return {"id": entry_id, "code": code, "name": name}
+
+
+def _codes(index: PrefixIndex, prefix: str):
+    return [entry["code"] for entry in index.suggest(prefix)]
+
+
+def test_suggest_matches_code_then_name():
+    index = PrefixIndex("test")
+    index.build([_entry(1, "B-001", "ボルト"), _entry(2, "N-001", "ﾅｯﾄ"), _entry(3, "W-001", "B型ワッシャー")])
+    assert _codes(index, "b") == ["B-001", "W-001"]
+    assert _codes(index, "ナッ") == ["N-001"]
+    assert index.suggest("") == []
+
+
+def test_build_replays_changes_made_while_loading():
+    index = PrefixIndex("test")
+    index.build([_entry(1, "B-001", "ボルト"), _entry(2, "N-001", "ナット")])
+
+    with index.recording() as version:
+        # 読み込み結果（この時点のDBの内容）
+        loaded = [_entry(1, "B-001", "ボルト"), _entry(2, "N-001", "ナット")]
+        # 読み込み後、buildまでの間に別のリクエストが登録・更新・削除した
+        index.upsert(_entry(3, "S-001", "ネジ"))
+        index.upsert(_entry(1, "B-001", "六角ボルト"))
+        index.remove(2)
+        index.build(loaded, since=version)
+
+    assert _codes(index, "s-") == ["S-001"]
+    assert index.suggest("六角")[0]["id"] == 1
+    assert index.suggest("ボルト") == []
+    assert _codes(index, "n-") == []
+
+
+def test_build_without_since_replaces_everything():
+    index = PrefixIndex("test")
+    with index.recording():
+        index.upsert(_entry(3, "S-001", "ネジ"))
+        index.build([_entry(1, "B-001", "ボルト")])
+    assert _codes(index, "s-") == []
+
+
+def test_journal_is_released_after_recording():
+    index = PrefixIndex("test")
+    with pytest.raises(RuntimeError):
+        with index.recording():
+            index.upsert(_entry(1, "B-001", "ボルト"))
+            raise RuntimeError("読み込みに失敗")
+    index.upsert(_entry(2, "N-001", "ナット"))
+    assert index._journal == []
+    assert index.stats()["version"] == 2
+
+
+@pytest.fixture
+def typeahead(monkeypatch) -> PrefixIndex:
+    index = PrefixIndex("item")
+    monkeypatch.setattr(crud_item, "item_typeahead", index)
+    return index
+
+
+def test_item_crud_keeps_typeahead_in_sync(typeahead, session_factory):
+    with session_factory() as db:
+        db.add(Item(id=1, code="B-001", name="ボルト"))
+        db.commit()
+        assert crud_item.load_typeahead(db) == 1
+
+        created = crud_item.create(db, ItemCreate(code="N-001", name="ナット"))
+        assert _codes(typeahead, "n-") == ["N-001"]
+
+        crud_item.update(db, created, ItemUpdate(name="六角ナット"))
+        assert _codes(typeahead, "六角") == ["N-001"]
+
+        crud_item.update(db, created, ItemUpdate(is_active=False))
+        assert _codes(typeahead, "n-") == []
+
+        crud_item.delete(db, 1)
+        assert _codes(typeahead, "b-") == []